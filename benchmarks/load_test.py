@@ -0,0 +1,442 @@
+"""
+Load Test Harness
+
+Drives the API at a fixed concurrency and reports throughput, latency
+percentiles and, for streaming requests, time-to-first-token (TTFT) as JSON.
+
+By default the harness starts its own server in a subprocess. That server
+uses the offline FakeLLMProvider and the in-memory cache, so runs need no
+network access or API keys and are comparable between machines. Pass --url
+to target a server that is already running.
+
+With --cassette, the local server replays a cassette recorded with
+LLM_RECORD_PATH instead, and the harness sends the recorded requests. Add
+--replay-arrivals to send them at their recorded times, reproducing the
+production traffic shape rather than a closed loop.
+
+Usage:
+    # Offline run against the fake provider, streaming, 32 concurrent clients
+    python benchmarks/load_test.py --stream --concurrency 32 --requests 2000 --output result.json
+
+    # Compare with a stored baseline; exits with status 1 on a regression
+    python benchmarks/load_test.py --stream --baseline baseline.json --tolerance 0.10
+
+    # Replay recorded production traffic at its original pace, with provider latencies halved
+    python benchmarks/load_test.py --cassette cassettes/gpt-3.5-turbo.jsonl.gz --replay-arrivals --time-scale 0.5
+
+    # Against a deployed instance
+    python benchmarks/load_test.py --url http://localhost:8000 --duration 60
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+
+# Metrics where a larger value is better; for all others smaller is better.
+HIGHER_IS_BETTER = {"throughput_rps"}
+
+def create_app():
+    """
+    Build the API application used by the harness's local server.
+
+    Returns:
+        FastAPI: The application with the LLM routes mounted under /api/llm.
+    """
+    sys.path.insert(0, SRC_DIR)
+    from fastapi import FastAPI
+    from core.cross_cutting import LoggingMiddleware
+    from presentation.api.routes import llm_router
+
+    app = FastAPI()
+    app.add_middleware(LoggingMiddleware)
+    app.include_router(llm_router, prefix="/api/llm")
+    return app
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """
+    Return the pct-th percentile of values using linear interpolation.
+
+    Args:
+        values (List[float]): The samples. Need not be sorted.
+        pct (float): The percentile, between 0 and 100.
+
+    Returns:
+        Optional[float]: The percentile, or None if there are no samples.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "mean": sum(values) / len(values) if values else None,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+def stream_final_event(body: bytes) -> Optional[str]:
+    """
+    Return the type of the last event of a server-sent event stream.
+
+    Args:
+        body (bytes): The complete response body.
+
+    Returns:
+        Optional[str]: The event type, "message" for an event without one, or None for an empty stream.
+    """
+    blocks = bytes(body).decode("utf-8", errors="replace").strip().split("\n\n")
+    if not blocks[-1]:
+        return None
+    for line in blocks[-1].split("\n"):
+        if line.startswith("event:"):
+            return line[len("event:"):].strip()
+    return "message"
+
+class LoadTest:
+    """
+    Runs a load test, closed-loop by default: each worker sends its next request as soon as the
+    previous one finishes. Given arrival times, requests are instead sent on that schedule.
+
+    Attributes:
+        base_url (str): The URL of the server under test.
+        concurrency (int): The number of concurrent workers.
+        total_requests (Optional[int]): Stop after this many requests.
+        duration (Optional[float]): Stop after this many seconds.
+        stream (bool): Whether to call the streaming endpoint and measure TTFT.
+        max_tokens (int): The max_tokens sent with each request.
+        distinct_prompts (int): The number of distinct prompts to cycle through;
+            lower values raise the response cache hit rate.
+        payloads (Optional[List[Dict[str, Any]]]): Request bodies to send in turn
+            instead of generated prompts.
+        arrivals (Optional[List[float]]): Send payload i at arrivals[i] seconds
+            after the start (open loop) instead of running closed-loop workers.
+    """
+
+    def __init__(self, base_url: str, concurrency: int, total_requests: Optional[int], duration: Optional[float],
+                 stream: bool, max_tokens: int, distinct_prompts: int, timeout: float = 60.0,
+                 payloads: Optional[List[Dict[str, Any]]] = None, arrivals: Optional[List[float]] = None):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.total_requests = total_requests
+        self.duration = duration
+        self.stream = stream
+        self.max_tokens = max_tokens
+        self.distinct_prompts = distinct_prompts
+        self.timeout = timeout
+        self.payloads = payloads
+        self.arrivals = arrivals
+        self.latencies: List[float] = []
+        self.ttfts: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self._issued = 0
+
+    def _next_payload(self) -> Optional[Dict[str, Any]]:
+        if self.total_requests is not None and self._issued >= self.total_requests:
+            return None
+        if self.duration is not None and time.perf_counter() >= self._deadline:
+            return None
+        index = self._issued
+        self._issued += 1
+        if self.payloads:
+            return self.payloads[index % len(self.payloads)]
+        return {"prompt": f"Load test prompt {index % self.distinct_prompts}", "max_tokens": self.max_tokens}
+
+    def _record_error(self, kind: str) -> None:
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    async def _send(self, client: httpx.AsyncClient, payload: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        try:
+            if self.stream:
+                async with client.stream("POST", "/api/llm/generate/stream", json=payload) as response:
+                    first = None
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        if chunk and first is None:
+                            first = time.perf_counter()
+                        body.extend(chunk)
+                    if response.status_code >= 400:
+                        self._record_error(str(response.status_code))
+                        return
+                    # The stream ends with a "done" or "error" event; anything else was cut short.
+                    final_event = stream_final_event(body)
+                    if final_event != "done":
+                        self._record_error("stream_error" if final_event == "error" else "truncated_stream")
+                        return
+                    self.ttfts.append(first - started)
+            else:
+                response = await client.post("/api/llm/generate", json=payload)
+                if response.status_code >= 400:
+                    self._record_error(str(response.status_code))
+                    return
+        except httpx.HTTPError as e:
+            self._record_error(type(e).__name__)
+            return
+        self.latencies.append(time.perf_counter() - started)
+
+    async def _worker(self, client: httpx.AsyncClient) -> None:
+        while True:
+            payload = self._next_payload()
+            if payload is None:
+                return
+            await self._send(client, payload)
+
+    async def _open_loop(self, client: httpx.AsyncClient, started: float) -> None:
+        in_flight = asyncio.Semaphore(self.concurrency)
+
+        async def send_at(offset: float, payload: Dict[str, Any]) -> None:
+            await asyncio.sleep(max(0.0, started + offset - time.perf_counter()))
+            async with in_flight:
+                await self._send(client, payload)
+
+        tasks = []
+        for offset in self.arrivals:
+            payload = self._next_payload()
+            if payload is None:
+                break
+            tasks.append(asyncio.ensure_future(send_at(offset, payload)))
+        await asyncio.gather(*tasks)
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run the load test.
+
+        Returns:
+            Dict[str, Any]: The configuration and results of the run.
+        """
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits) as client:
+            started = time.perf_counter()
+            self._deadline = started + (self.duration or 0)
+            if self.arrivals is not None:
+                await self._open_loop(client, started)
+            else:
+                await asyncio.gather(*(self._worker(client) for _ in range(self.concurrency)))
+            elapsed = time.perf_counter() - started
+
+        completed = len(self.latencies)
+        failed = sum(self.errors.values())
+        return {
+            "config": {
+                "concurrency": self.concurrency,
+                "requests": self.total_requests,
+                "duration": self.duration,
+                "stream": self.stream,
+                "max_tokens": self.max_tokens,
+                "distinct_prompts": self.distinct_prompts,
+                "replayed_payloads": len(self.payloads) if self.payloads else None,
+                "open_loop": self.arrivals is not None,
+            },
+            "elapsed_seconds": elapsed,
+            "completed": completed,
+            "failed": failed,
+            "errors": self.errors,
+            "error_rate": failed / (completed + failed) if completed + failed else 0.0,
+            "throughput_rps": completed / elapsed if elapsed > 0 else 0.0,
+            "latency_seconds": summarize(self.latencies),
+            "ttft_seconds": summarize(self.ttfts) if self.stream else None,
+        }
+
+def flatten(result: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Extract the comparable metrics of a result as a flat name -> value mapping.
+
+    Args:
+        result (Dict[str, Any]): A result produced by LoadTest.run.
+
+    Returns:
+        Dict[str, float]: e.g. {"throughput_rps": ..., "latency_seconds.p95": ...}.
+    """
+    metrics = {"throughput_rps": result["throughput_rps"], "error_rate": result["error_rate"]}
+    for group in ("latency_seconds", "ttft_seconds"):
+        for name, value in (result.get(group) or {}).items():
+            if name in ("p50", "p95", "p99") and value is not None:
+                metrics[f"{group}.{name}"] = value
+    return metrics
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Compare a result with a baseline.
+
+    Args:
+        result (Dict[str, Any]): The current result.
+        baseline (Dict[str, Any]): The baseline result.
+        tolerance (float): The allowed relative degradation, e.g. 0.1 for 10%.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per metric present in both, with the
+            baseline and current values, the relative change and whether it is
+            a regression.
+    """
+    current, previous = flatten(result), flatten(baseline)
+    comparisons = []
+    for name in sorted(current.keys() & previous.keys()):
+        old, new = previous[name], current[name]
+        change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+        if name in HIGHER_IS_BETTER:
+            regression = change < -tolerance
+        elif name == "error_rate":
+            # Error rates start at zero, so compare them in absolute terms.
+            regression = new - old > tolerance / 10
+        else:
+            regression = change > tolerance
+        comparisons.append({"metric": name, "baseline": old, "current": new, "change": change,
+                            "regression": regression})
+    return comparisons
+
+def load_cassette_traffic(path: str, stream: bool, time_scale: float) -> "tuple[List[Dict[str, Any]], List[float]]":
+    """
+    Extract the request bodies and arrival times recorded in a cassette.
+
+    Args:
+        path (str): The cassette path.
+        stream (bool): Whether to use streamed or non-streamed recordings.
+        time_scale (float): Multiplier applied to the recorded arrival offsets.
+
+    Returns:
+        tuple[List[Dict[str, Any]], List[float]]: The request bodies and their
+            arrival offsets in seconds, relative to the first request.
+    """
+    sys.path.insert(0, SRC_DIR)
+    from infrastructure.llm_providers.cassette import read_cassette
+
+    kind = "stream" if stream else "generate"
+    records = sorted((r for r in read_cassette(path) if r["kind"] == kind), key=lambda r: r["offset"])
+    if not records:
+        raise ValueError(f"No {kind} interactions recorded in {path}")
+    first = records[0]["offset"]
+    payloads = [{key: r["request"][key] for key in ("prompt", "max_tokens", "temperature", "top_p")}
+                for r in records]
+    arrivals = [(r["offset"] - first) * time_scale for r in records]
+    return payloads, arrivals
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_local_server(args: argparse.Namespace) -> "tuple[subprocess.Popen, str]":
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        "LLM_PROVIDER": "replay" if args.cassette else "fake",
+        "LLM_REPLAY_PATH": os.path.abspath(args.cassette) if args.cassette else "",
+        "LLM_REPLAY_TIME_SCALE": str(args.time_scale),
+        "CACHE_BACKEND": "memory",
+        "TRACING_ENABLED": "False",
+        "LOOP_MONITOR_ENABLED": "False",
+        "ACCESS_LOG_SAMPLE_RATIO": "0.0",
+        "FAKE_LLM_LATENCY_MEAN": str(args.latency_mean),
+        "FAKE_LLM_LATENCY_STDDEV": str(args.latency_stddev),
+        "FAKE_LLM_LATENCY_DISTRIBUTION": args.latency_distribution,
+        "FAKE_LLM_TOKENS_PER_SECOND": str(args.tokens_per_second),
+        "FAKE_LLM_ERROR_RATE": str(args.error_rate),
+    })
+    env.setdefault("OPENAI_API_KEY", "unused")
+    env.setdefault("ANTHROPIC_API_KEY", "unused")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "load_test:create_app", "--factory",
+         "--app-dir", os.path.dirname(os.path.abspath(__file__)),
+         "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Local server exited during startup")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Local server did not start within 30 seconds")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test the LLM microservice.")
+    parser.add_argument("--url", help="Server to test. Defaults to a local server backed by the fake provider.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=None, help="Total requests to send (default 500).")
+    parser.add_argument("--duration", type=float, default=None, help="Run for this many seconds instead.")
+    parser.add_argument("--stream", action="store_true", help="Use the streaming endpoint and measure TTFT.")
+    parser.add_argument("--max-tokens", type=int, default=50)
+    parser.add_argument("--distinct-prompts", type=int, default=1000000,
+                        help="Number of distinct prompts; lower values exercise the response cache.")
+    parser.add_argument("--output", help="Write the JSON result to this file.")
+    parser.add_argument("--baseline", help="Compare against a result written by a previous run.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression.")
+    replay = parser.add_argument_group("replay (local server only)")
+    replay.add_argument("--cassette", help="Replay this cassette instead of using the fake provider.")
+    replay.add_argument("--time-scale", type=float, default=1.0,
+                        help="Multiplier for recorded latencies and arrival times.")
+    replay.add_argument("--replay-arrivals", action="store_true",
+                        help="Send recorded requests at their recorded times instead of a closed loop.")
+    fake = parser.add_argument_group("fake provider (local server only)")
+    fake.add_argument("--latency-mean", type=float, default=0.2)
+    fake.add_argument("--latency-stddev", type=float, default=0.05)
+    fake.add_argument("--latency-distribution", default="lognormal",
+                      choices=["fixed", "normal", "lognormal", "exponential"])
+    fake.add_argument("--tokens-per-second", type=float, default=50.0)
+    fake.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    if args.replay_arrivals and not args.cassette:
+        parser.error("--replay-arrivals requires --cassette")
+    if args.requests is None and args.duration is None and not args.cassette:
+        args.requests = 500
+    return args
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    payloads = arrivals = None
+    if args.cassette:
+        payloads, arrivals = load_cassette_traffic(args.cassette, args.stream, args.time_scale)
+        if not args.replay_arrivals:
+            arrivals = None
+        if args.requests is None and args.duration is None:
+            args.requests = len(payloads)
+    process = None
+    url = args.url
+    if url is None:
+        process, url = start_local_server(args)
+    try:
+        test = LoadTest(url, args.concurrency, args.requests, args.duration, args.stream,
+                        args.max_tokens, args.distinct_prompts, payloads=payloads, arrivals=arrivals)
+        result = asyncio.run(test.run())
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            result["comparison"] = compare(result, json.load(f), args.tolerance)
+        if any(c["regression"] for c in result["comparison"]):
+            exit_code = 1
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Memory benchmark
+
+Compares the memory held by the pydantic API schemas (LLMRequest,
+LLMResponse) with the slotted internal types (CompletionRequest,
+CompletionResult) that the orchestrator uses. For each representation it
+builds `--count` live objects and reports the bytes per object measured with
+tracemalloc, along with the build time. Field values are shared between
+objects, so the numbers reflect per-object overhead rather than payload size.
+
+Usage:
+    python benchmarks/memory.py
+    python benchmarks/memory.py --count 100000 --output memory.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from domain.completion import CompletionRequest, CompletionResult  # noqa: E402
+from domain.llm_request import LLMRequest  # noqa: E402
+from domain.llm_response import LLMResponse  # noqa: E402
+
+PROMPT = "Translate 'Hello' to French"
+COMPLETION_TEXT = "Bonjour"
+
+def _response_payload(i: int) -> Dict[str, Any]:
+    return {
+        "id": f"response-{i}",
+        "object": "text_completion",
+        "created": 1700000000,
+        "model": "gpt-3.5-turbo",
+        "choices": [{"text": COMPLETION_TEXT, "index": 0, "logprobs": None, "finish_reason": "length"}],
+        "usage": {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10},
+    }
+
+def build_cases() -> Dict[str, Callable[[int], Any]]:
+    """
+    Build the benchmark cases.
+
+    Returns:
+        Dict[str, Callable[[int], Any]]: Callables that build the i-th object, keyed by case name.
+    """
+    return {
+        "llm_request": lambda i: LLMRequest(prompt=PROMPT, model="gpt-3.5-turbo", max_tokens=100),
+        "completion_request": lambda i: CompletionRequest(PROMPT, "gpt-3.5-turbo", max_tokens=100),
+        "llm_response": lambda i: LLMResponse(**_response_payload(i)),
+        "completion_result": lambda i: CompletionResult.from_dict(_response_payload(i)),
+    }
+
+def measure(build: Callable[[int], Any], count: int) -> Dict[str, float]:
+    """
+    Build `count` objects and measure the memory they hold.
+
+    Args:
+        build (Callable[[int], Any]): Builds the i-th object.
+        count (int): The number of objects to keep alive.
+
+    Returns:
+        Dict[str, float]: "bytes_per_object", "total_bytes" and "build_seconds".
+    """
+    build(0)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        objects = [build(i) for i in range(count)]
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objects
+    total = after - before
+    return {"bytes_per_object": total / count, "total_bytes": total, "build_seconds": elapsed}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare per-object memory of API and internal types.")
+    parser.add_argument("--count", type=int, default=100000, help="Objects to build per case.")
+    parser.add_argument("--output", help="Write the JSON result to this file.")
+    args = parser.parse_args(argv)
+
+    cases = {name: measure(build, args.count) for name, build in build_cases().items()}
+    savings = {}
+    for api, internal in (("llm_request", "completion_request"), ("llm_response", "completion_result")):
+        saved = cases[api]["bytes_per_object"] - cases[internal]["bytes_per_object"]
+        savings[internal] = {"bytes_per_object": saved, "ratio": saved / cases[api]["bytes_per_object"]}
+
+    output = json.dumps({
+        "python": sys.version.split()[0],
+        "count": args.count,
+        "cases": cases,
+        "savings": savings,
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+Micro-benchmarks
+
+Measures the in-process code that runs on every request: prompt lookup and
+formatting, request/response model construction, cache value encoding and
+cache key hashing. For each case it reports the time per call and the
+memory allocated per call, measured with tracemalloc.
+
+Results are written as JSON. Given a baseline, the script compares every
+case and exits with status 1 if any is slower or allocates more than the
+tolerance allows. Record baselines on the same machine that runs the gate;
+timings are not comparable across hardware.
+
+Usage:
+    python benchmarks/micro.py --output micro-baseline.json
+    python benchmarks/micro.py --baseline micro-baseline.json --tolerance 0.25
+    python benchmarks/micro.py --filter cache
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+os.environ.setdefault("ANTHROPIC_API_KEY", "unused")
+
+from application.chains.step_cache import ChainStepCache  # noqa: E402
+from application.prompt_management import PromptRepository, PromptTemplate  # noqa: E402
+from application.services.llm_orchestrator import LLMOrchestrator  # noqa: E402
+from domain.completion import CompletionRequest, CompletionResult  # noqa: E402
+from domain.llm_request import LLMRequest  # noqa: E402
+from domain.llm_response import LLMResponse  # noqa: E402
+from infrastructure.cache.codecs import ValueSerializer  # noqa: E402
+from presentation.api.responses import FastJSONResponse  # noqa: E402
+
+Case = Callable[[], Any]
+
+COMPLETION_TEXT = " ".join(["The quick brown fox jumps over the lazy dog."] * 40)
+
+def _response_payload() -> Dict[str, Any]:
+    return {
+        "id": "response-1234567890",
+        "object": "text_completion",
+        "created": 1700000000,
+        "model": "gpt-3.5-turbo",
+        "choices": [{"text": COMPLETION_TEXT, "index": 0, "logprobs": None, "finish_reason": "length"}],
+        "usage": {"prompt_tokens": 42, "completion_tokens": 360, "total_tokens": 402},
+    }
+
+def build_cases() -> Dict[str, Case]:
+    """
+    Build the benchmark cases.
+
+    Returns:
+        Dict[str, Case]: Zero-argument callables keyed by case name.
+    """
+    template = PromptTemplate(
+        name="translate",
+        template="Translate the following text to $target_language, keeping a $tone tone:\n\n$input_text",
+        version="1.0",
+    )
+
+    repo = PromptRepository()
+    for i in range(10000):
+        repo.add_prompt(PromptTemplate(name="translate", template=f"v{i}: $input_text", version=f"{i:05d}"))
+
+    request = CompletionRequest("Translate 'Hello' to French", "gpt-3.5-turbo", max_tokens=100, temperature=0.7)
+    payload = _response_payload()
+    response = LLMResponse(**payload)
+
+    json_serializer = ValueSerializer(codec="json", compression="none")
+    zlib_serializer = ValueSerializer(codec="json", compression="zlib", compress_threshold=1024)
+    json_encoded = json_serializer.dumps(payload)
+    zlib_encoded = zlib_serializer.dumps(payload)
+
+    step_cache = ChainStepCache(cache=None)
+    step_inputs = {"text": COMPLETION_TEXT[:200], "language": "French"}
+
+    return {
+        "prompt_template.format": lambda: template.format(
+            input_text="Hello, world!", target_language="French", tone="formal"),
+        "prompt_repository.get_prompt.latest_10k": lambda: repo.get_prompt("translate"),
+        "prompt_repository.get_prompt.exact_10k": lambda: repo.get_prompt("translate", "05000"),
+        "llm_request.construct": lambda: LLMRequest(
+            prompt="Translate 'Hello' to French", model="gpt-3.5-turbo", max_tokens=100, temperature=0.7),
+        "completion_request.construct": lambda: CompletionRequest(
+            "Translate 'Hello' to French", "gpt-3.5-turbo", max_tokens=100, temperature=0.7),
+        "llm_response.construct": lambda: LLMResponse(**payload),
+        "completion_result.from_dict": lambda: CompletionResult.from_dict(payload),
+        "llm_response.from_trusted": lambda: LLMResponse.from_trusted(payload),
+        "llm_response.dict": response.dict,
+        "response.render": lambda: FastJSONResponse(content=response),
+        "cache.encode.json": lambda: json_serializer.dumps(payload),
+        "cache.decode.json": lambda: json_serializer.loads(json_encoded),
+        "cache.encode.json_zlib": lambda: zlib_serializer.dumps(payload),
+        "cache.decode.json_zlib": lambda: zlib_serializer.loads(zlib_encoded),
+        "cache_key.llm_request": lambda: LLMOrchestrator._request_digest(request),
+        "cache_key.chain_step": lambda: step_cache.make_key("example", "translate", step_inputs, (template,)),
+    }
+
+def time_case(fn: Case, min_time: float, repeat: int) -> Tuple[float, int]:
+    """
+    Time a case, calibrating the number of calls per measurement.
+
+    Args:
+        fn (Case): The case to time.
+        min_time (float): The minimum duration of one measurement in seconds.
+        repeat (int): The number of measurements.
+
+    Returns:
+        Tuple[float, int]: The best time per call in nanoseconds and the calls per measurement.
+    """
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / 10 or number >= 1 << 24:
+            break
+        number *= 2
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter_ns()
+            for _ in range(number):
+                fn()
+            best = min(best, (time.perf_counter_ns() - started) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best, number
+
+def measure_allocations(fn: Case, calls: int = 200) -> Dict[str, float]:
+    """
+    Measure the memory a case allocates.
+
+    Args:
+        fn (Case): The case to measure.
+        calls (int): The number of calls to average over.
+
+    Returns:
+        Dict[str, float]: "peak_bytes", the most memory one call held at once,
+            and "retained_bytes", the memory per call still alive afterwards.
+    """
+    fn()
+    tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(min(calls, 20)):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            fn()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+        gc.collect()
+        before, _ = tracemalloc.get_traced_memory()
+        results = [fn() for _ in range(calls)]
+        del results
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_bytes": peak, "retained_bytes": max(0.0, (after - before) / calls)}
+
+def run(cases: Dict[str, Case], min_time: float, repeat: int) -> Dict[str, Any]:
+    results = {}
+    for name, fn in cases.items():
+        ns_per_call, number = time_case(fn, min_time, repeat)
+        results[name] = {"ns_per_call": ns_per_call, "calls_per_measurement": number, **measure_allocations(fn)}
+    return {
+        "python": sys.version.split()[0],
+        "min_time": min_time,
+        "repeat": repeat,
+        "cases": results,
+    }
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Compare each case's time and peak allocation with a baseline.
+
+    Args:
+        result (Dict[str, Any]): The current result.
+        baseline (Dict[str, Any]): The baseline result.
+        tolerance (float): The allowed relative increase, e.g. 0.25 for 25%.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per case and metric present in both results.
+    """
+    comparisons = []
+    for name, current in sorted(result["cases"].items()):
+        previous = baseline.get("cases", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("ns_per_call", "peak_bytes"):
+            old, new = previous[metric], current[metric]
+            change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+            # Ignore tiny absolute growth in allocations, e.g. a few interned objects.
+            regression = change > tolerance and not (metric == "peak_bytes" and new - old < 256)
+            comparisons.append({"case": name, "metric": metric, "baseline": old, "current": new,
+                                "change": change, "regression": regression})
+    return comparisons
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run in-process micro-benchmarks.")
+    parser.add_argument("--filter", help="Only run cases whose name contains this string.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per measurement.")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements per case; the best is reported.")
+    parser.add_argument("--output", help="Write the JSON result to this file.")
+    parser.add_argument("--baseline", help="Compare against a result written by a previous run.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression.")
+    args = parser.parse_args(argv)
+
+    cases = build_cases()
+    if args.filter:
+        cases = {name: fn for name, fn in cases.items() if args.filter in name}
+    result = run(cases, args.min_time, args.repeat)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            result["comparison"] = compare(result, json.load(f), args.tolerance)
+        if any(c["regression"] for c in result["comparison"]):
+            exit_code = 1
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
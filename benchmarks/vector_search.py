@@ -0,0 +1,182 @@
+"""
+Vector search benchmark
+
+Compares exact search over the memory-mapped vector store with the IVF index
+at several `nprobe` settings, and with searches over int8 and product
+quantized codes, with and without full-precision re-ranking. Vectors are
+drawn around random cluster centres, as embeddings of related texts are, and
+queries are drawn from the same distribution without being stored. For each
+setting it reports recall@k against the exact results, queries per second
+and latency percentiles, along with the bytes searched per vector and the
+time taken to add the vectors and train the index and quantizers.
+
+Results are written as JSON. Store files are created in a temporary
+directory unless --path is given.
+
+Usage:
+    python benchmarks/vector_search.py
+    python benchmarks/vector_search.py --count 1000000 --dim 768 --nprobe 4,16,64 --output ivf.json
+    python benchmarks/vector_search.py --quantization pq --pq-subspaces 32 --rerank 8
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from infrastructure.vector_store.base import BaseVectorStore  # noqa: E402
+from infrastructure.vector_store.ivf_index import IVFVectorStore  # noqa: E402
+from infrastructure.vector_store.mmap_store import MemmapVectorStore  # noqa: E402
+
+# Vectors are added in batches of this many rows.
+BATCH_SIZE = 10000
+
+def make_vectors(count: int, dim: int, clusters: int, spread: float, rng: "np.random.Generator") -> "np.ndarray":
+    """
+    Draw vectors around random cluster centres.
+
+    Args:
+        count (int): The number of vectors.
+        dim (int): The dimension of the vectors.
+        clusters (int): The number of cluster centres.
+        spread (float): Standard deviation of each component around its centre, relative to the centre's.
+        rng (np.random.Generator): The random generator.
+
+    Returns:
+        np.ndarray: A (count, dim) float32 array.
+    """
+    centres = rng.standard_normal((clusters, dim), dtype=np.float32)
+    labels = rng.integers(0, clusters, count)
+    return centres[labels] + spread * rng.standard_normal((count, dim), dtype=np.float32)
+
+def measure(store: BaseVectorStore, queries: "np.ndarray", k: int, **kwargs) -> Dict[str, Any]:
+    """
+    Run every query and time each one.
+
+    Args:
+        store (BaseVectorStore): The store to search.
+        queries (np.ndarray): The query vectors.
+        k (int): The number of results per query.
+        **kwargs: Extra arguments for the store's search method.
+
+    Returns:
+        Dict[str, Any]: The IDs returned for each query, queries per second and latency percentiles.
+    """
+    latencies = []
+    results = []
+    for query in queries:
+        started = time.perf_counter()
+        matches = store.search(query, k, **kwargs)
+        latencies.append(time.perf_counter() - started)
+        results.append([match.id for match in matches])
+    latencies.sort()
+    return {
+        "ids": results,
+        "qps": round(len(queries) / sum(latencies), 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3),
+    }
+
+def recall(results: List[List[str]], truth: List[List[str]]) -> float:
+    """
+    Return the mean fraction of the exact top k found by each query.
+    """
+    return round(statistics.mean(len(set(found) & set(exact)) / len(exact)
+                                 for found, exact in zip(results, truth)), 4)
+
+def run(path: str, args: argparse.Namespace) -> Dict[str, Any]:
+    rng = np.random.default_rng(args.seed)
+    vectors = make_vectors(args.count + args.queries, args.dim, args.clusters, args.spread, rng)
+    queries, vectors = vectors[:args.queries], vectors[args.queries:]
+
+    store = IVFVectorStore(path, args.dim, train_threshold=0)
+    started = time.perf_counter()
+    for start in range(0, args.count, BATCH_SIZE):
+        batch = vectors[start:start + BATCH_SIZE]
+        store.add([str(start + i) for i in range(batch.shape[0])], batch)
+    add_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    n_lists = store.train(n_lists=args.lists or None)
+    train_seconds = time.perf_counter() - started
+
+    flat = measure(MemmapVectorStore(path, args.dim), queries, args.k)
+    truth = flat.pop("ids")
+    vector_bytes = args.dim * 4
+    cases = [{"index": "flat", "bytes": vector_bytes, "recall": 1.0, **flat}]
+    for nprobe in args.nprobe:
+        result = measure(store, queries, args.k, nprobe=nprobe)
+        cases.append({"index": "ivf", "nprobe": nprobe, "bytes": vector_bytes,
+                      "recall": recall(result.pop("ids"), truth), **result})
+
+    quantizer_seconds = {}
+    for quantization in args.quantization:
+        quantized = MemmapVectorStore(os.path.join(path, quantization), args.dim, quantization=quantization,
+                                      pq_subspaces=args.pq_subspaces)
+        started = time.perf_counter()
+        for start in range(0, args.count, BATCH_SIZE):
+            batch = vectors[start:start + BATCH_SIZE]
+            quantized.add([str(start + i) for i in range(batch.shape[0])], batch)
+        if quantized.quantization == "pq":
+            quantized.train_quantizer()
+        quantizer_seconds[quantization] = round(time.perf_counter() - started, 3)
+        code_bytes = quantized.quantizer.code_size
+        for rerank in sorted({0, args.rerank}):
+            quantized.rerank = rerank
+            result = measure(quantized, queries, args.k)
+            cases.append({"index": "flat", "quantization": quantization, "rerank": rerank, "bytes": code_bytes,
+                          "recall": recall(result.pop("ids"), truth), **result})
+        quantized.close()
+    return {
+        "count": args.count,
+        "dim": args.dim,
+        "k": args.k,
+        "queries": args.queries,
+        "lists": n_lists,
+        "add_seconds": round(add_seconds, 3),
+        "train_seconds": round(train_seconds, 3),
+        "quantizer_seconds": quantizer_seconds,
+        "cases": cases,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark recall@k and QPS of the IVF vector index.")
+    parser.add_argument("--count", type=int, default=100000, help="Vectors stored.")
+    parser.add_argument("--dim", type=int, default=256, help="Vector dimension.")
+    parser.add_argument("--clusters", type=int, default=1000, help="Cluster centres the vectors are drawn around.")
+    parser.add_argument("--spread", type=float, default=1.0, help="Spread of the vectors around their centres.")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per setting.")
+    parser.add_argument("--k", type=int, default=10, help="Results per query.")
+    parser.add_argument("--lists", type=int, default=0, help="IVF lists; 0 picks about 4 * sqrt(count).")
+    parser.add_argument("--nprobe", type=lambda value: [int(n) for n in value.split(",")],
+                        default=[1, 2, 4, 8, 16, 32, 64], help="Comma-separated nprobe settings.")
+    parser.add_argument("--quantization", type=lambda value: [name for name in value.split(",") if name],
+                        default=["int8", "pq"], help="Comma-separated quantizations to compare; empty for none.")
+    parser.add_argument("--pq-subspaces", type=int, default=0, help="Product quantization code bytes; 0 for dim / 8.")
+    parser.add_argument("--rerank", type=int, default=4, help="Multiple of k re-ranked with full precision.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--path", help="Directory for the store files; a temporary directory by default.")
+    parser.add_argument("--output", help="Write the JSON result to this file.")
+    args = parser.parse_args(argv)
+
+    if args.path:
+        result = run(args.path, args)
+    else:
+        with tempfile.TemporaryDirectory() as path:
+            result = run(path, args)
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
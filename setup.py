@@ -36,8 +36,24 @@ setup(
         "opentelemetry-sdk>=1.11.1,<2.0.0",
         "opentelemetry-exporter-jaeger>=1.11.1,<2.0.0",
         "opentelemetry-instrumentation-fastapi>=0.30b1,<0.31.0",
+        "prometheus-client>=0.14.1,<1.0.0",
     ],
     extras_require={
+        "api": [
+            "orjson>=3.8.0,<4.0.0",
+        ],
+        "cache": [
+            "orjson>=3.8.0,<4.0.0",
+            "msgpack>=1.0.0,<2.0.0",
+            "lz4>=4.0.0,<5.0.0",
+        ],
+        "vector": [
+            "numpy>=1.21.0,<3.0.0",
+        ],
+        "vector-accel": [
+            "numpy>=1.21.0,<3.0.0",
+            "faiss-cpu>=1.7.0,<2.0.0",
+        ],
         "dev": [
             "pytest>=6.2.5,<7.0.0",
             "pytest-asyncio>=0.15.1,<0.16.0",
@@ -6,7 +6,10 @@ Chains represent sequences of operations involving prompts, language models, and
 
 Available Chains:
 - BaseChain: The abstract base class for all chains
+- ChainStepCache: Memoizes chain step results so failed chains resume from the last completed step
+- StreamingPipeline, StreamingStep, TimedStream: Pipe partial output between chain steps as token streams
 - ExampleChain: An example implementation of a chain for demonstration purposes
+- OutlineChain: Outlines a topic and streams the expansion of its first heading through a StreamingPipeline
 
 To add a new chain:
 1. Create a new file in the `specific_chains` directory
@@ -15,14 +18,22 @@ To add a new chain:
 """
 
 from .base_chain import BaseChain
+from .step_cache import ChainStepCache
+from .streaming import StreamingPipeline, StreamingStep, TimedStream
 from .specific_chains.example_chain import ExampleChain
+from .specific_chains.outline_chain import OutlineChain
 
 # Add new chain imports here as they are created
 # from .specific_chains.new_chain import NewChain
 
 __all__ = [
     "BaseChain",
+    "ChainStepCache",
+    "StreamingPipeline",
+    "StreamingStep",
+    "TimedStream",
     "ExampleChain",
+    "OutlineChain",
     # Add new chain classes here as they are created
     # "NewChain",
 ]
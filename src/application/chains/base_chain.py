@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from application.prompt_management import PromptTemplate
+from .step_cache import ChainStepCache
 
 class BaseChain(ABC):
     """
@@ -7,8 +10,41 @@ class BaseChain(ABC):
     
     A chain represents a sequence of operations to be performed,
     typically involving prompts and language models.
+
+    Steps executed through `run_step` are memoized when a `step_cache` is
+    set, so a chain that failed part-way resumes from its last completed
+    step when run again with the same inputs.
+
+    Attributes:
+        step_cache (Optional[ChainStepCache]): Cache for step results. Memoization is disabled when None.
     """
 
+    step_cache: Optional[ChainStepCache] = None
+
+    @property
+    def chain_name(self) -> str:
+        """The name under which this chain's step results are memoized."""
+        return type(self).__name__
+
+    async def run_step(self, step_name: str, inputs: Dict[str, Any],
+                       step_fn: Callable[[Dict[str, Any]], Awaitable[Any]],
+                       prompts: Iterable[PromptTemplate] = ()) -> Any:
+        """
+        Execute a single step of the chain, reusing a memoized result if available.
+
+        Args:
+            step_name (str): The name of the step, unique within the chain.
+            inputs (Dict[str, Any]): The inputs the step result depends on.
+            step_fn (Callable[[Dict[str, Any]], Awaitable[Any]]): The coroutine function implementing the step.
+            prompts (Iterable[PromptTemplate]): The prompt templates the step uses.
+
+        Returns:
+            Any: The step result.
+        """
+        if self.step_cache is None:
+            return await step_fn(inputs)
+        return await self.step_cache.run_step(self.chain_name, step_name, inputs, step_fn, prompts)
+
     @abstractmethod
     async def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -6,6 +6,7 @@ Each chain in this module represents a unique sequence of operations designed fo
 
 Available Chains:
 - ExampleChain: An example implementation of a chain for demonstration purposes
+- OutlineChain: Outlines a topic and streams the expansion of its first heading
 
 To add a new specific chain:
 1. Create a new file in this directory (e.g., new_chain.py)
@@ -15,12 +16,14 @@ To add a new specific chain:
 """
 
 from .example_chain import ExampleChain
+from .outline_chain import OutlineChain
 
 # Add new chain imports here as they are created
 # from .new_chain import NewChain
 
 __all__ = [
     "ExampleChain",
+    "OutlineChain",
     # Add new chain classes here as they are created
     # "NewChain",
 ]
@@ -1,7 +1,8 @@
 from ..base_chain import BaseChain
-from ...prompts.prompt_repository import PromptRepository
+from ..step_cache import ChainStepCache
+from ...prompt_management.prompt_repository import PromptRepository
 from ...models.model_factory import ModelFactory
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 class ExampleChain(BaseChain):
     """
@@ -11,9 +12,11 @@ class ExampleChain(BaseChain):
     and returns a response.
     """
 
-    def __init__(self, prompt_repo: PromptRepository, model_factory: ModelFactory):
+    def __init__(self, prompt_repo: PromptRepository, model_factory: ModelFactory,
+                 step_cache: Optional[ChainStepCache] = None):
         self.prompt_repo = prompt_repo
         self.model_factory = model_factory
+        self.step_cache = step_cache
 
     async def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -25,12 +28,14 @@ class ExampleChain(BaseChain):
         Returns:
             Dict[str, Any]: Contains a 'response' key with the model's output.
         """
-        query = inputs['query']
         prompt_template = self.prompt_repo.get_prompt("example_prompt")
-        formatted_prompt = prompt_template.format(query=query)
 
-        model = self.model_factory.get_model("gpt-3.5-turbo")
-        response = await model.generate(formatted_prompt)
+        async def generate(step_inputs: Dict[str, Any]) -> str:
+            formatted_prompt = prompt_template.format(query=step_inputs['query'])
+            model = self.model_factory.get_model("gpt-3.5-turbo")
+            return await model.generate(formatted_prompt)
+
+        response = await self.run_step("generate", {"query": inputs['query']}, generate, [prompt_template])
 
         return {"response": response}
 
@@ -0,0 +1,98 @@
+from ..base_chain import BaseChain
+from ..streaming import StreamingPipeline, StreamingStep, TimedStream
+from ...prompt_management.prompt_repository import PromptRepository
+from ...models.model_factory import ModelFactory
+from typing import Any, AsyncIterator, Dict
+
+class OutlineChain(BaseChain):
+    """
+    Outlines a topic and expands the first heading of the outline.
+
+    The steps are piped through a StreamingPipeline: the expansion starts as
+    soon as the first line of the outline has arrived, instead of after the
+    whole outline, and its tokens can be streamed to the client as they are
+    generated.
+
+    Attributes:
+        prompt_repo (PromptRepository): Holds the "outline" and "expand" prompt templates.
+        model_factory (ModelFactory): A factory for creating LLM instances.
+        model_name (str): The registered model both steps are generated with.
+
+    Methods:
+        stream: Stream the expansion of the first heading of an outline of a topic.
+        run: Execute the chain and return the expansion with the per-step time to first chunk.
+    """
+
+    def __init__(self, prompt_repo: PromptRepository, model_factory: ModelFactory,
+                 model_name: str = "gpt-3.5-turbo"):
+        self.prompt_repo = prompt_repo
+        self.model_factory = model_factory
+        self.model_name = model_name
+
+    def _pipeline(self) -> StreamingPipeline:
+        outline_template = self.prompt_repo.get_prompt("outline")
+        expand_template = self.prompt_repo.get_prompt("expand")
+        model = self.model_factory.get_model(self.model_name)
+
+        async def outline(upstream: TimedStream) -> AsyncIterator[str]:
+            topic = await upstream.collect()
+            async for chunk in model.generate_stream(outline_template.format(topic=topic)):
+                yield chunk
+
+        async def expand(upstream: TimedStream) -> AsyncIterator[str]:
+            heading = await upstream.read_until("\n")
+            async for chunk in model.generate_stream(expand_template.format(heading=heading.strip())):
+                yield chunk
+
+        return StreamingPipeline([StreamingStep("outline", outline), StreamingStep("expand", expand)])
+
+    @staticmethod
+    async def _source(topic: str) -> AsyncIterator[str]:
+        yield topic
+
+    async def stream(self, inputs: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Stream the expansion of the first heading of an outline of a topic.
+
+        Args:
+            inputs (Dict[str, Any]): Should contain a 'topic' key.
+
+        Yields:
+            str: Successive chunks of the expansion.
+        """
+        async for chunk in self._pipeline().stream(self._source(inputs['topic'])):
+            yield chunk
+
+    async def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute the outline chain.
+
+        Args:
+            inputs (Dict[str, Any]): Should contain a 'topic' key.
+
+        Returns:
+            Dict[str, Any]: Contains a 'response' key with the expansion, and a 'timings' key
+                with each step's time to first chunk in seconds.
+        """
+        pipeline = self._pipeline()
+        response = "".join([chunk async for chunk in pipeline.stream(self._source(inputs['topic']))])
+        return {"response": response, "timings": pipeline.timings()}
+
+    def get_input_schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "topic": {"type": "string"}
+            },
+            "required": ["topic"]
+        }
+
+    def get_output_schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "response": {"type": "string"},
+                "timings": {"type": "object"}
+            },
+            "required": ["response", "timings"]
+        }
@@ -0,0 +1,96 @@
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from application.prompt_management import PromptTemplate
+from infrastructure.cache.base import BaseCache
+
+class ChainStepCache:
+    """
+    Memoizes the results of individual chain steps in the cache.
+
+    Each step result is stored under a key derived from the chain name, the
+    step name, the step inputs and the fingerprints of the prompt templates
+    the step uses. A chain that failed part-way through can therefore simply
+    be run again: completed steps are served from the cache and execution
+    resumes at the first step without a stored result. Changing a prompt
+    template changes its fingerprint, which invalidates only the steps that
+    depend on it.
+
+    Attributes:
+        cache (BaseCache): The cache used to store step results.
+        namespace (str): The key prefix under which step results are stored.
+        expire (Optional[int]): Time in seconds after which a step result expires.
+
+    Methods:
+        make_key: Build the cache key for a step execution.
+        run_step: Return a memoized step result or execute and store the step.
+        invalidate: Remove the stored result of a step execution.
+    """
+
+    def __init__(self, cache: BaseCache, namespace: str = "chain_step", expire: Optional[int] = 86400):
+        self.cache = cache
+        self.namespace = namespace
+        self.expire = expire
+
+    def make_key(self, chain_name: str, step_name: str, inputs: Dict[str, Any],
+                 prompts: Iterable[PromptTemplate] = ()) -> str:
+        """
+        Build the cache key for a step execution.
+
+        Args:
+            chain_name (str): The name of the chain the step belongs to.
+            step_name (str): The name of the step within the chain.
+            inputs (Dict[str, Any]): The inputs passed to the step.
+            prompts (Iterable[PromptTemplate]): The prompt templates the step uses.
+
+        Returns:
+            str: The cache key for the step execution.
+        """
+        prompt_part = ",".join(sorted(f"{p.name}@{p.fingerprint()}" for p in prompts))
+        input_part = json.dumps(inputs, sort_keys=True, default=str)
+        digest = hashlib.sha256(f"{prompt_part}\x00{input_part}".encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{chain_name}:{step_name}:{digest}"
+
+    async def run_step(self, chain_name: str, step_name: str, inputs: Dict[str, Any],
+                       step_fn: Callable[[Dict[str, Any]], Awaitable[Any]],
+                       prompts: Iterable[PromptTemplate] = ()) -> Any:
+        """
+        Return a memoized step result, or execute the step and store its result.
+
+        Results are wrapped before being stored so that a step legitimately
+        returning None is still recognised as completed.
+
+        Args:
+            chain_name (str): The name of the chain the step belongs to.
+            step_name (str): The name of the step within the chain.
+            inputs (Dict[str, Any]): The inputs passed to the step.
+            step_fn (Callable[[Dict[str, Any]], Awaitable[Any]]): The coroutine function implementing the step.
+                Its result must be JSON-serializable.
+            prompts (Iterable[PromptTemplate]): The prompt templates the step uses.
+
+        Returns:
+            Any: The step result.
+        """
+        prompts = list(prompts)
+        key = self.make_key(chain_name, step_name, inputs, prompts)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached["result"]
+
+        result = await step_fn(inputs)
+        await self.cache.set(key, {"result": result}, expire=self.expire)
+        return result
+
+    async def invalidate(self, chain_name: str, step_name: str, inputs: Dict[str, Any],
+                         prompts: Iterable[PromptTemplate] = ()) -> None:
+        """
+        Remove the stored result of a step execution.
+
+        Args:
+            chain_name (str): The name of the chain the step belongs to.
+            step_name (str): The name of the step within the chain.
+            inputs (Dict[str, Any]): The inputs passed to the step.
+            prompts (Iterable[PromptTemplate]): The prompt templates the step uses.
+        """
+        await self.cache.delete(self.make_key(chain_name, step_name, inputs, prompts))
@@ -0,0 +1,187 @@
+import logging
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+StreamTransform = Callable[[AsyncIterator[str]], AsyncIterator[str]]
+
+class TimedStream:
+    """
+    An asynchronous text stream that records when its first chunk arrived.
+
+    TimedStream wraps the output of a streaming chain step. Chunks that a
+    consumer has peeked at through `read_until` are buffered and replayed by
+    subsequent iteration, so a downstream step can start work on an early
+    part of the stream without losing the rest.
+
+    Attributes:
+        name (str): The name of the step producing the stream.
+        started_at (float): The perf_counter timestamp the stream is measured from.
+        first_chunk_at (Optional[float]): The perf_counter timestamp of the first chunk.
+        finished_at (Optional[float]): The perf_counter timestamp at which the stream was exhausted.
+
+    Methods:
+        read_until: Consume the stream until a delimiter appears and return the text before it.
+        collect: Consume the remainder of the stream and return it as a single string.
+        aclose: Close the underlying stream.
+    """
+
+    def __init__(self, name: str, source: AsyncIterator[str], started_at: Optional[float] = None):
+        self.name = name
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.first_chunk_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._source = source
+        self._buffer: List[str] = []
+
+    @property
+    def time_to_first_chunk(self) -> Optional[float]:
+        """Seconds between the start of the stream and its first chunk, or None if nothing arrived yet."""
+        if self.first_chunk_at is None:
+            return None
+        return self.first_chunk_at - self.started_at
+
+    def __aiter__(self) -> "TimedStream":
+        return self
+
+    async def __anext__(self) -> str:
+        if self._buffer:
+            return self._buffer.pop(0)
+        return await self._next_from_source()
+
+    async def _next_from_source(self) -> str:
+        try:
+            chunk = await self._source.__anext__()
+        except StopAsyncIteration:
+            if self.finished_at is None:
+                self.finished_at = time.perf_counter()
+            raise
+        if self.first_chunk_at is None:
+            self.first_chunk_at = time.perf_counter()
+        return chunk
+
+    async def read_until(self, delimiter: str = "\n") -> str:
+        """
+        Consume the stream until `delimiter` appears and return the text before it.
+
+        Text after the delimiter stays available to later iteration. If the
+        stream ends without the delimiter, all remaining text is returned.
+
+        Args:
+            delimiter (str): The delimiter to wait for. Defaults to a newline.
+
+        Returns:
+            str: The text preceding the delimiter.
+        """
+        text = ""
+        while delimiter not in text:
+            try:
+                text += await self.__anext__()
+            except StopAsyncIteration:
+                return text
+        head, _, tail = text.partition(delimiter)
+        if tail:
+            self._buffer.insert(0, tail)
+        return head
+
+    async def collect(self) -> str:
+        """
+        Consume the remainder of the stream and return it as a single string.
+
+        Returns:
+            str: The concatenated remaining chunks.
+        """
+        return "".join([chunk async for chunk in self])
+
+    async def aclose(self) -> None:
+        """Close the underlying stream, e.g. after a consumer stopped reading early."""
+        aclose = getattr(self._source, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+class StreamingStep:
+    """
+    A chain step that transforms an upstream text stream into a new one.
+
+    Attributes:
+        name (str): The name of the step, used when reporting timings.
+        transform (StreamTransform): A callable that takes the upstream stream and
+            returns the step's output stream. It may consume only part of its input.
+    """
+
+    def __init__(self, name: str, transform: StreamTransform):
+        self.name = name
+        self.transform = transform
+
+class StreamingPipeline:
+    """
+    Pipes partial output between chain steps as asynchronous token streams.
+
+    Every step receives the previous step's output as a TimedStream and can
+    start as soon as the part it needs has arrived, instead of waiting for
+    the whole upstream completion. The final stream can be returned to the
+    client directly, e.g. through a StreamingResponse.
+
+    Attributes:
+        steps (List[StreamingStep]): The steps of the pipeline, in order.
+        streams (List[TimedStream]): The timed streams of the most recent run.
+
+    Methods:
+        stream: Run the pipeline over a source stream and yield the final step's output.
+        timings: Return the per-step time to first chunk of the most recent run.
+
+    Example:
+        >>> async def outline(upstream):
+        ...     async for chunk in model.generate_stream(f"Outline: {await upstream.collect()}"):
+        ...         yield chunk
+        >>> async def first_heading(upstream):
+        ...     heading = await upstream.read_until("\\n")
+        ...     async for chunk in model.generate_stream(f"Expand: {heading}"):
+        ...         yield chunk
+        >>> pipeline = StreamingPipeline([StreamingStep("outline", outline), StreamingStep("expand", first_heading)])
+        >>> async for chunk in pipeline.stream(source):
+        ...     print(chunk, end="")
+    """
+
+    def __init__(self, steps: List[StreamingStep]):
+        self.steps = steps
+        self.streams: List[TimedStream] = []
+
+    async def stream(self, source: AsyncIterator[str]) -> AsyncIterator[str]:
+        """
+        Run the pipeline over a source stream and yield the final step's output.
+
+        Args:
+            source (AsyncIterator[str]): The stream fed into the first step.
+
+        Yields:
+            str: Successive chunks produced by the final step.
+        """
+        started_at = time.perf_counter()
+        current = TimedStream("source", source, started_at)
+        self.streams = [current]
+        for step in self.steps:
+            current = TimedStream(step.name, step.transform(current), started_at)
+            self.streams.append(current)
+
+        try:
+            async for chunk in current:
+                yield chunk
+        finally:
+            for stream in reversed(self.streams):
+                await stream.aclose()
+            logger.debug("Streaming pipeline time to first chunk: %s", self.timings())
+
+    def timings(self) -> Dict[str, Optional[float]]:
+        """
+        Return the per-step time to first chunk of the most recent run.
+
+        Times are measured in seconds from the start of the run, so a large
+        jump between consecutive steps shows where the pipeline stalls.
+
+        Returns:
+            Dict[str, Optional[float]]: Step names mapped to their time to first chunk,
+                or None for steps that produced no output.
+        """
+        return {stream.name: stream.time_to_first_chunk for stream in self.streams}
@@ -7,6 +7,7 @@ It includes a base model class and a factory for creating specific model instanc
 Components:
 - BaseModel: An abstract base class for all language models
 - ModelFactory: A factory class for creating instances of specific language models
+- ProviderModel: A model served by an LLM provider
 
 Usage:
     from application.models import BaseModel, ModelFactory
@@ -23,8 +24,9 @@ Usage:
 
 from .base_model import BaseModel
 from .model_factory import ModelFactory
+from .provider_model import ProviderModel
 
-__all__ = ["BaseModel", "ModelFactory"]
+__all__ = ["BaseModel", "ModelFactory", "ProviderModel"]
 
 # Version of the models module
 __version__ = "0.1.0"
\ No newline at end of file
@@ -1,5 +1,8 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from domain.completion import CompletionResult
 
 class BaseModel(ABC):
     """
@@ -13,7 +16,10 @@ class BaseModel(ABC):
 
     Methods:
         generate: Generate text based on a given prompt.
+        generate_completion: Generate n completions with their finish reasons and usage.
+        generate_stream: Generate text as an asynchronous stream of chunks.
         create_embedding: Create an embedding for a given text.
+        create_embeddings: Create embeddings for several texts.
         get_model_info: Retrieve information about the model.
     """
 
@@ -44,6 +50,56 @@ class BaseModel(ABC):
         """
         pass
 
+    @abstractmethod
+    async def generate_completion(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                                  top_p: float = 1.0, n: int = 1, stop: Optional[List[str]] = None,
+                                  presence_penalty: float = 0.0, frequency_penalty: float = 0.0,
+                                  logit_bias: Optional[Dict[str, float]] = None) -> CompletionResult:
+        """
+        Generate n completions for the given prompt.
+
+        Model implementations delegate to their provider's
+        generate_completion, which falls back to one generate_text call per
+        choice for providers without native n-choice support.
+
+        Args:
+            prompt (str): The input prompt for text generation.
+            max_tokens (int): The maximum number of tokens to generate per choice.
+            temperature (float): Controls randomness in generation.
+            top_p (float): Controls diversity via nucleus sampling.
+            n (int): How many completions to generate.
+            stop (Optional[List[str]]): Up to 4 sequences where the API will stop generating further tokens.
+            presence_penalty (float): Penalize new tokens based on whether they appear in the text so far.
+            frequency_penalty (float): Penalize new tokens based on their existing frequency in the text so far.
+            logit_bias (Optional[Dict[str, float]]): Modify the likelihood of specified tokens appearing in the completion.
+
+        Returns:
+            CompletionResult: All n choices, in index order, with the usage of the call.
+        """
+        pass
+
+    async def generate_stream(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                              top_p: float = 1.0, stop: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """
+        Generate text as an asynchronous stream of chunks.
+
+        Models backed by a streaming API should override this method. The
+        default implementation yields the complete result of generate as a
+        single chunk.
+
+        Args:
+            prompt (str): The input prompt for text generation.
+            max_tokens (int): The maximum number of tokens to generate.
+            temperature (float): Controls randomness in generation.
+            top_p (float): Controls diversity via nucleus sampling.
+            stop (Optional[List[str]]): Up to 4 sequences where the API will stop generating further tokens.
+
+        Yields:
+            str: Successive chunks of the generated text.
+        """
+        yield await self.generate(prompt, max_tokens=max_tokens, temperature=temperature,
+                                  top_p=top_p, stop=stop)
+
     @abstractmethod
     async def create_embedding(self, text: str) -> List[float]:
         """
@@ -57,6 +113,22 @@ class BaseModel(ABC):
         """
         pass
 
+    async def create_embeddings(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Create embeddings for several texts.
+
+        Models backed by a batch embedding API should override this method.
+        The default implementation calls create_embedding concurrently once
+        per text.
+
+        Args:
+            texts (Sequence[str]): The input texts to create embeddings for.
+
+        Returns:
+            List[List[float]]: One embedding vector per text, in order.
+        """
+        return list(await asyncio.gather(*(self.create_embedding(text) for text in texts)))
+
     @abstractmethod
     def get_model_info(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,60 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from domain.completion import CompletionResult
+from infrastructure.llm_providers.base import BaseLLMProvider
+from .base_model import BaseModel
+
+class ProviderModel(BaseModel):
+    """
+    A model served by an LLM provider.
+
+    Adapts a BaseLLMProvider to the BaseModel interface used by the
+    orchestrator, so any provider can be registered with the ModelFactory.
+
+    Attributes:
+        model_name (str): The name of the model.
+        provider (BaseLLMProvider): The provider that serves the model.
+
+    Example:
+        >>> from functools import partial
+        >>> factory = ModelFactory()
+        >>> factory.register_model("gpt-3.5-turbo", partial(ProviderModel, provider=OpenAIProvider(api_key)))
+        >>> model = factory.get_model("gpt-3.5-turbo")
+    """
+
+    def __init__(self, model_name: str, provider: BaseLLMProvider):
+        super().__init__(model_name)
+        self.provider = provider
+
+    async def generate(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                       top_p: float = 1.0, n: int = 1, stop: Optional[List[str]] = None,
+                       presence_penalty: float = 0.0, frequency_penalty: float = 0.0,
+                       logit_bias: Optional[Dict[str, float]] = None) -> str:
+        return await self.provider.generate_text(
+            prompt, max_tokens=max_tokens, temperature=temperature, top_p=top_p, n=n, stop=stop,
+            presence_penalty=presence_penalty, frequency_penalty=frequency_penalty, logit_bias=logit_bias
+        )
+
+    async def generate_completion(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                                  top_p: float = 1.0, n: int = 1, stop: Optional[List[str]] = None,
+                                  presence_penalty: float = 0.0, frequency_penalty: float = 0.0,
+                                  logit_bias: Optional[Dict[str, float]] = None) -> CompletionResult:
+        return await self.provider.generate_completion(
+            prompt, max_tokens=max_tokens, temperature=temperature, top_p=top_p, n=n, stop=stop,
+            presence_penalty=presence_penalty, frequency_penalty=frequency_penalty, logit_bias=logit_bias
+        )
+
+    async def generate_stream(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                              top_p: float = 1.0, stop: Optional[List[str]] = None) -> AsyncIterator[str]:
+        async for chunk in self.provider.stream_text(prompt, max_tokens=max_tokens, temperature=temperature,
+                                                     top_p=top_p, stop=stop):
+            yield chunk
+
+    async def create_embedding(self, text: str) -> List[float]:
+        return await self.provider.create_embedding(text)
+
+    async def create_embeddings(self, texts: Sequence[str]) -> List[List[float]]:
+        return await self.provider.create_embeddings(texts)
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {"name": self.model_name, "provider": self.provider.get_provider_info()}
@@ -1,78 +1,155 @@
-from pydantic import BaseModel, Field
-from typing import Dict, Any
-from string import Template
+from typing import Dict, List, Optional
+from .prompt_template import PromptTemplate
 
-class PromptTemplate(BaseModel):
+class PromptRepository:
     """
-    A class representing a template for prompts used with Language Models (LLMs).
+    A repository for managing and storing PromptTemplate objects.
 
-    This class allows for the creation, versioning, and formatting of prompt templates.
-    It uses Python's string.Template for variable substitution in the prompt.
+    This class provides methods for adding, retrieving, updating, and deleting
+    prompt templates. It supports versioning of prompts and allows retrieval
+    of specific versions or the latest version of a prompt.
 
     Attributes:
-        name (str): The name of the prompt template.
-        template (str): The actual template string with placeholders for variables.
-        version (str): The version of the prompt template. Defaults to "1.0".
-        description (str): A brief description of the prompt template's purpose or usage.
-        metadata (Dict[str, Any]): Additional metadata associated with the template.
+        prompts (Dict[str, PromptTemplate]): A dictionary storing the prompt templates,
+            keyed by a string in the format "name:version".
 
     Methods:
-        format: Fills in the template with provided variables.
-        get_required_variables: Returns a set of variable names required by the template.
+        add_prompt: Add a new prompt template to the repository.
+        get_prompt: Retrieve a prompt template by name and optionally version.
+        list_prompts: Return a list of all prompt templates in the repository.
+        update_prompt: Update an existing prompt template.
+        delete_prompt: Delete a prompt template from the repository.
 
     Example:
-        >>> template = PromptTemplate(
-        ...     name="greeting",
-        ...     template="Hello, {name}! Welcome to {place}.",
-        ...     description="A simple greeting template"
-        ... )
-        >>> template.format(name="Alice", place="Wonderland")
-        'Hello, Alice! Welcome to Wonderland.'
+        >>> repo = PromptRepository()
+        >>> template = PromptTemplate(name="greeting", template="Hello, {name}!", version="1.0")
+        >>> repo.add_prompt(template)
+        >>> retrieved = repo.get_prompt("greeting")
+        >>> retrieved.format(name="World")
+        'Hello, World!'
     """
 
-    name: str
-    template: str
-    version: str = "1.0"
-    description: str = ""
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    def __init__(self):
+        self.prompts: Dict[str, PromptTemplate] = {}
 
-    def format(self, **kwargs) -> str:
+    def add_prompt(self, prompt: PromptTemplate) -> None:
         """
-        Format the prompt template with the given arguments.
+        Add a new prompt template to the repository.
 
-        This method uses a safe string substitution to fill in the template
-        with the provided keyword arguments.
+        Args:
+            prompt (PromptTemplate): The prompt template to add.
+
+        Raises:
+            ValueError: If a prompt with the same name and version already exists.
+
+        Example:
+            >>> repo = PromptRepository()
+            >>> template = PromptTemplate(name="example", template="Hello, {name}!", version="1.0")
+            >>> repo.add_prompt(template)
+        """
+        key = f"{prompt.name}:{prompt.version}"
+        if key in self.prompts:
+            raise ValueError(f"Prompt '{key}' already exists in repository")
+        self.prompts[key] = prompt
+
+    def get_prompt(self, name: str, version: Optional[str] = None) -> Optional[PromptTemplate]:
+        """
+        Retrieve a prompt template by name and optionally version.
+
+        If version is not specified, returns the latest version of the prompt.
 
         Args:
-            **kwargs: Keyword arguments corresponding to the placeholders in the template.
+            name (str): The name of the prompt template to retrieve.
+            version (Optional[str]): The version of the prompt template. If None,
+                the latest version is returned.
+
+        Returns:
+            Optional[PromptTemplate]: The requested prompt template, or None if not found.
+
+        Example:
+            >>> repo = PromptRepository()
+            >>> template = PromptTemplate(name="example", template="Hello, {name}!", version="1.0")
+            >>> repo.add_prompt(template)
+            >>> retrieved = repo.get_prompt("example")
+            >>> retrieved.version
+            '1.0'
+        """
+        if version:
+            key = f"{name}:{version}"
+            return self.prompts.get(key)
+        
+        # If version is not specified, find the latest version
+        matching_prompts = [p for k, p in self.prompts.items() if k.startswith(f"{name}:")]
+        if not matching_prompts:
+            return None
+        return max(matching_prompts, key=lambda p: p.version)
+
+    def list_prompts(self) -> List[PromptTemplate]:
+        """
+        Return a list of all prompt templates in the repository.
 
         Returns:
-            str: The formatted prompt string.
+            List[PromptTemplate]: A list of all stored prompt templates.
+
+        Example:
+            >>> repo = PromptRepository()
+            >>> template1 = PromptTemplate(name="example1", template="Hello, {name}!", version="1.0")
+            >>> template2 = PromptTemplate(name="example2", template="Goodbye, {name}!", version="1.0")
+            >>> repo.add_prompt(template1)
+            >>> repo.add_prompt(template2)
+            >>> len(repo.list_prompts())
+            2
+        """
+        return list(self.prompts.values())
+
+    def update_prompt(self, prompt: PromptTemplate) -> None:
+        """
+        Update an existing prompt template.
+
+        Memoized chain steps are keyed on the fingerprints of the templates
+        they use, so updating a template invalidates only the steps that
+        depend on it.
+
+        Args:
+            prompt (PromptTemplate): The updated prompt template.
 
         Raises:
-            KeyError: If a required placeholder is not provided in kwargs.
+            KeyError: If the prompt with the given name and version doesn't exist.
 
         Example:
-            >>> template = PromptTemplate(name="example", template="Hello, {name}!")
-            >>> template.format(name="World")
-            'Hello, World!'
+            >>> repo = PromptRepository()
+            >>> template = PromptTemplate(name="example", template="Hello, {name}!", version="1.0")
+            >>> repo.add_prompt(template)
+            >>> updated = PromptTemplate(name="example", template="Hi, {name}!", version="1.0")
+            >>> repo.update_prompt(updated)
+            >>> repo.get_prompt("example").template
+            'Hi, {name}!'
         """
-        template = Template(self.template)
-        return template.safe_substitute(**kwargs)
+        key = f"{prompt.name}:{prompt.version}"
+        if key not in self.prompts:
+            raise KeyError(f"Prompt '{key}' not found in repository")
+        self.prompts[key] = prompt
 
-    def get_required_variables(self) -> set:
+    def delete_prompt(self, name: str, version: str) -> None:
         """
-        Return a set of variable names required by this template.
+        Delete a prompt template from the repository.
 
-        This method analyzes the template string and returns a set of all
-        placeholder names that need to be filled for a complete prompt.
+        Args:
+            name (str): The name of the prompt template to delete.
+            version (str): The version of the prompt template to delete.
 
-        Returns:
-            set: A set of strings representing the required variable names.
+        Raises:
+            KeyError: If the prompt with the given name and version doesn't exist.
 
         Example:
-            >>> template = PromptTemplate(name="example", template="Hello, {name}! Welcome to {place}.")
-            >>> template.get_required_variables()
-            {'name', 'place'}
+            >>> repo = PromptRepository()
+            >>> template = PromptTemplate(name="example", template="Hello, {name}!", version="1.0")
+            >>> repo.add_prompt(template)
+            >>> repo.delete_prompt("example", "1.0")
+            >>> repo.get_prompt("example") is None
+            True
         """
-        return set(Template(self.template).get_identifiers())
\ No newline at end of file
+        key = f"{name}:{version}"
+        if key not in self.prompts:
+            raise KeyError(f"Prompt '{key}' not found in repository")
+        del self.prompts[key]
\ No newline at end of file
@@ -1,151 +1,102 @@
-from typing import Dict, List, Optional
-from .prompt_template import PromptTemplate
+import hashlib
+from pydantic import BaseModel, Field
+from typing import Dict, Any
+from string import Template
 
-class PromptRepository:
+class PromptTemplate(BaseModel):
     """
-    A repository for managing and storing PromptTemplate objects.
+    A class representing a template for prompts used with Language Models (LLMs).
 
-    This class provides methods for adding, retrieving, updating, and deleting
-    prompt templates. It supports versioning of prompts and allows retrieval
-    of specific versions or the latest version of a prompt.
+    This class allows for the creation, versioning, and formatting of prompt templates.
+    It uses Python's string.Template for variable substitution in the prompt.
 
     Attributes:
-        prompts (Dict[str, PromptTemplate]): A dictionary storing the prompt templates,
-            keyed by a string in the format "name:version".
+        name (str): The name of the prompt template.
+        template (str): The actual template string with placeholders for variables.
+        version (str): The version of the prompt template. Defaults to "1.0".
+        description (str): A brief description of the prompt template's purpose or usage.
+        metadata (Dict[str, Any]): Additional metadata associated with the template.
 
     Methods:
-        add_prompt: Add a new prompt template to the repository.
-        get_prompt: Retrieve a prompt template by name and optionally version.
-        list_prompts: Return a list of all prompt templates in the repository.
-        update_prompt: Update an existing prompt template.
-        delete_prompt: Delete a prompt template from the repository.
+        format: Fills in the template with provided variables.
+        get_required_variables: Returns a set of variable names required by the template.
+        fingerprint: Returns a stable digest of the template's identity and content.
 
     Example:
-        >>> repo = PromptRepository()
-        >>> template = PromptTemplate(name="greeting", template="Hello, {name}!", version="1.0")
-        >>> repo.add_prompt(template)
-        >>> retrieved = repo.get_prompt("greeting")
-        >>> retrieved.format(name="World")
-        'Hello, World!'
+        >>> template = PromptTemplate(
+        ...     name="greeting",
+        ...     template="Hello, {name}! Welcome to {place}.",
+        ...     description="A simple greeting template"
+        ... )
+        >>> template.format(name="Alice", place="Wonderland")
+        'Hello, Alice! Welcome to Wonderland.'
     """
 
-    def __init__(self):
-        self.prompts: Dict[str, PromptTemplate] = {}
+    name: str
+    template: str
+    version: str = "1.0"
+    description: str = ""
+    metadata: Dict[str, Any] = Field(default_factory=dict)
 
-    def add_prompt(self, prompt: PromptTemplate) -> None:
+    def format(self, **kwargs) -> str:
         """
-        Add a new prompt template to the repository.
+        Format the prompt template with the given arguments.
 
-        Args:
-            prompt (PromptTemplate): The prompt template to add.
-
-        Raises:
-            ValueError: If a prompt with the same name and version already exists.
-
-        Example:
-            >>> repo = PromptRepository()
-            >>> template = PromptTemplate(name="example", template="Hello, {name}!", version="1.0")
-            >>> repo.add_prompt(template)
-        """
-        key = f"{prompt.name}:{prompt.version}"
-        if key in self.prompts:
-            raise ValueError(f"Prompt '{key}' already exists in repository")
-        self.prompts[key] = prompt
-
-    def get_prompt(self, name: str, version: Optional[str] = None) -> Optional[PromptTemplate]:
-        """
-        Retrieve a prompt template by name and optionally version.
-
-        If version is not specified, returns the latest version of the prompt.
+        This method uses a safe string substitution to fill in the template
+        with the provided keyword arguments.
 
         Args:
-            name (str): The name of the prompt template to retrieve.
-            version (Optional[str]): The version of the prompt template. If None,
-                the latest version is returned.
+            **kwargs: Keyword arguments corresponding to the placeholders in the template.
 
         Returns:
-            Optional[PromptTemplate]: The requested prompt template, or None if not found.
+            str: The formatted prompt string.
 
-        Example:
-            >>> repo = PromptRepository()
-            >>> template = PromptTemplate(name="example", template="Hello, {name}!", version="1.0")
-            >>> repo.add_prompt(template)
-            >>> retrieved = repo.get_prompt("example")
-            >>> retrieved.version
-            '1.0'
-        """
-        if version:
-            key = f"{name}:{version}"
-            return self.prompts.get(key)
-        
-        # If version is not specified, find the latest version
-        matching_prompts = [p for k, p in self.prompts.items() if k.startswith(f"{name}:")]
-        if not matching_prompts:
-            return None
-        return max(matching_prompts, key=lambda p: p.version)
-
-    def list_prompts(self) -> List[PromptTemplate]:
-        """
-        Return a list of all prompt templates in the repository.
-
-        Returns:
-            List[PromptTemplate]: A list of all stored prompt templates.
+        Raises:
+            KeyError: If a required placeholder is not provided in kwargs.
 
         Example:
-            >>> repo = PromptRepository()
-            >>> template1 = PromptTemplate(name="example1", template="Hello, {name}!", version="1.0")
-            >>> template2 = PromptTemplate(name="example2", template="Goodbye, {name}!", version="1.0")
-            >>> repo.add_prompt(template1)
-            >>> repo.add_prompt(template2)
-            >>> len(repo.list_prompts())
-            2
+            >>> template = PromptTemplate(name="example", template="Hello, {name}!")
+            >>> template.format(name="World")
+            'Hello, World!'
         """
-        return list(self.prompts.values())
+        template = Template(self.template)
+        return template.safe_substitute(**kwargs)
 
-    def update_prompt(self, prompt: PromptTemplate) -> None:
+    def get_required_variables(self) -> set:
         """
-        Update an existing prompt template.
+        Return a set of variable names required by this template.
 
-        Args:
-            prompt (PromptTemplate): The updated prompt template.
+        This method analyzes the template string and returns a set of all
+        placeholder names that need to be filled for a complete prompt.
 
-        Raises:
-            KeyError: If the prompt with the given name and version doesn't exist.
+        Returns:
+            set: A set of strings representing the required variable names.
 
         Example:
-            >>> repo = PromptRepository()
-            >>> template = PromptTemplate(name="example", template="Hello, {name}!", version="1.0")
-            >>> repo.add_prompt(template)
-            >>> updated = PromptTemplate(name="example", template="Hi, {name}!", version="1.0")
-            >>> repo.update_prompt(updated)
-            >>> repo.get_prompt("example").template
-            'Hi, {name}!'
+            >>> template = PromptTemplate(name="example", template="Hello, {name}! Welcome to {place}.")
+            >>> template.get_required_variables()
+            {'name', 'place'}
         """
-        key = f"{prompt.name}:{prompt.version}"
-        if key not in self.prompts:
-            raise KeyError(f"Prompt '{key}' not found in repository")
-        self.prompts[key] = prompt
+        return set(Template(self.template).get_identifiers())
 
-    def delete_prompt(self, name: str, version: str) -> None:
+    def fingerprint(self) -> str:
         """
-        Delete a prompt template from the repository.
+        Return a stable digest identifying this exact template revision.
 
-        Args:
-            name (str): The name of the prompt template to delete.
-            version (str): The version of the prompt template to delete.
+        The digest covers the name, version and template text, so editing a
+        template in place (e.g. through PromptRepository.update_prompt) yields
+        a new fingerprint even when the version string is unchanged. Anything
+        keyed on the fingerprint, such as memoized chain steps, is therefore
+        invalidated for this template only.
 
-        Raises:
-            KeyError: If the prompt with the given name and version doesn't exist.
+        Returns:
+            str: A hex digest of the template identity and content.
 
         Example:
-            >>> repo = PromptRepository()
-            >>> template = PromptTemplate(name="example", template="Hello, {name}!", version="1.0")
-            >>> repo.add_prompt(template)
-            >>> repo.delete_prompt("example", "1.0")
-            >>> repo.get_prompt("example") is None
-            True
+            >>> a = PromptTemplate(name="example", template="Hello, {name}!")
+            >>> b = PromptTemplate(name="example", template="Hi, {name}!")
+            >>> a.fingerprint() == b.fingerprint()
+            False
         """
-        key = f"{name}:{version}"
-        if key not in self.prompts:
-            raise KeyError(f"Prompt '{key}' not found in repository")
-        del self.prompts[key]
\ No newline at end of file
+        payload = f"{self.name}\x00{self.version}\x00{self.template}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()[:16]
@@ -7,6 +7,7 @@ coordinating prompts, and handling complex workflows.
 
 Components:
 - LLMOrchestrator: A service for managing interactions with Language Models (LLMs)
+- EmbeddingService: Creates embeddings and searches them in a vector store
 
 Usage:
     from application.services import LLMOrchestrator
@@ -21,8 +22,9 @@ Usage:
 """
 
 from .llm_orchestrator import LLMOrchestrator
+from .embedding_service import EmbeddingService
 
-__all__ = ["LLMOrchestrator"]
+__all__ = ["LLMOrchestrator", "EmbeddingService"]
 
 # Version of the services module
 __version__ = "0.1.0"
\ No newline at end of file
@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+from opentelemetry import trace
+from application.models import ModelFactory
+from core.metrics import track_stage
+from infrastructure.cache.base import BaseCache
+from infrastructure.vector_store.base import BaseVectorStore, VectorMatch
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+class EmbeddingService:
+    """
+    A service for creating embeddings and searching them in a vector store.
+
+    Embeddings are created in batches through the provider of the embedding
+    model, one request per batch where the provider supports it. Vector store operations are CPU- and disk-bound, so they run in the
+    default executor instead of on the event loop.
+
+    Embeddings are cached by model and text. They are stored with a compact
+    vector codec, int8 by default, instead of as JSON lists of floats.
+
+    After an insert, the vector store's index is trained in the background
+    when it is due, so requests never wait for training. At most one
+    training runs per service.
+
+    Attributes:
+        model_factory (ModelFactory): A factory for creating LLM instances.
+        vector_store (BaseVectorStore): The store embeddings are added to and searched in.
+        model_name (str): The registered model whose provider creates embeddings.
+        cache (Optional[BaseCache]): The cache for created embeddings. Embeddings are not cached when None.
+        cache_codec (str): The cache codec embeddings are stored with, e.g. "int8" or "float32".
+        cache_ttl (int): Seconds a cached embedding is kept.
+
+    Methods:
+        embed: Create embeddings for texts.
+        add: Create embeddings for texts and store them.
+        search: Find the stored texts most similar to a query text.
+    """
+
+    def __init__(self, model_factory: ModelFactory, vector_store: BaseVectorStore,
+                 model_name: str = "text-embedding-ada-002", cache: Optional[BaseCache] = None,
+                 cache_codec: str = "int8", cache_ttl: int = 86400):
+        self.model_factory = model_factory
+        self.vector_store = vector_store
+        self.model_name = model_name
+        self.cache = cache
+        self.cache_codec = cache_codec
+        self.cache_ttl = cache_ttl
+        self._training: Optional[asyncio.Task] = None
+
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Create embeddings for texts.
+
+        Args:
+            texts (Sequence[str]): The texts to embed.
+
+        Returns:
+            List[List[float]]: One embedding per text, in order.
+
+        Example:
+            >>> vectors = await service.embed(["Hello, world!"])
+            >>> len(vectors[0])
+            1536
+        """
+        model = self.model_factory.get_model(self.model_name)
+        with tracer.start_as_current_span("llm.embedding") as span, track_stage("embedding", model.model_name):
+            if span.is_recording():
+                span.set_attribute("llm.model", model.model_name)
+                span.set_attribute("llm.embedding.inputs", len(texts))
+            if self.cache is None:
+                return await model.create_embeddings(texts)
+
+            keys = [self._cache_key(model.model_name, text) for text in texts]
+            cached = await self.cache.get_many(keys)
+            missing = {key: text for key, text in zip(keys, texts) if cached.get(key) is None}
+            if missing:
+                created = await model.create_embeddings(list(missing.values()))
+                cached.update(zip(missing, created))
+                await self.cache.set_many(dict(zip(missing, created)), expire=self.cache_ttl, codec=self.cache_codec)
+            if span.is_recording():
+                span.set_attribute("llm.embedding.cache_hits", len(keys) - len(missing))
+            return [cached[key] for key in keys]
+
+    @staticmethod
+    def _cache_key(model_name: str, text: str) -> str:
+        return f"embedding:{model_name}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    async def add(self, texts: Sequence[str], ids: Optional[Sequence[str]] = None,
+                  metadata: Optional[Sequence[Dict[str, Any]]] = None) -> List[List[float]]:
+        """
+        Create embeddings for texts and store them in the vector store.
+
+        Args:
+            texts (Sequence[str]): The texts to embed and store.
+            ids (Optional[Sequence[str]]): One ID per text. Random IDs are used when omitted.
+            metadata (Optional[Sequence[Dict[str, Any]]]): One metadata dict per text.
+
+        Returns:
+            List[List[float]]: The stored embeddings, in order.
+
+        Raises:
+            ValueError: If the number of IDs or metadata dicts differs from the number of texts.
+        """
+        ids = list(ids) if ids is not None else [uuid.uuid4().hex for _ in texts]
+        vectors = await self.embed(texts)
+        loop = asyncio.get_event_loop()
+        with track_stage("vector_store_add"):
+            await loop.run_in_executor(None, self.vector_store.add, ids, vectors, metadata)
+        self._schedule_training()
+        return vectors
+
+    async def _train_if_due(self) -> None:
+        loop = asyncio.get_event_loop()
+        try:
+            if await loop.run_in_executor(None, self.vector_store.train_if_due):
+                logger.info("Trained the vector store index")
+        except Exception:
+            logger.exception("Background training of the vector store index failed")
+
+    def _schedule_training(self) -> None:
+        if self._training is None or self._training.done():
+            self._training = asyncio.create_task(self._train_if_due())
+
+    async def search(self, query: str, k: int = 10) -> List[VectorMatch]:
+        """
+        Find the stored texts most similar to a query text.
+
+        Args:
+            query (str): The query text.
+            k (int): The number of results to return.
+
+        Returns:
+            List[VectorMatch]: Up to k matches, most similar first.
+        """
+        vector = (await self.embed([query]))[0]
+        loop = asyncio.get_event_loop()
+        with tracer.start_as_current_span("vector_store.search") as span, track_stage("vector_search"):
+            matches = await loop.run_in_executor(None, self.vector_store.search, vector, k)
+            if span.is_recording():
+                span.set_attribute("vector_store.k", k)
+                span.set_attribute("vector_store.matches", len(matches))
+        return matches
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Dict, Optional
+
+from core.metrics import JOB_QUEUE_WAIT, JOBS_PROCESSED, JOBS_RUNNING
+from domain.job import Job, JobStatus
+from infrastructure.queue.base import BaseJobQueue, Claim
+from .llm_orchestrator import LLMOrchestrator
+
+logger = logging.getLogger(__name__)
+
+class JobWorker:
+    """
+    Processes asynchronous jobs from a job queue with an LLMOrchestrator.
+
+    The worker keeps up to `concurrency` jobs in progress. It claims new jobs
+    only when it has free slots, so a slow provider applies backpressure to
+    the queue instead of to the API. Jobs it holds are touched periodically
+    so other workers do not reclaim them, and jobs abandoned by crashed
+    workers are reclaimed once idle for `claim_idle` seconds. A job that has
+    been started `max_attempts` times without finishing fails.
+
+    Attributes:
+        queue (BaseJobQueue): The queue jobs are claimed from.
+        orchestrator (LLMOrchestrator): The orchestrator that processes each job.
+        concurrency (int): Maximum number of jobs processed at once.
+        consumer (str): The name this worker claims jobs under. Unique per process.
+        block (float): Seconds to wait for new jobs in each claim.
+        claim_idle (float): Seconds after which a claimed job that is not touched is reclaimed.
+        max_attempts (int): Maximum number of times a job is started.
+
+    Methods:
+        run: Claim and process jobs until stopped.
+        stop: Stop claiming jobs and let run return once in-progress jobs finish.
+
+    Example:
+        >>> worker = JobWorker(RedisJobQueue(), orchestrator, concurrency=16)
+        >>> await worker.run()
+    """
+
+    def __init__(self, queue: BaseJobQueue, orchestrator: LLMOrchestrator, concurrency: int = 8,
+                 consumer: Optional[str] = None, block: float = 5.0, claim_idle: float = 300.0,
+                 max_attempts: int = 3):
+        self.queue = queue
+        self.orchestrator = orchestrator
+        self.concurrency = concurrency
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.block = block
+        self.claim_idle = claim_idle
+        self.max_attempts = max_attempts
+        self._active: Dict[asyncio.Task, str] = {}
+        self._stopping = False
+
+    async def run(self) -> None:
+        """
+        Claim and process jobs until stop is called, then wait for in-progress jobs.
+        """
+        heartbeat = asyncio.ensure_future(self._heartbeat())
+        next_reclaim = 0.0
+        try:
+            while not self._stopping:
+                free = self.concurrency - len(self._active)
+                if free <= 0:
+                    await asyncio.wait(set(self._active), return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                try:
+                    claims = []
+                    if time.monotonic() >= next_reclaim:
+                        claims = await self.queue.reclaim(self.consumer, self.claim_idle, free)
+                        next_reclaim = time.monotonic() + self.claim_idle / 4
+                    if not claims:
+                        claims = await self.queue.claim(self.consumer, free, block=self.block)
+                except Exception:
+                    logger.exception("Failed to claim jobs; retrying")
+                    await asyncio.sleep(self.block)
+                    continue
+                for claim in claims:
+                    self._start(claim)
+            if self._active:
+                await asyncio.wait(set(self._active))
+        finally:
+            heartbeat.cancel()
+
+    def stop(self) -> None:
+        """
+        Stop claiming jobs. Jobs in progress are finished before run returns,
+        at most `block` seconds after a pending claim.
+        """
+        self._stopping = True
+
+    def _start(self, claim: Claim) -> None:
+        delivery_id, job = claim
+        task = asyncio.ensure_future(self._process(delivery_id, job))
+        self._active[task] = delivery_id
+        task.add_done_callback(self._active.pop)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.claim_idle / 3)
+            try:
+                await self.queue.touch(self.consumer, list(self._active.values()))
+            except Exception:
+                logger.exception("Failed to touch in-progress jobs")
+
+    async def _process(self, delivery_id: str, job: Job) -> None:
+        job.attempts += 1
+        if job.attempts > self.max_attempts:
+            await self._finish(delivery_id, job, error=f"Job abandoned after {self.max_attempts} attempts")
+            return
+        if job.attempts == 1:
+            JOB_QUEUE_WAIT.observe(max(0.0, time.time() - job.created_at))
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        JOBS_RUNNING.inc()
+        try:
+            # Saved before processing so that the attempt counts if this worker dies.
+            await self.queue.save(job)
+            response = await self.orchestrator.process_request(job.request_type, job.input_text, **job.params)
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            await self._finish(delivery_id, job, error=str(e))
+        else:
+            await self._finish(delivery_id, job, result=response.dict())
+        finally:
+            JOBS_RUNNING.dec()
+
+    async def _finish(self, delivery_id: str, job: Job, result: Optional[Dict] = None,
+                      error: Optional[str] = None) -> None:
+        job.status = JobStatus.FAILED if error is not None else JobStatus.SUCCEEDED
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        JOBS_PROCESSED.labels(job.request_type, job.status.value).inc()
+        try:
+            await self.queue.complete(delivery_id, job)
+        except Exception:
+            # Left pending; the job is reclaimed and retried after claim_idle.
+            logger.exception("Failed to complete job %s", job.id)
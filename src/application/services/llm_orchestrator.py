@@ -1,8 +1,21 @@
-from typing import Any, Dict
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from opentelemetry import trace
 from application.models import ModelFactory
 from application.prompt_management import PromptRepository
-from application.domain.llm_request import LLMRequest
-from application.domain.llm_response import LLMResponse
+from domain.completion import CompletionRequest
+from domain.llm_response import LLMResponse
+from core.metrics import observe_stage, record_tokens, track_stage
+from core.profiling import profiler
+from infrastructure.cache.base import BaseCache
+from infrastructure.cache.stampede import StaleWhileRevalidate
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
 
 class LLMOrchestrator:
     """
@@ -14,16 +27,31 @@ class LLMOrchestrator:
     Attributes:
         model_factory (ModelFactory): A factory for creating LLM instances.
         prompt_repo (PromptRepository): A repository for managing prompt templates.
+        cache (Optional[BaseCache]): The cache backing the response cache.
+        response_cache (Optional[StaleWhileRevalidate]): Cache for generated responses.
+            Responses are not cached when None.
 
     Methods:
         process_request: Process an LLM request and generate a response.
+            Profiled when requested through core.profiling.
+        stream_request: Process an LLM request and stream the generated text.
         _get_model: Get an appropriate model for a given request.
         _format_prompt: Retrieve and format a prompt for a given request.
+        _cache_key: Build the response cache key for a request.
+        invalidate_responses: Invalidate all cached responses for a request type and sweep the old entries.
     """
 
-    def __init__(self, model_factory: ModelFactory, prompt_repo: PromptRepository):
+    def __init__(self, model_factory: ModelFactory, prompt_repo: PromptRepository,
+                 cache: Optional[BaseCache] = None, cache_soft_ttl: int = 3600,
+                 cache_hard_ttl: int = 7200, cache_lock_ttl: int = 180, cache_wait_timeout: float = 120.0):
         self.model_factory = model_factory
         self.prompt_repo = prompt_repo
+        self.cache = cache
+        self.response_cache = None
+        self._sweeps: Set[asyncio.Task] = set()
+        if cache is not None:
+            self.response_cache = StaleWhileRevalidate(cache, soft_ttl=cache_soft_ttl, hard_ttl=cache_hard_ttl,
+                                                       lock_ttl=cache_lock_ttl, wait_timeout=cache_wait_timeout)
 
     async def process_request(self, request_type: str, input_text: str, **kwargs) -> LLMResponse:
         """
@@ -50,30 +78,171 @@ class LLMOrchestrator:
             >>> print(response.choices[0].text)
             "Bonjour, le monde!"
         """
+        if profiler.enabled and profiler.should_profile():
+            return await profiler.profile(self._process_request(request_type, input_text, **kwargs), label=request_type)
+        return await self._process_request(request_type, input_text, **kwargs)
+
+    async def _process_request(self, request_type: str, input_text: str, **kwargs) -> LLMResponse:
+        """
+        Process an LLM request without profiling. See process_request.
+        """
         model = self._get_model(request_type)
+        provider = self._provider_name(model)
         prompt = self._format_prompt(request_type, input_text, **kwargs)
         
-        llm_request = LLMRequest(
+        # Parameters are validated at the API edge; the internal request is unvalidated and slotted.
+        llm_request = CompletionRequest(
             prompt=prompt,
             model=model.model_name,
             max_tokens=kwargs.get('max_tokens', 100),
-            temperature=kwargs.get('temperature', 0.7)
+            temperature=kwargs.get('temperature', 0.7),
+            top_p=kwargs.get('top_p', 1.0),
+            n=kwargs.get('n', 1)
         )
+        provider_seconds = 0.0
+        serialization_seconds = 0.0
         
-        generated_text = await model.generate(
-            prompt=llm_request.prompt,
-            max_tokens=llm_request.max_tokens,
-            temperature=llm_request.temperature
-        )
-        
-        return LLMResponse(
-            id=f"response-{hash(generated_text)}",
-            object="text_completion",
-            created=int(time.time()),
-            model=model.model_name,
-            choices=[{"text": generated_text, "index": 0, "logprobs": None, "finish_reason": "length"}],
-            usage={"prompt_tokens": len(prompt.split()), "completion_tokens": len(generated_text.split()), "total_tokens": len(prompt.split()) + len(generated_text.split())}
-        )
+        async def generate() -> Dict[str, Any]:
+            nonlocal provider_seconds, serialization_seconds
+            with tracer.start_as_current_span("llm.provider_call") as span:
+                started = time.perf_counter()
+                # All n choices come from one upstream call, with the usage it reports.
+                completion = await model.generate_completion(
+                    prompt=llm_request.prompt,
+                    max_tokens=llm_request.max_tokens,
+                    temperature=llm_request.temperature,
+                    top_p=llm_request.top_p,
+                    n=llm_request.n
+                )
+                provider_seconds = time.perf_counter() - started
+                observe_stage("provider_call", provider_seconds, model.model_name, provider)
+
+                prompt_tokens = completion.prompt_tokens
+                completion_tokens = completion.completion_tokens
+                record_tokens(model.model_name, provider, prompt_tokens, completion_tokens)
+                # Attributes are only built for sampled traces.
+                if span.is_recording():
+                    span.set_attribute("llm.model", model.model_name)
+                    span.set_attribute("llm.provider", provider)
+                    span.set_attribute("llm.usage.prompt_tokens", prompt_tokens)
+                    span.set_attribute("llm.usage.completion_tokens", completion_tokens)
+                    span.set_attribute("llm.choices", len(completion.choices))
+
+            # Stored in the cache as a plain dict, which is turned into an
+            # LLMResponse without re-validation below. Timed here and
+            # observed once, together with that conversion.
+            encode_started = time.perf_counter()
+            data = completion.to_dict()
+            serialization_seconds = time.perf_counter() - encode_started
+            return data
+
+        if self.response_cache is None:
+            result = await generate()
+        else:
+            started = time.perf_counter()
+            with tracer.start_as_current_span("cache.lookup"):
+                cache_key = await self._cache_key(request_type, llm_request)
+                result = await self.response_cache.get_or_compute(cache_key, generate)
+            # Provider and serialization time of a miss are recorded separately; keep only the cache's own share.
+            observe_stage("cache_lookup", time.perf_counter() - started - provider_seconds - serialization_seconds,
+                          model.model_name, provider)
+
+        started = time.perf_counter()
+        response = LLMResponse.from_trusted(result)
+        observe_stage("serialization", serialization_seconds + time.perf_counter() - started, model.model_name, provider)
+        return response
+
+    async def stream_request(self, request_type: str, input_text: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Process an LLM request and stream the generated text.
+
+        Streamed responses bypass the response cache.
+
+        Args:
+            request_type (str): The type of request (e.g., "generate", "summarize").
+            input_text (str): The input text to be processed.
+            **kwargs: Additional parameters specific to the request type.
+
+        Yields:
+            str: Successive chunks of the generated text.
+
+        Raises:
+            ValueError: If the request type is not supported.
+        """
+        model = self._get_model(request_type)
+        prompt = self._format_prompt(request_type, input_text, **kwargs)
+        with tracer.start_as_current_span("llm.provider_stream"):
+            started = time.perf_counter()
+            try:
+                async for chunk in model.generate_stream(
+                    prompt,
+                    max_tokens=kwargs.get('max_tokens', 100),
+                    temperature=kwargs.get('temperature', 0.7),
+                    top_p=kwargs.get('top_p', 1.0)
+                ):
+                    yield chunk
+            finally:
+                # Observed for failed and abandoned streams too, which still held a provider connection.
+                observe_stage("provider_call", time.perf_counter() - started, model.model_name,
+                              self._provider_name(model))
+
+    @staticmethod
+    def _provider_name(model: Any) -> str:
+        return type(getattr(model, "provider", model)).__name__
+
+    async def _cache_key(self, request_type: str, llm_request: CompletionRequest) -> str:
+        """
+        Build the response cache key for a request.
+
+        Keys live in a per-request-type namespace so that all cached responses
+        for one prompt can be invalidated at once during a prompt rollout.
+
+        Args:
+            request_type (str): The type of request, which names its prompt template.
+            llm_request (CompletionRequest): The request sent to the model.
+
+        Returns:
+            str: A cache key derived from the prompt, model and generation parameters.
+        """
+        return await self.cache.namespaced_key(f"llm_response:{request_type}", self._request_digest(llm_request))
+
+    @staticmethod
+    def _request_digest(llm_request: CompletionRequest) -> str:
+        """
+        Hash the parameters of a request that determine its response.
+
+        Args:
+            llm_request (CompletionRequest): The request sent to the model.
+
+        Returns:
+            str: The hex SHA-256 digest of the canonical JSON form of the request.
+        """
+        payload = json.dumps(llm_request.to_dict(), sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    async def invalidate_responses(self, request_type: str) -> None:
+        """
+        Invalidate all cached responses for a request type.
+
+        The namespace is flushed at once, and the outdated entries are then
+        removed by a background sweep instead of waiting for their TTL.
+
+        Args:
+            request_type (str): The type of request whose cached responses should be dropped.
+        """
+        if self.cache is not None:
+            namespace = f"llm_response:{request_type}"
+            await self.cache.flush(namespace)
+            task = asyncio.create_task(self._sweep(namespace))
+            self._sweeps.add(task)
+            task.add_done_callback(self._sweeps.discard)
+
+    async def _sweep(self, namespace: str) -> None:
+        try:
+            deleted = await self.cache.sweep_namespace(namespace)
+            logger.debug("Swept %d outdated cache entries from %s", deleted, namespace)
+        except Exception:
+            logger.exception("Background sweep of cache namespace %s failed", namespace)
 
     def _get_model(self, request_type: str) -> Any:
         """
@@ -93,7 +262,7 @@ class LLMOrchestrator:
         """
         # This is a simplified version. In a real-world scenario, you might have
         # more complex logic to select the appropriate model.
-        if request_type in ["translate", "summarize"]:
+        if request_type in ["generate", "translate", "summarize"]:
             return self.model_factory.get_model("gpt-3.5-turbo")
         elif request_type in ["code_generation", "complex_reasoning"]:
             return self.model_factory.get_model("gpt-4")
@@ -118,8 +287,10 @@ class LLMOrchestrator:
         Raises:
             ValueError: If no suitable prompt template is found for the request type.
         """
-        prompt_template = self.prompt_repo.get_prompt(request_type)
+        with track_stage("prompt_lookup"):
+            prompt_template = self.prompt_repo.get_prompt(request_type)
         if prompt_template is None:
             raise ValueError(f"No prompt template found for request type: {request_type}")
         
-        return prompt_template.format(input_text=input_text, **kwargs)
\ No newline at end of file
+        with tracer.start_as_current_span("prompt.render"), track_stage("prompt_formatting"):
+            return prompt_template.format(input_text=input_text, **kwargs)
\ No newline at end of file
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseSettings, Field
 
 class Settings(BaseSettings):
@@ -10,22 +11,103 @@ class Settings(BaseSettings):
     Attributes:
         APP_NAME (str): The name of the application.
         DEBUG (bool): Debug mode flag.
+        LLM_PROVIDER (str): "live" to call the configured LLM APIs, "fake" for the offline simulated provider,
+            or "replay" to serve recorded cassettes.
+        FAKE_LLM_LATENCY_MEAN (float): Mean time-to-first-token of the fake provider in seconds.
+        FAKE_LLM_LATENCY_STDDEV (float): Standard deviation of the fake provider's time-to-first-token in seconds.
+        FAKE_LLM_LATENCY_DISTRIBUTION (str): Latency distribution of the fake provider ("fixed", "normal", "lognormal", "exponential").
+        FAKE_LLM_TOKENS_PER_SECOND (float): Token generation rate of the fake provider.
+        FAKE_LLM_ERROR_RATE (float): Probability that a fake provider call fails.
+        LLM_RECORD_PATH (Optional[str]): In live mode, record provider traffic to this cassette path.
+            "{model}" is replaced with the model name.
+        LLM_REPLAY_PATH (str): Cassette path served in replay mode. "{model}" is replaced with the model name.
+        LLM_REPLAY_TIME_SCALE (float): Multiplier for recorded latencies in replay mode; 0 replays instantly.
+        LLM_REPLAY_STRICT (bool): Whether unrecorded requests fail in replay mode instead of reusing recordings.
         OPENAI_API_KEY (str): API key for OpenAI services.
         ANTHROPIC_API_KEY (str): API key for Anthropic services.
         REDIS_HOST (str): Hostname for the Redis server.
         REDIS_PORT (int): Port number for the Redis server.
         REDIS_DB (int): Redis database number to use.
+        CACHE_BACKEND (str): Cache backend to use ("redis" or "memory").
+        MEMORY_CACHE_MAX_ENTRIES (int): Maximum number of entries held by the in-memory cache backend.
+        MEMORY_CACHE_MAX_BYTES (int): Maximum encoded size in bytes of the in-memory cache backend.
+        CACHE_CODEC (str): Codec for cached values ("json", "msgpack" or "float32").
+        CACHE_COMPRESSION (str): Compression for large cached values ("none", "zlib" or "lz4").
+        CACHE_COMPRESSION_THRESHOLD (int): Minimum encoded size in bytes before compression applies.
+        CACHE_GENERATION_TTL (float): Seconds a cache namespace generation is cached in-process.
+        NEAR_CACHE_ENABLED (bool): Whether to serve hot keys from an in-process L1 cache in front of Redis.
+        NEAR_CACHE_MAX_ENTRIES (int): Maximum number of entries in the L1 cache.
+        NEAR_CACHE_MAX_BYTES (int): Maximum accounted size of the L1 cache in bytes.
+        NEAR_CACHE_TTL (float): Maximum lifetime of an L1 entry in seconds.
+        TIERED_CACHE_ENABLED (bool): Whether to cache in process memory, Redis and local disk tiers.
+        TIERED_CACHE_SHARED_TTL (int): Maximum TTL in seconds of entries in Redis; colder entries live on disk only.
+        TIERED_CACHE_MEMORY_TTL (int): Maximum TTL in seconds of entries promoted into process memory.
+        TIERED_CACHE_PROMOTE_HITS (int): Number of reads from Redis or disk after which an entry is promoted
+            into process memory.
+        DISK_CACHE_PATH (str): Path of the SQLite database backing the disk tier.
+        DISK_CACHE_MAX_BYTES (int): Maximum total size in bytes of the disk tier.
+        LLM_CACHE_SOFT_TTL (int): Seconds after which a cached LLM response is served stale while it is refreshed.
+        LLM_CACHE_HARD_TTL (int): Seconds after which a cached LLM response is removed.
+        LLM_CACHE_LOCK_TTL (int): Seconds after which the lock held while computing an uncached response expires.
+        LLM_CACHE_WAIT_TIMEOUT (float): Seconds a request waits for a response another request is computing.
+            Should be at least the provider timeout.
+        JOB_QUEUE_PREFIX (str): Prefix of the Redis keys used by the asynchronous job queue.
+        JOB_QUEUE_MAX_PENDING (int): Maximum number of unfinished jobs; further submissions are rejected. 0 disables the limit.
+        JOB_TTL (int): Seconds an unfinished job is kept.
+        JOB_RESULT_TTL (int): Seconds a finished job and its result are kept.
+        JOB_WORKER_CONCURRENCY (int): Maximum number of jobs a worker process runs at once.
+        JOB_WORKER_CLAIM_IDLE (float): Seconds after which a job held by an unresponsive worker is reclaimed.
+        JOB_WORKER_MAX_ATTEMPTS (int): Maximum number of times a job is started before it fails.
+        JOB_WORKER_METRICS_PORT (int): Port on which a worker process serves Prometheus metrics. 0 disables it.
+        VECTOR_STORE_PATH (str): Directory of the memory-mapped vector store.
+        EMBEDDING_MODEL (str): Registered embedding model whose provider creates embeddings. Reported in
+            embedding responses and part of the embedding cache key.
+        EMBEDDING_DIM (int): Dimension of the embeddings stored in the vector store.
+        VECTOR_INDEX (str): Vector search index ("flat" for exact search or "ivf" for the approximate IVF index).
+        VECTOR_INDEX_LISTS (int): Number of IVF lists built by training. 0 picks about 4 * sqrt(vectors).
+        VECTOR_INDEX_NPROBE (int): Number of IVF lists scored per search; higher is slower with better recall.
+        VECTOR_INDEX_TRAIN_THRESHOLD (int): Number of stored vectors at which the IVF index is first trained
+            in the background. 0 disables it.
+        VECTOR_INDEX_RETRAIN_GROWTH (float): Growth factor of the stored vectors since the last training at which
+            the IVF index is retrained in the background. 0 disables retraining.
+        VECTOR_QUANTIZATION (str): Compressed codes searched in the vector store ("none", "int8" or "pq").
+        VECTOR_PQ_SUBSPACES (int): Code size in bytes of product quantization. 0 picks EMBEDDING_DIM / 8.
+        VECTOR_RERANK (int): Multiple of k re-scored with full precision after a quantized search. 0 disables it.
+        EMBEDDING_CACHE_CODEC (str): Cache codec for created embeddings ("int8" or "float32").
+        EMBEDDING_CACHE_TTL (int): Seconds a created embedding is cached.
         DEFAULT_MODEL (str): Default LLM model to use.
         MAX_TOKENS (int): Maximum number of tokens for LLM responses.
         LOG_LEVEL (str): Logging level for the application.
+        ACCESS_LOG_SAMPLE_RATIO (float): Fraction of successful requests written to the access log.
         JAEGER_HOST (str): Hostname for the Jaeger tracing server.
         JAEGER_PORT (int): Port number for the Jaeger tracing server.
+        LOOP_MONITOR_ENABLED (bool): Whether to measure event loop lag.
+        LOOP_MONITOR_INTERVAL (float): Seconds between event loop lag measurements.
+        LOOP_BLOCK_THRESHOLD (float): Seconds a callback may hold the event loop before it is reported.
+        LOOP_BLOCK_CAPTURE_STACKS (bool): Whether to log the stack of blocking callbacks. Always on in debug mode.
+        PROFILING_TOKEN (Optional[str]): Token authorizing on-demand request profiling. Profiling is disabled when unset.
+        PROFILING_INTERVAL (float): Seconds between stack samples of a profiled request.
+        PROFILING_MAX_PROFILES (int): Number of recorded profiles kept in memory.
+        TRACING_ENABLED (bool): Whether to record and export traces.
+        TRACE_SAMPLE_RATIO (float): Fraction of new traces that are recorded (head sampling).
+        TRACE_TAIL_SAMPLE_RATIO (float): Fraction of recorded, successful and fast traces that are exported.
+        TRACE_TAIL_LATENCY_THRESHOLD (float): Traces slower than this many seconds are always exported.
     """
 
     APP_NAME: str = "LLM-Powered Microservice"
     DEBUG: bool = Field(False, env="DEBUG")
     
     # API Keys
+    LLM_PROVIDER: str = Field("live", env="LLM_PROVIDER")
+    FAKE_LLM_LATENCY_MEAN: float = Field(0.2, env="FAKE_LLM_LATENCY_MEAN")
+    FAKE_LLM_LATENCY_STDDEV: float = Field(0.05, env="FAKE_LLM_LATENCY_STDDEV")
+    FAKE_LLM_LATENCY_DISTRIBUTION: str = Field("lognormal", env="FAKE_LLM_LATENCY_DISTRIBUTION")
+    FAKE_LLM_TOKENS_PER_SECOND: float = Field(50.0, env="FAKE_LLM_TOKENS_PER_SECOND")
+    FAKE_LLM_ERROR_RATE: float = Field(0.0, env="FAKE_LLM_ERROR_RATE")
+    LLM_RECORD_PATH: Optional[str] = Field(None, env="LLM_RECORD_PATH")
+    LLM_REPLAY_PATH: str = Field("cassettes/{model}.jsonl.gz", env="LLM_REPLAY_PATH")
+    LLM_REPLAY_TIME_SCALE: float = Field(1.0, env="LLM_REPLAY_TIME_SCALE")
+    LLM_REPLAY_STRICT: bool = Field(True, env="LLM_REPLAY_STRICT")
     OPENAI_API_KEY: str = Field(..., env="OPENAI_API_KEY")
     ANTHROPIC_API_KEY: str = Field(..., env="ANTHROPIC_API_KEY")
     
@@ -33,6 +115,54 @@ class Settings(BaseSettings):
     REDIS_HOST: str = Field("localhost", env="REDIS_HOST")
     REDIS_PORT: int = Field(6379, env="REDIS_PORT")
     REDIS_DB: int = Field(0, env="REDIS_DB")
+
+    # Cache Configuration
+    CACHE_BACKEND: str = Field("redis", env="CACHE_BACKEND")
+    MEMORY_CACHE_MAX_ENTRIES: int = Field(10000, env="MEMORY_CACHE_MAX_ENTRIES")
+    MEMORY_CACHE_MAX_BYTES: int = Field(64 * 1024 * 1024, env="MEMORY_CACHE_MAX_BYTES")
+    CACHE_CODEC: str = Field("json", env="CACHE_CODEC")
+    CACHE_COMPRESSION: str = Field("zlib", env="CACHE_COMPRESSION")
+    CACHE_COMPRESSION_THRESHOLD: int = Field(1024, env="CACHE_COMPRESSION_THRESHOLD")
+    CACHE_GENERATION_TTL: float = Field(1.0, env="CACHE_GENERATION_TTL")
+    NEAR_CACHE_ENABLED: bool = Field(False, env="NEAR_CACHE_ENABLED")
+    NEAR_CACHE_MAX_ENTRIES: int = Field(10000, env="NEAR_CACHE_MAX_ENTRIES")
+    NEAR_CACHE_MAX_BYTES: int = Field(64 * 1024 * 1024, env="NEAR_CACHE_MAX_BYTES")
+    NEAR_CACHE_TTL: float = Field(60.0, env="NEAR_CACHE_TTL")
+    TIERED_CACHE_ENABLED: bool = Field(False, env="TIERED_CACHE_ENABLED")
+    TIERED_CACHE_SHARED_TTL: int = Field(3600, env="TIERED_CACHE_SHARED_TTL")
+    TIERED_CACHE_MEMORY_TTL: int = Field(60, env="TIERED_CACHE_MEMORY_TTL")
+    TIERED_CACHE_PROMOTE_HITS: int = Field(3, env="TIERED_CACHE_PROMOTE_HITS")
+    DISK_CACHE_PATH: str = Field("/tmp/llm-cache/cache.sqlite3", env="DISK_CACHE_PATH")
+    DISK_CACHE_MAX_BYTES: int = Field(1024 * 1024 * 1024, env="DISK_CACHE_MAX_BYTES")
+    LLM_CACHE_SOFT_TTL: int = Field(3600, env="LLM_CACHE_SOFT_TTL")
+    LLM_CACHE_HARD_TTL: int = Field(7200, env="LLM_CACHE_HARD_TTL")
+    LLM_CACHE_LOCK_TTL: int = Field(180, env="LLM_CACHE_LOCK_TTL")
+    LLM_CACHE_WAIT_TIMEOUT: float = Field(120.0, env="LLM_CACHE_WAIT_TIMEOUT")
+
+    # Asynchronous Jobs
+    JOB_QUEUE_PREFIX: str = Field("llm_jobs", env="JOB_QUEUE_PREFIX")
+    JOB_QUEUE_MAX_PENDING: int = Field(10000, env="JOB_QUEUE_MAX_PENDING")
+    JOB_TTL: int = Field(86400, env="JOB_TTL")
+    JOB_RESULT_TTL: int = Field(86400, env="JOB_RESULT_TTL")
+    JOB_WORKER_CONCURRENCY: int = Field(8, env="JOB_WORKER_CONCURRENCY")
+    JOB_WORKER_CLAIM_IDLE: float = Field(300.0, env="JOB_WORKER_CLAIM_IDLE")
+    JOB_WORKER_MAX_ATTEMPTS: int = Field(3, env="JOB_WORKER_MAX_ATTEMPTS")
+    JOB_WORKER_METRICS_PORT: int = Field(9100, env="JOB_WORKER_METRICS_PORT")
+
+    # Embeddings and Vector Search
+    VECTOR_STORE_PATH: str = Field("/tmp/llm-vectors", env="VECTOR_STORE_PATH")
+    EMBEDDING_MODEL: str = Field("text-embedding-ada-002", env="EMBEDDING_MODEL")
+    EMBEDDING_DIM: int = Field(1536, env="EMBEDDING_DIM")
+    VECTOR_INDEX: str = Field("flat", env="VECTOR_INDEX")
+    VECTOR_INDEX_LISTS: int = Field(0, env="VECTOR_INDEX_LISTS")
+    VECTOR_INDEX_NPROBE: int = Field(8, env="VECTOR_INDEX_NPROBE")
+    VECTOR_INDEX_TRAIN_THRESHOLD: int = Field(100000, env="VECTOR_INDEX_TRAIN_THRESHOLD")
+    VECTOR_INDEX_RETRAIN_GROWTH: float = Field(2.0, env="VECTOR_INDEX_RETRAIN_GROWTH")
+    VECTOR_QUANTIZATION: str = Field("none", env="VECTOR_QUANTIZATION")
+    VECTOR_PQ_SUBSPACES: int = Field(0, env="VECTOR_PQ_SUBSPACES")
+    VECTOR_RERANK: int = Field(4, env="VECTOR_RERANK")
+    EMBEDDING_CACHE_CODEC: str = Field("int8", env="EMBEDDING_CACHE_CODEC")
+    EMBEDDING_CACHE_TTL: int = Field(86400, env="EMBEDDING_CACHE_TTL")
     
     # LLM Configuration
     DEFAULT_MODEL: str = Field("gpt-3.5-turbo", env="DEFAULT_MODEL")
@@ -40,8 +170,20 @@ class Settings(BaseSettings):
 
     # Logging and Tracing
     LOG_LEVEL: str = Field("INFO", env="LOG_LEVEL")
+    ACCESS_LOG_SAMPLE_RATIO: float = Field(1.0, env="ACCESS_LOG_SAMPLE_RATIO")
     JAEGER_HOST: str = Field("localhost", env="JAEGER_HOST")
     JAEGER_PORT: int = Field(6831, env="JAEGER_PORT")
+    LOOP_MONITOR_ENABLED: bool = Field(True, env="LOOP_MONITOR_ENABLED")
+    LOOP_MONITOR_INTERVAL: float = Field(0.5, env="LOOP_MONITOR_INTERVAL")
+    LOOP_BLOCK_THRESHOLD: float = Field(0.25, env="LOOP_BLOCK_THRESHOLD")
+    LOOP_BLOCK_CAPTURE_STACKS: bool = Field(False, env="LOOP_BLOCK_CAPTURE_STACKS")
+    PROFILING_TOKEN: Optional[str] = Field(None, env="PROFILING_TOKEN")
+    PROFILING_INTERVAL: float = Field(0.005, env="PROFILING_INTERVAL")
+    PROFILING_MAX_PROFILES: int = Field(50, env="PROFILING_MAX_PROFILES")
+    TRACING_ENABLED: bool = Field(True, env="TRACING_ENABLED")
+    TRACE_SAMPLE_RATIO: float = Field(0.1, env="TRACE_SAMPLE_RATIO")
+    TRACE_TAIL_SAMPLE_RATIO: float = Field(1.0, env="TRACE_TAIL_SAMPLE_RATIO")
+    TRACE_TAIL_LATENCY_THRESHOLD: float = Field(2.0, env="TRACE_TAIL_LATENCY_THRESHOLD")
 
     class Config:
         env_file = ".env"
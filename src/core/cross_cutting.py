@@ -1,43 +1,254 @@
+import atexit
+import json
 import logging
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import logging.handlers
+import queue
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
 from opentelemetry import trace
+from opentelemetry.context import Context
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
 from opentelemetry.exporter.jaeger.thrift import JaegerExporter
+from opentelemetry.trace import StatusCode
 
-# Set up logging
+from .config import settings
+
+T = TypeVar("T")
+
+# Set up logging. setup_logging() replaces this with the queued JSON pipeline.
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("access")
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+# ID of the request being served, attached to every log record emitted during it.
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+_RESERVED_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the current request ID while still on the emitting task."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats log records as single-line JSON objects.
+
+    Fields passed through `extra` are included as top-level keys, so access
+    logs can be queried by status, route or duration.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
 
-# Set up tracing
-trace.set_tracer_provider(TracerProvider())
+def setup_logging() -> None:
+    """
+    Route all logging through a queue drained by a background thread.
+
+    Records are enqueued by a QueueHandler on the root logger, so emitting
+    a log line never performs I/O on the event loop. A QueueListener thread
+    formats them as JSON and writes them to stderr. Calling it more than
+    once is a no-op.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JSONFormatter())
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    _log_listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+# The global tracer proxies to whichever provider setup_tracing installs;
+# until then spans are non-recording and cost next to nothing.
 tracer = trace.get_tracer(__name__)
+_tracing_configured = False
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """
+    Buffers the spans of each trace and exports only the interesting traces.
+
+    When the local root span of a trace ends, the whole trace is forwarded
+    to the delegate processor if any span failed, if the root took at least
+    `latency_threshold` seconds, or otherwise with probability
+    `sample_ratio`. Traces still open when `max_traces` is reached are
+    dropped oldest first.
+    """
+
+    def __init__(self, delegate: SpanProcessor, sample_ratio: float, latency_threshold: float,
+                 max_traces: int = 10000):
+        self.delegate = delegate
+        self.sample_ratio = sample_ratio
+        self.latency_threshold_ns = int(latency_threshold * 1e9)
+        self.max_traces = max_traces
+        self._traces: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self.delegate.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        trace_id = span.context.trace_id
+        is_local_root = span.parent is None or span.parent.is_remote
+        with self._lock:
+            spans = self._traces.setdefault(trace_id, [])
+            spans.append(span)
+            if not is_local_root:
+                if len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+                return
+            del self._traces[trace_id]
+
+        if self._keep(span, spans):
+            for buffered in spans:
+                self.delegate.on_end(buffered)
+
+    def _keep(self, root: ReadableSpan, spans: List[ReadableSpan]) -> bool:
+        if any(s.status.status_code is StatusCode.ERROR for s in spans):
+            return True
+        if root.end_time - root.start_time >= self.latency_threshold_ns:
+            return True
+        return random.random() < self.sample_ratio
+
+    def shutdown(self) -> None:
+        self.delegate.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.delegate.force_flush(timeout_millis)
+
+def setup_tracing() -> None:
+    """
+    Install the tracer provider configured in settings.
+
+    Head sampling (TRACE_SAMPLE_RATIO) decides which traces are recorded at
+    all and is respected for traces started upstream. Tail sampling
+    (TRACE_TAIL_SAMPLE_RATIO) decides which recorded traces are exported,
+    always keeping failed traces and those slower than
+    TRACE_TAIL_LATENCY_THRESHOLD. Calling it more than once is a no-op.
+    """
+    global _tracing_configured
+    if _tracing_configured or not settings.TRACING_ENABLED:
+        return
+
+    provider = TracerProvider(sampler=ParentBased(TraceIdRatioBased(settings.TRACE_SAMPLE_RATIO)))
+    processor: SpanProcessor = BatchSpanProcessor(JaegerExporter(
+        agent_host_name=settings.JAEGER_HOST,
+        agent_port=settings.JAEGER_PORT,
+    ))
+    if settings.TRACE_TAIL_SAMPLE_RATIO < 1.0:
+        processor = TailSamplingSpanProcessor(
+            processor,
+            sample_ratio=settings.TRACE_TAIL_SAMPLE_RATIO,
+            latency_threshold=settings.TRACE_TAIL_LATENCY_THRESHOLD,
+        )
+    provider.add_span_processor(processor)
+    trace.set_tracer_provider(provider)
+    _tracing_configured = True
+
+class LoggingMiddleware:
+    """
+    Pure ASGI middleware writing one structured access log entry per request.
+
+    Unlike BaseHTTPMiddleware it does not wrap the response body, so
+    streaming responses pass through untouched. Each request gets an ID,
+    taken from the X-Request-ID header when present, which is echoed in the
+    response and attached to every log record emitted while serving it.
+    Failed requests (status >= 500 or an exception) and client errors are
+    always logged; successful ones with probability `sample_ratio`.
+
+    Attributes:
+        app: The wrapped ASGI application.
+        sample_ratio (float): Fraction of successful requests to log.
+    """
+
+    def __init__(self, app, sample_ratio: Optional[float] = None):
+        self.app = app
+        self.sample_ratio = settings.ACCESS_LOG_SAMPLE_RATIO if sample_ratio is None else sample_ratio
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _header(scope, b"x-request-id") or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        failed = True
+        try:
+            await self.app(scope, receive, send_wrapper)
+            failed = False
+        finally:
+            if failed or status >= 400 or random.random() < self.sample_ratio:
+                access_logger.log(
+                    logging.ERROR if failed or status >= 500 else logging.INFO,
+                    "request completed",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status,
+                        "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                    },
+                )
+            request_id_var.reset(token)
 
-# Set up Jaeger exporter
-jaeger_exporter = JaegerExporter(
-    agent_host_name="localhost",
-    agent_port=6831,
-)
-span_processor = BatchSpanProcessor(jaeger_exporter)
-trace.get_tracer_provider().add_span_processor(span_processor)
-
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        logger.info(f"Incoming request: {request.method} {request.url}")
-        response = await call_next(request)
-        logger.info(f"Outgoing response: {response.status_code}")
-        return response
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
 
 def setup_instrumentation(app):
-    FastAPIInstrumentor.instrument_app(app)
+    setup_logging()
+    setup_tracing()
+    if settings.TRACING_ENABLED:
+        FastAPIInstrumentor.instrument_app(app)
 
 def log_error(error: Exception):
-    logger.error(f"An error occurred: {str(error)}", exc_info=True)
+    logger.error("An error occurred: %s", error, exc_info=True)
 
-@tracer.start_as_current_span("process_request")
-async def process_request(request_data):
-    # This is a placeholder for request processing logic
-    # You would typically call your LLM service here
-    pass
\ No newline at end of file
+async def process_request(request_data: Awaitable[T]) -> T:
+    with tracer.start_as_current_span("process_request"):
+        return await request_data
@@ -1,41 +1,212 @@
+import os
 from fastapi import Depends
-from functools import lru_cache
+from functools import lru_cache, partial
 from typing import Generator
 
+from application.services.embedding_service import EmbeddingService
 from application.services.llm_orchestrator import LLMOrchestrator
+from infrastructure.cache.base import BaseCache
 from infrastructure.cache.redis_cache import RedisCache
+from infrastructure.cache.memory_cache import InMemoryCache
+from infrastructure.cache.codecs import ValueSerializer
+from infrastructure.cache.near_cache import NearCache
+from infrastructure.cache.disk_cache import SQLiteCache
+from infrastructure.cache.tiered_cache import TieredCache
 from infrastructure.llm_providers.openai import OpenAIProvider
 from infrastructure.llm_providers.anthropic import AnthropicProvider
+from infrastructure.llm_providers.fake import FakeLLMProvider
+from infrastructure.llm_providers.cassette import CassetteWriter, RecordingProvider, ReplayProvider
+from infrastructure.queue.base import BaseJobQueue
+from infrastructure.queue.redis_queue import RedisJobQueue
+from infrastructure.vector_store.base import BaseVectorStore
+from infrastructure.vector_store.ivf_index import IVFVectorStore
+from infrastructure.vector_store.mmap_store import MemmapVectorStore
 from application.models.model_factory import ModelFactory
+from application.models.provider_model import ProviderModel
 from application.prompt_management.prompt_repository import PromptRepository
+from application.prompt_management.prompt_template import PromptTemplate
 from .config import settings
 
 @lru_cache()
-def get_redis_cache() -> RedisCache:
+def get_cache() -> BaseCache:
+    serializer = ValueSerializer(
+        codec=settings.CACHE_CODEC,
+        compression=settings.CACHE_COMPRESSION,
+        compress_threshold=settings.CACHE_COMPRESSION_THRESHOLD
+    )
+    if settings.CACHE_BACKEND == "memory":
+        return InMemoryCache(
+            max_entries=settings.MEMORY_CACHE_MAX_ENTRIES,
+            max_bytes=settings.MEMORY_CACHE_MAX_BYTES,
+            serializer=serializer
+        )
+    if settings.CACHE_BACKEND != "redis":
+        raise ValueError(f"Unsupported cache backend: {settings.CACHE_BACKEND}")
+    if settings.TIERED_CACHE_ENABLED:
+        return TieredCache(
+            memory=InMemoryCache(
+                max_entries=settings.MEMORY_CACHE_MAX_ENTRIES,
+                max_bytes=settings.MEMORY_CACHE_MAX_BYTES,
+                serializer=serializer
+            ),
+            shared=RedisCache(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                serializer=serializer,
+                generation_ttl=settings.CACHE_GENERATION_TTL
+            ),
+            disk=SQLiteCache(
+                path=settings.DISK_CACHE_PATH,
+                max_bytes=settings.DISK_CACHE_MAX_BYTES,
+                serializer=serializer
+            ),
+            shared_ttl=settings.TIERED_CACHE_SHARED_TTL,
+            memory_ttl=settings.TIERED_CACHE_MEMORY_TTL,
+            promote_hits=settings.TIERED_CACHE_PROMOTE_HITS
+        )
+    if settings.NEAR_CACHE_ENABLED:
+        return NearCache(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            serializer=serializer,
+            generation_ttl=settings.CACHE_GENERATION_TTL,
+            max_entries=settings.NEAR_CACHE_MAX_ENTRIES,
+            max_bytes=settings.NEAR_CACHE_MAX_BYTES,
+            local_ttl=settings.NEAR_CACHE_TTL
+        )
     return RedisCache(
         host=settings.REDIS_HOST,
         port=settings.REDIS_PORT,
-        db=settings.REDIS_DB
+        db=settings.REDIS_DB,
+        serializer=serializer,
+        generation_ttl=settings.CACHE_GENERATION_TTL
     )
 
 @lru_cache()
 def get_model_factory() -> ModelFactory:
+    if settings.LLM_PROVIDER == "fake":
+        fake = FakeLLMProvider(
+            latency_mean=settings.FAKE_LLM_LATENCY_MEAN,
+            latency_stddev=settings.FAKE_LLM_LATENCY_STDDEV,
+            latency_distribution=settings.FAKE_LLM_LATENCY_DISTRIBUTION,
+            tokens_per_second=settings.FAKE_LLM_TOKENS_PER_SECOND,
+            error_rate=settings.FAKE_LLM_ERROR_RATE
+        )
+        providers = {"gpt-3.5-turbo": fake, "gpt-4": fake, "claude-v1": fake, "text-embedding-ada-002": fake}
+    elif settings.LLM_PROVIDER == "replay":
+        replayers = {}
+        providers = {}
+        for model_name in ("gpt-3.5-turbo", "gpt-4", "claude-v1", "text-embedding-ada-002"):
+            path = settings.LLM_REPLAY_PATH.format(model=model_name)
+            if not os.path.exists(path):
+                continue
+            if path not in replayers:
+                replayers[path] = ReplayProvider(
+                    path,
+                    time_scale=settings.LLM_REPLAY_TIME_SCALE,
+                    strict=settings.LLM_REPLAY_STRICT
+                )
+            providers[model_name] = replayers[path]
+    elif settings.LLM_PROVIDER == "live":
+        providers = {
+            "gpt-3.5-turbo": OpenAIProvider(settings.OPENAI_API_KEY),
+            "gpt-4": OpenAIProvider(settings.OPENAI_API_KEY, model="gpt-4"),
+            "claude-v1": AnthropicProvider(settings.ANTHROPIC_API_KEY),
+            "text-embedding-ada-002": OpenAIProvider(settings.OPENAI_API_KEY, model="text-embedding-ada-002")
+        }
+        if settings.LLM_RECORD_PATH:
+            writers = {}
+            for model_name, provider in providers.items():
+                path = settings.LLM_RECORD_PATH.format(model=model_name)
+                if path not in writers:
+                    writers[path] = CassetteWriter(path)
+                providers[model_name] = RecordingProvider(provider, writers[path])
+    else:
+        raise ValueError(f"Unsupported LLM provider: {settings.LLM_PROVIDER}")
     factory = ModelFactory()
-    factory.register_model("gpt-3.5-turbo", OpenAIProvider(settings.OPENAI_API_KEY))
-    factory.register_model("claude-v1", AnthropicProvider(settings.ANTHROPIC_API_KEY))
+    for model_name, provider in providers.items():
+        factory.register_model(model_name, partial(ProviderModel, provider=provider))
     return factory
 
 @lru_cache()
 def get_prompt_repository() -> PromptRepository:
-    return PromptRepository()
+    repo = PromptRepository()
+    repo.add_prompt(PromptTemplate(name="generate", template="$input_text", version="1.0"))
+    repo.add_prompt(PromptTemplate(
+        name="summarize",
+        template="Summarize the following text in no more than $max_length words:\n\n$input_text",
+        version="1.0"
+    ))
+    return repo
 
 @lru_cache()
 def get_llm_orchestrator(
-    cache: RedisCache = Depends(get_redis_cache),
+    cache: BaseCache = Depends(get_cache),
     model_factory: ModelFactory = Depends(get_model_factory),
     prompt_repo: PromptRepository = Depends(get_prompt_repository)
 ) -> LLMOrchestrator:
-    return LLMOrchestrator(model_factory, prompt_repo, cache)
+    return LLMOrchestrator(
+        model_factory,
+        prompt_repo,
+        cache,
+        cache_soft_ttl=settings.LLM_CACHE_SOFT_TTL,
+        cache_hard_ttl=settings.LLM_CACHE_HARD_TTL,
+        cache_lock_ttl=settings.LLM_CACHE_LOCK_TTL,
+        cache_wait_timeout=settings.LLM_CACHE_WAIT_TIMEOUT
+    )
+
+@lru_cache()
+def get_job_queue() -> BaseJobQueue:
+    return RedisJobQueue(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        prefix=settings.JOB_QUEUE_PREFIX,
+        max_pending=settings.JOB_QUEUE_MAX_PENDING,
+        job_ttl=settings.JOB_TTL,
+        result_ttl=settings.JOB_RESULT_TTL
+    )
+
+@lru_cache()
+def get_vector_store() -> BaseVectorStore:
+    if settings.VECTOR_INDEX == "ivf":
+        return IVFVectorStore(
+            settings.VECTOR_STORE_PATH,
+            dim=settings.EMBEDDING_DIM,
+            n_lists=settings.VECTOR_INDEX_LISTS,
+            nprobe=settings.VECTOR_INDEX_NPROBE,
+            train_threshold=settings.VECTOR_INDEX_TRAIN_THRESHOLD,
+            retrain_growth=settings.VECTOR_INDEX_RETRAIN_GROWTH,
+            quantization=settings.VECTOR_QUANTIZATION,
+            pq_subspaces=settings.VECTOR_PQ_SUBSPACES,
+            rerank=settings.VECTOR_RERANK
+        )
+    if settings.VECTOR_INDEX != "flat":
+        raise ValueError(f"Unsupported vector index: {settings.VECTOR_INDEX}")
+    return MemmapVectorStore(
+        settings.VECTOR_STORE_PATH,
+        dim=settings.EMBEDDING_DIM,
+        quantization=settings.VECTOR_QUANTIZATION,
+        pq_subspaces=settings.VECTOR_PQ_SUBSPACES,
+        rerank=settings.VECTOR_RERANK
+    )
+
+@lru_cache()
+def get_embedding_service(
+    model_factory: ModelFactory = Depends(get_model_factory),
+    vector_store: BaseVectorStore = Depends(get_vector_store),
+    cache: BaseCache = Depends(get_cache)
+) -> EmbeddingService:
+    return EmbeddingService(
+        model_factory,
+        vector_store,
+        model_name=settings.EMBEDDING_MODEL,
+        cache=cache,
+        cache_codec=settings.EMBEDDING_CACHE_CODEC,
+        cache_ttl=settings.EMBEDDING_CACHE_TTL
+    )
 
 def get_db() -> Generator:
     # This is a placeholder for database session management
@@ -51,4 +51,17 @@ class LLMProviderError(LLMServiceException):
 
     def __init__(self, provider: str, details: str):
         message = f"Error with LLM provider {provider}: {details}"
-        super().__init__(message, status_code=502)  # Bad Gateway
\ No newline at end of file
+        super().__init__(message, status_code=502)  # Bad Gateway
+
+class JobQueueFullError(LLMServiceException):
+    """
+    Exception raised when a job is submitted while the job queue is at capacity.
+
+    Attributes:
+        depth (int): The number of jobs queued or running when the job was rejected.
+    """
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        message = f"Job queue is full ({depth} jobs pending)"
+        super().__init__(message, status_code=503)  # Service Unavailable
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from .config import settings
+from .metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+class EventLoopMonitor:
+    """
+    Measures event-loop lag and reports callbacks that block the loop.
+
+    A heartbeat task sleeps for `interval` seconds and records how much
+    later than requested it woke up; that delay is the time other callbacks
+    held the loop and is exported as the event loop lag histogram.
+
+    When `capture_stacks` is enabled, a watchdog thread also checks the
+    heartbeat. If the loop has not ticked for `block_threshold` seconds, the
+    watchdog samples the loop thread's current stack, logs it and counts
+    the stall, so synchronous I/O hidden inside a coroutine shows up with
+    the line that caused it. In debug mode asyncio's own slow-callback
+    warnings are enabled as well.
+
+    Attributes:
+        interval (float): Seconds between heartbeats.
+        block_threshold (float): Seconds without a heartbeat after which the loop counts as blocked.
+        capture_stacks (bool): Whether to run the watchdog thread that captures stacks.
+
+    Methods:
+        start: Start monitoring the running event loop.
+        stop: Stop monitoring.
+    """
+
+    def __init__(self, interval: float = 0.5, block_threshold: float = 0.25, capture_stacks: bool = False):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.capture_stacks = capture_stacks
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """
+        Start monitoring the running event loop. Must be called from the loop.
+        """
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if settings.DEBUG:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.block_threshold
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = loop.create_task(self._run())
+        if self.capture_stacks:
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """
+        Stop monitoring and wait for the heartbeat task to finish.
+        """
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.block_threshold)
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            EVENT_LOOP_LAG.observe(max(0.0, now - started - self.interval))
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        # Check twice per threshold so a stall is caught while it is still in progress.
+        while not self._stopped.wait(self.block_threshold / 2):
+            heartbeat = self._heartbeat
+            # The heartbeat is only expected every `interval` seconds.
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+            reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<unavailable>"
+            EVENT_LOOP_BLOCKED.inc()
+            logger.warning(
+                "Event loop blocked for at least %.3fs; loop thread stack:\n%s",
+                stalled, stack,
+                extra={"blocked_seconds": round(stalled, 3)},
+            )
+
+def setup_loop_monitor(app) -> Optional[EventLoopMonitor]:
+    """
+    Run an EventLoopMonitor for the lifetime of the application.
+
+    Args:
+        app: The FastAPI application.
+
+    Returns:
+        Optional[EventLoopMonitor]: The monitor, or None if disabled in settings.
+    """
+    if not settings.LOOP_MONITOR_ENABLED:
+        return None
+    monitor = EventLoopMonitor(
+        interval=settings.LOOP_MONITOR_INTERVAL,
+        block_threshold=settings.LOOP_BLOCK_THRESHOLD,
+        capture_stacks=settings.LOOP_BLOCK_CAPTURE_STACKS or settings.DEBUG,
+    )
+    app.add_event_handler("startup", monitor.start)
+    app.add_event_handler("shutdown", monitor.stop)
+    return monitor
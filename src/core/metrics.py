@@ -0,0 +1,128 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Route label for metrics recorded below the presentation layer.
+current_route: ContextVar[str] = ContextVar("current_route", default="none")
+
+# Latency buckets from 100us (in-process stages) to 60s (slow provider calls).
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGE_LATENCY = Histogram(
+    "llm_stage_duration_seconds",
+    "Time spent in each stage of request processing",
+    ["stage", "route", "model", "provider"],
+    buckets=STAGE_BUCKETS,
+)
+
+REQUESTS_IN_FLIGHT = Gauge(
+    "llm_requests_in_flight",
+    "Number of requests currently being processed",
+    ["route"],
+)
+
+PROVIDER_TOKENS = Counter(
+    "llm_provider_tokens_total",
+    "Tokens processed by LLM providers",
+    ["route", "model", "provider", "kind"],
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "llm_event_loop_lag_seconds",
+    "Delay between a scheduled event loop wake-up and when it ran",
+    buckets=STAGE_BUCKETS,
+)
+
+EVENT_LOOP_BLOCKED = Counter(
+    "llm_event_loop_blocked_total",
+    "Number of times the event loop was blocked longer than the configured threshold",
+)
+
+JOBS_PROCESSED = Counter(
+    "llm_jobs_processed_total",
+    "Asynchronous jobs finished by workers",
+    ["request_type", "status"],
+)
+
+JOBS_RUNNING = Gauge(
+    "llm_jobs_running",
+    "Number of asynchronous jobs currently being processed by this worker",
+)
+
+JOB_QUEUE_WAIT = Histogram(
+    "llm_job_queue_wait_seconds",
+    "Time between the submission of a job and the start of its first attempt",
+    buckets=STAGE_BUCKETS + (120.0, 300.0, 600.0, 1800.0),
+)
+
+@contextmanager
+def track_in_flight(route: str) -> Iterator[None]:
+    """
+    Count a request as in flight and label metrics recorded during it with its route.
+
+    Args:
+        route (str): The route being served, e.g. "/generate".
+    """
+    gauge = REQUESTS_IN_FLIGHT.labels(route)
+    token = current_route.set(route)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+        current_route.reset(token)
+
+@contextmanager
+def track_stage(stage: str, model: str = "none", provider: str = "none") -> Iterator[None]:
+    """
+    Record the duration of a processing stage in the stage latency histogram.
+
+    Args:
+        stage (str): The stage name, e.g. "prompt_lookup" or "provider_call".
+        model (str): The model the stage ran for.
+        provider (str): The provider the stage ran for.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started, model, provider)
+
+def observe_stage(stage: str, seconds: float, model: str = "none", provider: str = "none") -> None:
+    """
+    Record a stage duration measured by the caller.
+
+    Args:
+        stage (str): The stage name.
+        seconds (float): The measured duration in seconds.
+        model (str): The model the stage ran for.
+        provider (str): The provider the stage ran for.
+    """
+    STAGE_LATENCY.labels(stage, current_route.get(), model, provider).observe(seconds)
+
+def record_tokens(model: str, provider: str, prompt_tokens: int, completion_tokens: int) -> None:
+    """
+    Add the token usage of a provider call to the throughput counters.
+
+    Args:
+        model (str): The model that was called.
+        provider (str): The provider that served the call.
+        prompt_tokens (int): The number of prompt tokens.
+        completion_tokens (int): The number of completion tokens.
+    """
+    route = current_route.get()
+    PROVIDER_TOKENS.labels(route, model, provider, "prompt").inc(prompt_tokens)
+    PROVIDER_TOKENS.labels(route, model, provider, "completion").inc(completion_tokens)
+
+def render_metrics() -> bytes:
+    """
+    Render all registered metrics in the Prometheus text exposition format.
+
+    Returns:
+        bytes: The exposition payload, served with CONTENT_TYPE_LATEST.
+    """
+    return generate_latest()
@@ -0,0 +1,224 @@
+import asyncio
+import hmac
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from types import FrameType
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
+
+from .config import settings
+
+T = TypeVar("T")
+
+# Set for a request that asked to be profiled through the X-Profile-Token header.
+profile_requested: ContextVar[bool] = ContextVar("profile_requested", default=False)
+# ID of the profile recorded for the current request, if any.
+current_profile_id: ContextVar[Optional[str]] = ContextVar("current_profile_id", default=None)
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+
+def _thread_stack(frame: Optional[FrameType]) -> List[str]:
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+def _await_stack(coro: Any) -> List[str]:
+    # Follow the chain of awaited coroutines down to the innermost suspension point.
+    stack = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        stack.append(_frame_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return stack
+
+class TaskSampler:
+    """
+    Samples the stack of one asyncio task from a background thread.
+
+    While the task is running, the event loop thread's stack is recorded;
+    while it is suspended, its chain of awaited coroutines is recorded under
+    an "[awaiting]" frame. The profile therefore covers wall-clock time,
+    including time spent waiting on providers and the cache, without
+    attributing other requests' work on the shared loop to this one.
+
+    Attributes:
+        task (asyncio.Task): The task being profiled.
+        interval (float): Seconds between samples.
+        samples (Counter): Sample counts keyed by semicolon-joined stack.
+    """
+
+    def __init__(self, task: asyncio.Task, interval: float):
+        self.task = task
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._loop = task.get_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            if asyncio.current_task(self._loop) is self.task:
+                stack = _thread_stack(sys._current_frames().get(self._loop_thread_id))
+            else:
+                stack = ["[awaiting]"] + _await_stack(self.task.get_coro())
+            if stack:
+                self.samples[";".join(stack)] += 1
+
+    def folded(self) -> str:
+        """
+        Render the samples in the folded stack format.
+
+        Returns:
+            str: One "frame;frame;frame count" line per distinct stack, as read
+                by flamegraph.pl, inferno and speedscope.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+class RequestProfiler:
+    """
+    On-demand sampling profiler for requests served by the LLMOrchestrator.
+
+    Profiling is disabled unless PROFILING_TOKEN is configured, in which case
+    the only cost on the request path is one attribute check. Holders of the
+    token can either profile a single request by sending it with an
+    X-Profile-Token header, or arm the profiler for the next N requests
+    through the admin endpoint. Recorded profiles are kept in memory, newest
+    first, up to PROFILING_MAX_PROFILES.
+
+    Attributes:
+        enabled (bool): Whether profiling can be requested at all.
+        interval (float): Seconds between stack samples.
+        max_profiles (int): Number of recorded profiles to keep.
+
+    Methods:
+        authorize: Check a profiling token.
+        arm: Profile the next N requests.
+        should_profile: Decide whether the current request is profiled.
+        profile: Await a coroutine under the sampling profiler.
+        get_profile: Return a recorded profile.
+        list_profiles: List recorded profiles.
+    """
+
+    def __init__(self, token: Optional[str], interval: float = 0.005, max_profiles: int = 50):
+        self.enabled = bool(token)
+        self.interval = interval
+        self.max_profiles = max_profiles
+        self._token = token or ""
+        self._remaining = 0
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def authorize(self, token: Optional[str]) -> bool:
+        """
+        Check a profiling token in constant time.
+
+        Args:
+            token (Optional[str]): The token supplied by the caller.
+
+        Returns:
+            bool: True if profiling is enabled and the token matches.
+        """
+        return self.enabled and token is not None and hmac.compare_digest(token, self._token)
+
+    def arm(self, count: int) -> None:
+        """
+        Profile the next `count` requests.
+
+        Args:
+            count (int): The number of requests to profile. 0 disarms the profiler.
+        """
+        self._remaining = max(0, count)
+
+    def should_profile(self) -> bool:
+        """
+        Decide whether the current request is profiled, consuming an armed slot if so.
+
+        Returns:
+            bool: True if the request opted in or the profiler is armed.
+        """
+        if profile_requested.get():
+            return True
+        if self._remaining > 0:
+            self._remaining -= 1
+            return True
+        return False
+
+    async def profile(self, awaitable: Awaitable[T], label: str) -> T:
+        """
+        Await a coroutine while sampling the current task, and store the profile.
+
+        The profile ID is published through `current_profile_id` so the
+        presentation layer can return it to the caller.
+
+        Args:
+            awaitable (Awaitable[T]): The work to profile.
+            label (str): A description stored with the profile, e.g. the request type.
+
+        Returns:
+            T: The result of the awaitable.
+        """
+        sampler = TaskSampler(asyncio.current_task(), self.interval)
+        profile_id = uuid.uuid4().hex
+        current_profile_id.set(profile_id)
+        started = time.time()
+        sampler.start()
+        try:
+            return await awaitable
+        finally:
+            sampler.stop()
+            self._profiles[profile_id] = {
+                "id": profile_id,
+                "label": label,
+                "started": started,
+                "duration": time.time() - started,
+                "samples": sum(sampler.samples.values()),
+                "folded": sampler.folded(),
+            }
+            self._profiles.move_to_end(profile_id, last=False)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem()
+
+    def get_profile(self, profile_id: str) -> Optional[str]:
+        """
+        Return a recorded profile in the folded stack format.
+
+        Args:
+            profile_id (str): The ID of the profile.
+
+        Returns:
+            Optional[str]: The folded stacks, or None if the profile is unknown.
+        """
+        profile = self._profiles.get(profile_id)
+        return None if profile is None else profile["folded"]
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """
+        List recorded profiles, newest first.
+
+        Returns:
+            List[Dict[str, Any]]: The ID, label, start time, duration and sample count of each profile.
+        """
+        return [{k: v for k, v in p.items() if k != "folded"} for p in self._profiles.values()]
+
+profiler = RequestProfiler(
+    settings.PROFILING_TOKEN,
+    interval=settings.PROFILING_INTERVAL,
+    max_profiles=settings.PROFILING_MAX_PROFILES,
+)
@@ -7,6 +7,8 @@ It includes the fundamental data structures that represent LLM requests and resp
 Components:
 - LLMRequest: Represents a request to a Language Model (LLM)
 - LLMResponse: Represents a response from a Language Model (LLM)
+- CompletionRequest, CompletionResult: Compact slotted counterparts used inside the service
+- Job, JobStatus: An LLM request processed asynchronously by a worker, and its state
 
 Usage:
     from domain import LLMRequest, LLMResponse
@@ -20,12 +22,19 @@ Usage:
         choices=[{"text": "Bonjour", "index": 0}],
         usage={"total_tokens": 2}
     )
+
+    # Convert to the compact internal form and back
+    compact = CompletionRequest.from_model(request)
+    request = compact.to_model()
 """
 
 from .llm_request import LLMRequest
 from .llm_response import LLMResponse
+from .completion import CompletionChoice, CompletionRequest, CompletionResult
+from .job import Job, JobStatus
 
-__all__ = ["LLMRequest", "LLMResponse"]
+__all__ = ["LLMRequest", "LLMResponse", "CompletionChoice", "CompletionRequest", "CompletionResult", "Job",
+           "JobStatus"]
 
 # Version of the domain module
 __version__ = "0.1.0"
\ No newline at end of file
@@ -0,0 +1,208 @@
+from typing import Any, Dict, List, Optional
+
+from .llm_request import LLMRequest
+from .llm_response import LLMResponse
+
+class CompletionRequest:
+    """
+    Compact internal representation of an LLMRequest.
+
+    A slotted class without validation, for requests the service builds or
+    has already validated. Instances take a fraction of the memory of the
+    pydantic model, which matters for in-flight queues and batches. Use
+    from_model and to_model to convert at the API boundary.
+
+    Attributes:
+        See LLMRequest; the fields and defaults are the same.
+
+    Example:
+        >>> request = CompletionRequest("Translate 'Hello' to French", "gpt-3.5-turbo", max_tokens=50)
+        >>> request.to_model().max_tokens
+        50
+    """
+
+    __slots__ = ("prompt", "model", "max_tokens", "temperature", "top_p", "n", "stream", "stop",
+                 "presence_penalty", "frequency_penalty", "user", "extra_params")
+
+    def __init__(self, prompt: str, model: str, max_tokens: int = 100, temperature: float = 0.7,
+                 top_p: float = 1.0, n: int = 1, stream: bool = False, stop: Optional[str] = None,
+                 presence_penalty: float = 0.0, frequency_penalty: float = 0.0, user: Optional[str] = None,
+                 extra_params: Optional[Dict[str, Any]] = None):
+        self.prompt = prompt
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.top_p = top_p
+        self.n = n
+        self.stream = stream
+        self.stop = stop
+        self.presence_penalty = presence_penalty
+        self.frequency_penalty = frequency_penalty
+        self.user = user
+        self.extra_params = {} if extra_params is None else extra_params
+
+    @classmethod
+    def from_model(cls, request: LLMRequest) -> "CompletionRequest":
+        """
+        Convert a validated LLMRequest.
+
+        Args:
+            request (LLMRequest): The request to convert.
+
+        Returns:
+            CompletionRequest: The compact request.
+        """
+        return cls(**request.__dict__)
+
+    def to_model(self) -> LLMRequest:
+        """
+        Convert to an LLMRequest without re-validating.
+
+        Returns:
+            LLMRequest: The pydantic request.
+        """
+        return LLMRequest.construct(**self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the fields as a dict, in the same order and shape as LLMRequest.dict().
+
+        Returns:
+            Dict[str, Any]: The request fields.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CompletionRequest):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"CompletionRequest(model={self.model!r}, max_tokens={self.max_tokens!r}, prompt={self.prompt[:40]!r})"
+
+class CompletionChoice:
+    """
+    Compact internal representation of an LLMChoice.
+
+    Attributes:
+        text (str): The generated text.
+        index (int): The index of this completion choice.
+        logprobs (Optional[Dict[str, Any]]): Log probabilities of the tokens in the completion.
+        finish_reason (Optional[str]): The reason why the completion finished.
+    """
+
+    __slots__ = ("text", "index", "logprobs", "finish_reason")
+
+    def __init__(self, text: str, index: int, logprobs: Optional[Dict[str, Any]] = None,
+                 finish_reason: Optional[str] = None):
+        self.text = text
+        self.index = index
+        self.logprobs = logprobs
+        self.finish_reason = finish_reason
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"text": self.text, "index": self.index, "logprobs": self.logprobs, "finish_reason": self.finish_reason}
+
+class CompletionResult:
+    """
+    Compact internal representation of an LLMResponse.
+
+    Used by the orchestrator between the provider call, the response cache
+    and the API boundary. to_dict produces the dict stored in the cache, in
+    the same shape as LLMResponse.dict(). That dict is converted to the API
+    schema by LLMResponse.from_trusted, the one place responses are built
+    without validation; to_model is a shortcut for it.
+
+    Attributes:
+        id (str): A unique identifier for the response.
+        object (str): The object type, typically "text_completion".
+        created (int): The Unix timestamp of when the response was created.
+        model (str): The name of the model used to generate the response.
+        choices (List[CompletionChoice]): The completion choices.
+        prompt_tokens (int): The number of tokens in the prompt.
+        completion_tokens (int): The number of tokens in the completions.
+
+    Example:
+        >>> result = CompletionResult("response-1", "text_completion", 1589478378, "gpt-3.5-turbo",
+        ...                           [CompletionChoice("Bonjour", 0, finish_reason="length")], 5, 1)
+        >>> result.to_model().usage.total_tokens
+        6
+    """
+
+    __slots__ = ("id", "object", "created", "model", "choices", "prompt_tokens", "completion_tokens")
+
+    def __init__(self, id: str, object: str, created: int, model: str, choices: List[CompletionChoice],
+                 prompt_tokens: int, completion_tokens: int):
+        self.id = id
+        self.object = object
+        self.created = created
+        self.model = model
+        self.choices = choices
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompletionResult":
+        """
+        Build a result from a dict in the shape produced by to_dict or LLMResponse.dict().
+
+        Args:
+            data (Dict[str, Any]): The trusted response data, e.g. read from the cache.
+
+        Returns:
+            CompletionResult: The compact result.
+        """
+        usage = data["usage"]
+        return cls(
+            data["id"], data["object"], data["created"], data["model"],
+            [CompletionChoice(c["text"], c["index"], c.get("logprobs"), c.get("finish_reason"))
+             for c in data["choices"]],
+            usage["prompt_tokens"], usage["completion_tokens"],
+        )
+
+    @classmethod
+    def from_model(cls, response: LLMResponse) -> "CompletionResult":
+        """
+        Convert an LLMResponse.
+
+        Args:
+            response (LLMResponse): The response to convert.
+
+        Returns:
+            CompletionResult: The compact result.
+        """
+        return cls(
+            response.id, response.object, response.created, response.model,
+            [CompletionChoice(c.text, c.index, c.logprobs, c.finish_reason) for c in response.choices],
+            response.usage.prompt_tokens, response.usage.completion_tokens,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the result as a dict in the same shape as LLMResponse.dict().
+
+        Returns:
+            Dict[str, Any]: The response data.
+        """
+        return {
+            "id": self.id,
+            "object": self.object,
+            "created": self.created,
+            "model": self.model,
+            "choices": [choice.to_dict() for choice in self.choices],
+            "usage": {"prompt_tokens": self.prompt_tokens, "completion_tokens": self.completion_tokens,
+                      "total_tokens": self.total_tokens},
+        }
+
+    def to_model(self) -> LLMResponse:
+        """
+        Convert to an LLMResponse without re-validating, through LLMResponse.from_trusted.
+
+        Returns:
+            LLMResponse: The pydantic response.
+        """
+        return LLMResponse.from_trusted(self.to_dict())
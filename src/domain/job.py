@@ -0,0 +1,58 @@
+import time
+import uuid
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+class JobStatus(str, Enum):
+    """
+    Lifecycle states of an asynchronous job.
+
+    A job is QUEUED when submitted, RUNNING once a worker claims it, and ends
+    as SUCCEEDED or FAILED.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    @property
+    def finished(self) -> bool:
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+class Job(BaseModel):
+    """
+    Represents an LLM request processed asynchronously by a worker.
+
+    Attributes:
+        id (str): A unique identifier for the job.
+        request_type (str): The orchestrator request type, e.g. "generate" or "summarize".
+        input_text (str): The input text to be processed.
+        params (Dict[str, Any]): Additional parameters passed to the orchestrator.
+        status (JobStatus): The current state of the job.
+        attempts (int): The number of times a worker has started the job.
+        created_at (float): Unix timestamp of when the job was submitted.
+        started_at (Optional[float]): Unix timestamp of when the latest attempt started.
+        finished_at (Optional[float]): Unix timestamp of when the job finished.
+        result (Optional[Dict[str, Any]]): The LLMResponse of a succeeded job, as a dict.
+        error (Optional[str]): The error message of a failed job.
+
+    Example:
+        >>> job = Job(request_type="generate", input_text="Once upon a time", params={"max_tokens": 50})
+        >>> job.status
+        <JobStatus.QUEUED: 'queued'>
+    """
+
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    request_type: str
+    input_text: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    created_at: float = Field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
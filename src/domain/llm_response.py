@@ -67,4 +67,29 @@ class LLMResponse(BaseModel):
 
     class Config:
         """Pydantic config"""
-        allow_population_by_field_name = True
\ No newline at end of file
+        allow_population_by_field_name = True
+
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]) -> "LLMResponse":
+        """
+        Build a response from data the service produced itself, skipping validation.
+
+        Validation is for untrusted input. Responses assembled by the
+        orchestrator, or read back from the cache after it stored them, are
+        already well-formed, and re-validating them on every request is a
+        significant share of the CPU spent serving cached responses.
+
+        Args:
+            data (Dict[str, Any]): A dict in the shape produced by LLMResponse.dict().
+
+        Returns:
+            LLMResponse: The response, with nested choices and usage as models.
+        """
+        return cls.construct(
+            id=data["id"],
+            object=data["object"],
+            created=data["created"],
+            model=data["model"],
+            choices=[LLMChoice.construct(**choice) for choice in data["choices"]],
+            usage=LLMUsage.construct(**data["usage"]),
+        )
\ No newline at end of file
@@ -0,0 +1,189 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Mapping, Optional, Union
+
+class BaseCache(ABC):
+    """
+    Abstract base class for all cache backends.
+
+    This class defines the interface shared by the Redis-backed cache and
+    the in-process cache, so services can depend on the interface and the
+    backend can be selected through configuration.
+
+    Methods:
+        set: Store a value in the cache.
+        get: Retrieve a value from the cache.
+        delete: Remove a value from the cache.
+        set_many: Store several values in the cache.
+        get_many: Retrieve several values from the cache.
+        delete_many: Remove several values from the cache.
+        acquire_lock: Try to acquire a short-lived lock.
+        release_lock: Release a lock acquired with acquire_lock.
+        generation: Return the current generation of a namespace.
+        namespaced_key: Resolve a key within the current generation of a namespace.
+        flush: Invalidate all items in a namespace.
+        sweep_namespace: Delete entries from outdated namespace generations.
+        close: Release the resources held by the cache.
+    """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, expire: int = None, codec: Optional[str] = None) -> None:
+        """
+        Store a value in the cache.
+
+        Args:
+            key (str): The key under which to store the value.
+            value (Any): The value to store.
+            expire (int, optional): Time in seconds after which the key will expire.
+                                    If None, the key will not expire.
+            codec (Optional[str]): The codec to use instead of the configured one.
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Retrieve a value from the cache.
+
+        Args:
+            key (str): The key of the value to retrieve.
+
+        Returns:
+            Optional[Any]: The retrieved value, or None if the key doesn't exist.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Remove a value from the cache.
+
+        Args:
+            key (str): The key of the value to remove.
+        """
+        pass
+
+    @abstractmethod
+    async def set_many(self, items: Mapping[str, Any],
+                       expire: Union[int, Mapping[str, Optional[int]], None] = None,
+                       codec: Optional[str] = None) -> None:
+        """
+        Store several values in the cache.
+
+        Args:
+            items (Mapping[str, Any]): The values to store, keyed by cache key.
+            expire (Union[int, Mapping[str, Optional[int]], None]): A single expiry in seconds,
+                or a mapping of per-key expiries.
+            codec (Optional[str]): The codec to use instead of the configured one.
+        """
+        pass
+
+    @abstractmethod
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        """
+        Retrieve several values from the cache.
+
+        Args:
+            keys (Iterable[str]): The keys of the values to retrieve.
+
+        Returns:
+            Dict[str, Optional[Any]]: The values keyed by cache key, with None for missing keys.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Remove several values from the cache.
+
+        Args:
+            keys (Iterable[str]): The keys of the values to remove.
+
+        Returns:
+            int: The number of keys that were removed.
+        """
+        pass
+
+    @abstractmethod
+    async def acquire_lock(self, name: str, expire: int = 30) -> Optional[str]:
+        """
+        Try to acquire a short-lived lock.
+
+        Args:
+            name (str): The key of the lock.
+            expire (int): Time in seconds after which the lock is released automatically.
+
+        Returns:
+            Optional[str]: A token identifying the holder, or None if the lock is already held.
+        """
+        pass
+
+    @abstractmethod
+    async def release_lock(self, name: str, token: str) -> None:
+        """
+        Release a lock acquired with acquire_lock.
+
+        Args:
+            name (str): The key of the lock.
+            token (str): The token returned by acquire_lock.
+        """
+        pass
+
+    @abstractmethod
+    async def generation(self, namespace: str) -> int:
+        """
+        Return the current generation of a namespace.
+
+        The generation starts at 0 and is incremented by every `flush`.
+
+        Args:
+            namespace (str): The namespace, e.g. a prompt name or a model name.
+
+        Returns:
+            int: The current generation.
+        """
+        pass
+
+    @abstractmethod
+    async def namespaced_key(self, namespace: str, key: str) -> str:
+        """
+        Resolve a key within the current generation of a namespace.
+
+        Args:
+            namespace (str): The namespace, e.g. a prompt name or a model name.
+            key (str): The key within the namespace.
+
+        Returns:
+            str: The backend key for the current generation of the namespace.
+        """
+        pass
+
+    @abstractmethod
+    async def flush(self, namespace: str) -> None:
+        """
+        Invalidate all items in a namespace.
+
+        Args:
+            namespace (str): The namespace to invalidate.
+        """
+        pass
+
+    @abstractmethod
+    async def sweep_namespace(self, namespace: str) -> int:
+        """
+        Delete entries from outdated generations of a namespace.
+
+        Args:
+            namespace (str): The namespace to sweep.
+
+        Returns:
+            int: The number of keys that were removed.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Release the resources held by the cache.
+
+        The default implementation does nothing.
+        """
+        pass
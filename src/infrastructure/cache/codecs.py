@@ -0,0 +1,319 @@
+import json
+import sys
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+# First byte of every tagged value. JSON text never starts with a NUL byte,
+# so untagged values written before codecs were introduced remain readable.
+MAGIC = 0x00
+HEADER_SIZE = 3
+
+class Codec(ABC):
+    """
+    Abstract base class for cache value codecs.
+
+    Attributes:
+        name (str): The name used to select the codec in configuration.
+        tag (int): The byte stored in the value header to identify the codec.
+    """
+
+    name: str
+    tag: int
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        """Encode a value to bytes."""
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Decode bytes produced by `encode` back to a value."""
+        pass
+
+class JSONCodec(Codec):
+    """
+    JSON codec using orjson when installed and the stdlib json module otherwise.
+    """
+
+    name = "json"
+    tag = 1
+
+    def encode(self, value: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+class MsgpackCodec(Codec):
+    """
+    Binary MessagePack codec. Requires the optional `msgpack` package.
+    """
+
+    name = "msgpack"
+    tag = 2
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("The 'msgpack' package is required for the msgpack cache codec")
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+class Float32Codec(Codec):
+    """
+    Codec storing a sequence of floats as a raw little-endian float32 buffer.
+
+    Intended for embedding vectors: 4 bytes per component instead of roughly
+    20 bytes of JSON text. Values are decoded to a list of floats with float32
+    precision.
+    """
+
+    name = "float32"
+    tag = 3
+
+    def encode(self, value: Any) -> bytes:
+        buffer = array("f", value)
+        if sys.byteorder == "big":
+            buffer.byteswap()
+        return buffer.tobytes()
+
+    def decode(self, data: bytes) -> Any:
+        buffer = array("f")
+        buffer.frombytes(data)
+        if sys.byteorder == "big":
+            buffer.byteswap()
+        return buffer.tolist()
+
+class Int8Codec(Codec):
+    """
+    Codec storing a sequence of floats as int8 multiples of a float32 scale.
+
+    Intended for embedding vectors where a small loss of precision is
+    acceptable: 4 bytes for the scale plus one byte per component, a quarter
+    of the float32 size. The scale is the largest absolute component divided
+    by 127, so each component is decoded within half a scale step.
+    """
+
+    name = "int8"
+    tag = 4
+
+    def encode(self, value: Any) -> bytes:
+        components = array("f", value)
+        largest = max((abs(component) for component in components), default=0.0)
+        scale = array("f", [largest / 127 if largest else 1.0])
+        codes = array("b", [round(component / scale[0]) for component in components])
+        if sys.byteorder == "big":
+            scale.byteswap()
+        return scale.tobytes() + codes.tobytes()
+
+    def decode(self, data: bytes) -> Any:
+        scale = array("f")
+        scale.frombytes(data[:4])
+        if sys.byteorder == "big":
+            scale.byteswap()
+        codes = array("b")
+        codes.frombytes(data[4:])
+        return [code * scale[0] for code in codes]
+
+class Compressor(ABC):
+    """
+    Abstract base class for cache value compressors.
+
+    Attributes:
+        name (str): The name used to select the compressor in configuration.
+        tag (int): The byte stored in the value header to identify the compressor.
+    """
+
+    name: str
+    tag: int
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress bytes."""
+        pass
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress bytes produced by `compress`."""
+        pass
+
+class NoCompression(Compressor):
+    """Pass-through compressor used for values below the compression threshold."""
+
+    name = "none"
+    tag = 0
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+class ZlibCompressor(Compressor):
+    """zlib compressor from the standard library."""
+
+    name = "zlib"
+    tag = 1
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+class LZ4Compressor(Compressor):
+    """LZ4 frame compressor. Requires the optional `lz4` package."""
+
+    name = "lz4"
+    tag = 2
+
+    def __init__(self):
+        if lz4_frame is None:
+            raise ImportError("The 'lz4' package is required for lz4 cache compression")
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4_frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4_frame.decompress(data)
+
+CODECS = {codec.name: codec for codec in (JSONCodec, MsgpackCodec, Float32Codec, Int8Codec)}
+COMPRESSORS = {compressor.name: compressor for compressor in (NoCompression, ZlibCompressor, LZ4Compressor)}
+
+class ValueSerializer:
+    """
+    Serializes cache values with a pluggable codec and optional compression.
+
+    Every stored value starts with a three-byte header holding a magic byte,
+    the codec tag and the compression tag, so values written with one codec
+    remain readable after the default codec is changed. Values without the
+    header are decoded as legacy JSON.
+
+    Attributes:
+        codec (Codec): The default codec used for encoding.
+        compressor (Compressor): The compressor applied to values above the threshold.
+        compress_threshold (int): The minimum encoded size in bytes for compression to apply.
+
+    Methods:
+        dumps: Encode a value to tagged bytes.
+        loads: Decode tagged bytes back to a value.
+
+    Example:
+        >>> serializer = ValueSerializer(codec="json", compression="zlib", compress_threshold=1024)
+        >>> serializer.loads(serializer.dumps({"text": "Bonjour"}))
+        {'text': 'Bonjour'}
+    """
+
+    def __init__(self, codec: str = "json", compression: str = "none", compress_threshold: int = 1024):
+        if compression not in COMPRESSORS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+        self._codecs_by_tag: Dict[int, Codec] = {}
+        self._compressors_by_tag: Dict[int, Compressor] = {NoCompression.tag: NoCompression()}
+        self.codec = self._codec_for_name(codec)
+        self.compressor = self._compressor_for_tag(COMPRESSORS[compression].tag)
+        self.compress_threshold = compress_threshold
+
+    def _codec_for_name(self, name: str) -> Codec:
+        if name not in CODECS:
+            raise ValueError(f"Unknown cache codec: {name}")
+        return self._codec_for_tag(CODECS[name].tag)
+
+    def _codec_for_tag(self, tag: int) -> Codec:
+        codec = self._codecs_by_tag.get(tag)
+        if codec is None:
+            for codec_class in CODECS.values():
+                if codec_class.tag == tag:
+                    codec = self._codecs_by_tag[tag] = codec_class()
+                    break
+            else:
+                raise ValueError(f"Unknown codec tag in stored value: {tag}")
+        return codec
+
+    def _compressor_for_tag(self, tag: int) -> Compressor:
+        compressor = self._compressors_by_tag.get(tag)
+        if compressor is None:
+            for compressor_class in COMPRESSORS.values():
+                if compressor_class.tag == tag:
+                    compressor = self._compressors_by_tag[tag] = compressor_class()
+                    break
+            else:
+                raise ValueError(f"Unknown compression tag in stored value: {tag}")
+        return compressor
+
+    def dumps(self, value: Any, codec: Optional[str] = None) -> bytes:
+        """
+        Encode a value to tagged bytes.
+
+        Args:
+            value (Any): The value to encode.
+            codec (Optional[str]): The name of the codec to use instead of the default,
+                e.g. "float32" or "int8" for embedding vectors.
+
+        Returns:
+            bytes: The header followed by the encoded, possibly compressed, payload.
+
+        Raises:
+            ValueError: If the value cannot be encoded with the codec.
+        """
+        selected = self.codec if codec is None else self._codec_for_name(codec)
+        try:
+            payload = selected.encode(value)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise ValueError(f"Unable to encode the value with the {selected.name} codec: {e}")
+
+        if len(payload) >= self.compress_threshold:
+            compressor = self.compressor
+        else:
+            compressor = self._compressors_by_tag[NoCompression.tag]
+        return bytes((MAGIC, selected.tag, compressor.tag)) + compressor.compress(payload)
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Decode tagged bytes back to a value.
+
+        Args:
+            data (bytes): Bytes produced by `dumps`, or a legacy untagged JSON value.
+
+        Returns:
+            Any: The decoded value.
+
+        Raises:
+            ValueError: If the stored value cannot be decoded.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        try:
+            if not data or data[0] != MAGIC:
+                return json.loads(data)
+            codec = self._codec_for_tag(data[1])
+            compressor = self._compressor_for_tag(data[2])
+            return codec.decode(compressor.decompress(data[HEADER_SIZE:]))
+        except (TypeError, ValueError, IndexError, zlib.error) as e:
+            raise ValueError(f"Unable to decode the stored value: {e}")
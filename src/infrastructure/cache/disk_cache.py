@@ -0,0 +1,277 @@
+import asyncio
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, TypeVar, Union
+
+from .base import BaseCache
+from .codecs import ValueSerializer
+
+T = TypeVar("T")
+
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS locks (
+    name TEXT PRIMARY KEY,
+    token TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS generations (
+    namespace TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, size) SELECT 0, COALESCE(SUM(size), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET size = size + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET size = size - OLD.size + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET size = size - OLD.size WHERE id = 0;
+END;
+COMMIT;
+"""
+
+class SQLiteCache(BaseCache):
+    """
+    A size-capped cache stored in a local SQLite database.
+
+    Intended as the cold tier below Redis: disk is far cheaper than Redis
+    memory, and a warm pod can keep many more cached completions locally.
+    The database runs in WAL mode so several worker processes on one pod
+    can share it. Once the stored size exceeds `max_bytes`, the least
+    recently accessed entries are evicted down to 90% of the cap. The
+    stored size is kept up to date by triggers in a one-row table, so the
+    check after each write does not scan the entries, and stays correct
+    when several processes write.
+
+    All SQLite calls run on a dedicated single-threaded executor so they
+    never block the event loop.
+
+    Attributes:
+        path (str): The path of the SQLite database file.
+        max_bytes (int): The maximum total size of stored values in bytes.
+        serializer (ValueSerializer): Encodes and decodes stored values.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 1024 * 1024 * 1024,
+                 serializer: Optional[ValueSerializer] = None):
+        """
+        Initialize the SQLiteCache.
+
+        Args:
+            path (str): The path of the SQLite database file. Created if missing.
+            max_bytes (int): The maximum total size of stored values in bytes. Defaults to 1 GiB.
+            serializer (Optional[ValueSerializer]): The serializer for stored values.
+                Defaults to uncompressed JSON.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.serializer = serializer or ValueSerializer()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-cache")
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _get_sync(self, keys: List[str]) -> Dict[str, Tuple[bytes, Optional[float]]]:
+        now = time.time()
+        found: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        for key in keys:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                continue
+            if row[1] is not None and row[1] <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                continue
+            found[key] = (row[0], row[1])
+        if found:
+            self._conn.executemany(
+                "UPDATE entries SET last_access = ? WHERE key = ?", [(now, key) for key in found]
+            )
+        return found
+
+    def _set_sync(self, rows: List[tuple]) -> None:
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                "INSERT INTO entries (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "expires_at = excluded.expires_at, last_access = excluded.last_access",
+                rows,
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._evict_sync()
+
+    def _total_size_sync(self) -> int:
+        return self._conn.execute("SELECT size FROM totals WHERE id = 0").fetchone()[0]
+
+    def _evict_sync(self) -> None:
+        if self._total_size_sync() <= self.max_bytes:
+            return
+        self._conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        target = int(self.max_bytes * 0.9)
+        excess = self._total_size_sync() - target
+        if excess <= 0:
+            return
+        # Walk entries from least to most recently accessed until enough bytes are covered.
+        cutoff = None
+        freed = 0
+        for last_access, size in self._conn.execute("SELECT last_access, size FROM entries ORDER BY last_access"):
+            freed += size
+            cutoff = last_access
+            if freed >= excess:
+                break
+        if cutoff is not None:
+            self._conn.execute("DELETE FROM entries WHERE last_access <= ?", (cutoff,))
+
+    def _delete_sync(self, keys: List[str]) -> int:
+        cursor = self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+        return cursor.rowcount
+
+    def _rows(self, items: Mapping[str, Any], expire: Union[int, Mapping[str, Optional[int]], None],
+              codec: Optional[str]) -> List[tuple]:
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            data = self.serializer.dumps(value, codec=codec)
+            ttl = expire.get(key) if isinstance(expire, Mapping) else expire
+            rows.append((key, data, len(data), None if ttl is None else now + ttl, now))
+        return rows
+
+    async def set(self, key: str, value: Any, expire: int = None, codec: Optional[str] = None) -> None:
+        await self._run(self._set_sync, self._rows({key: value}, expire, codec))
+
+    async def get(self, key: str) -> Optional[Any]:
+        found = await self._run(self._get_sync, [key])
+        return None if key not in found else self.serializer.loads(found[key][0])
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._delete_sync, [key])
+
+    async def set_many(self, items: Mapping[str, Any],
+                       expire: Union[int, Mapping[str, Optional[int]], None] = None,
+                       codec: Optional[str] = None) -> None:
+        if items:
+            await self._run(self._set_sync, self._rows(items, expire, codec))
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        keys = list(dict.fromkeys(keys))
+        found = await self._run(self._get_sync, keys)
+        return {key: None if key not in found else self.serializer.loads(found[key][0]) for key in keys}
+
+    async def get_many_with_expiry(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, Optional[float]]]:
+        """
+        Retrieve several values with their expiry times.
+
+        Args:
+            keys (Iterable[str]): The keys of the values to retrieve.
+
+        Returns:
+            Dict[str, Tuple[Any, Optional[float]]]: The value and the UNIX expiry time, or None if it
+                does not expire, of each key found. Missing keys are left out.
+        """
+        found = await self._run(self._get_sync, list(dict.fromkeys(keys)))
+        return {key: (self.serializer.loads(data), expires_at) for key, (data, expires_at) in found.items()}
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return 0
+        return await self._run(self._delete_sync, keys)
+
+    def _acquire_lock_sync(self, name: str, token: str, expire: int) -> bool:
+        now = time.time()
+        self._conn.execute("DELETE FROM locks WHERE name = ? AND expires_at <= ?", (name, now))
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO locks (name, token, expires_at) VALUES (?, ?, ?)", (name, token, now + expire)
+        )
+        return cursor.rowcount == 1
+
+    async def acquire_lock(self, name: str, expire: int = 30) -> Optional[str]:
+        token = uuid.uuid4().hex
+        if await self._run(self._acquire_lock_sync, name, token, expire):
+            return token
+        return None
+
+    async def release_lock(self, name: str, token: str) -> None:
+        await self._run(self._conn.execute, "DELETE FROM locks WHERE name = ? AND token = ?", (name, token))
+
+    def _get_generation_sync(self, namespace: str) -> int:
+        row = self._conn.execute("SELECT generation FROM generations WHERE namespace = ?", (namespace,)).fetchone()
+        return 0 if row is None else row[0]
+
+    def _flush_sync(self, namespace: str) -> None:
+        self._conn.execute(
+            "INSERT INTO generations (namespace, generation) VALUES (?, 1) "
+            "ON CONFLICT (namespace) DO UPDATE SET generation = generation + 1",
+            (namespace,),
+        )
+
+    async def generation(self, namespace: str) -> int:
+        return await self._run(self._get_generation_sync, namespace)
+
+    async def namespaced_key(self, namespace: str, key: str) -> str:
+        return f"{namespace}:g{await self.generation(namespace)}:{key}"
+
+    async def flush(self, namespace: str) -> None:
+        await self._run(self._flush_sync, namespace)
+
+    def _sweep_sync(self, namespace: str, current: int) -> int:
+        prefix = f"{namespace}:g"
+        stale = []
+        for (key,) in self._conn.execute(
+            "SELECT key FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        ):
+            generation, _, _ = key[len(prefix):].partition(":")
+            if generation.isdigit() and int(generation) < current:
+                stale.append(key)
+        return self._delete_sync(stale) if stale else 0
+
+    async def sweep_namespace(self, namespace: str, generation: Optional[int] = None) -> int:
+        """
+        Delete entries from outdated generations of a namespace.
+
+        Args:
+            namespace (str): The namespace to sweep.
+            generation (Optional[int]): The current generation. Defaults to the
+                generation recorded in this database; a tiered cache passes the
+                generation of its primary tier.
+
+        Returns:
+            int: The number of keys that were removed.
+        """
+        if generation is None:
+            generation = await self.generation(namespace)
+        return await self._run(self._sweep_sync, namespace, generation)
+
+    async def close(self) -> None:
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=False)
@@ -6,7 +6,15 @@ It includes implementations for different caching strategies, with Redis
 being the primary caching solution.
 
 Components:
+- BaseCache: Abstract interface shared by all cache backends
 - RedisCache: A Redis-based caching implementation
+- InMemoryCache: A pure in-process backend with TTLs and size-aware LRU eviction
+- SQLiteCache: A size-capped local disk cache backed by SQLite
+- TieredCache: Memory, Redis and disk tiers with frequency-based promotion
+- NearCache: A RedisCache with an in-process LRU layer and pub/sub invalidation
+- LRUStore: A size-bounded in-process LRU store with per-entry expiry
+- StaleWhileRevalidate: Soft/hard expiry with XFetch early refresh and lock-guarded recomputation
+- ValueSerializer: Tagged, pluggable codecs (JSON, msgpack, float32, int8) with optional compression
 
 Usage:
     from infrastructure.cache import RedisCache
@@ -18,11 +26,23 @@ Usage:
     
     # Retrieving a cached value
     value = await redis_cache.get('key')
+
+    # Bulk operations use MGET and pipelines instead of one round trip per key
+    await redis_cache.set_many({'a': 1, 'b': 2}, expire={'a': 60, 'b': 3600})
+    values = await redis_cache.get_many(['a', 'b', 'c'])
 """
 
+from .base import BaseCache
 from .redis_cache import RedisCache
+from .memory_cache import InMemoryCache
+from .disk_cache import SQLiteCache
+from .tiered_cache import TieredCache
+from .near_cache import NearCache
+from .lru import LRUStore
+from .stampede import StaleWhileRevalidate
+from .codecs import ValueSerializer
 
-__all__ = ["RedisCache"]
+__all__ = ["BaseCache", "RedisCache", "InMemoryCache", "SQLiteCache", "TieredCache", "NearCache", "LRUStore", "StaleWhileRevalidate", "ValueSerializer"]
 
 # Version of the cache module
 __version__ = "0.1.0"
\ No newline at end of file
@@ -0,0 +1,117 @@
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+# Returned by LRUStore.get to distinguish a miss from a cached None.
+MISSING = object()
+
+class LRUStore:
+    """
+    An in-process, size-bounded LRU store with per-entry expiry.
+
+    Entries are evicted in least-recently-used order once either the entry
+    count or the accounted byte size exceeds its limit. The byte size of an
+    entry is supplied by the caller, typically the length of its encoded
+    form, so the limit tracks what the entry would cost in Redis.
+
+    Attributes:
+        max_entries (int): The maximum number of entries held.
+        max_bytes (int): The maximum accounted size of all entries in bytes.
+        current_bytes (int): The accounted size of the entries currently held.
+
+    Methods:
+        get: Return a live entry and mark it as recently used.
+        put: Insert or replace an entry, evicting old entries as needed.
+        pop: Remove an entry.
+        keys: Return a snapshot of the keys currently held.
+        clear: Remove all entries.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float], int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not MISSING
+
+    def get(self, key: str) -> Any:
+        """
+        Return a live entry and mark it as recently used.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            Any: The stored value, or MISSING if the key is absent or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.pop(key)
+            return MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def ttl(self, key: str) -> Optional[float]:
+        """
+        Return the remaining lifetime of an entry in seconds.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            Optional[float]: The remaining lifetime, or None if the entry has no expiry or is absent.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[1] is None:
+            return None
+        return max(entry[1] - time.monotonic(), 0.0)
+
+    def put(self, key: str, value: Any, size: int, ttl: Optional[float] = None) -> None:
+        """
+        Insert or replace an entry, evicting least-recently-used entries as needed.
+
+        Entries larger than `max_bytes` are not stored.
+
+        Args:
+            key (str): The key of the entry.
+            value (Any): The value to store.
+            size (int): The accounted size of the entry in bytes.
+            ttl (Optional[float]): Lifetime in seconds. If None, the entry does not expire.
+        """
+        self.pop(key)
+        if size > self.max_bytes or (ttl is not None and ttl <= 0):
+            return
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (value, expires_at, size)
+        self.current_bytes += size
+        while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+
+    def pop(self, key: str) -> None:
+        """
+        Remove an entry if present.
+
+        Args:
+            key (str): The key of the entry.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[2]
+
+    def keys(self) -> List[str]:
+        """Return a snapshot of the keys currently held, including expired ones not yet evicted."""
+        return list(self._entries)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self.current_bytes = 0
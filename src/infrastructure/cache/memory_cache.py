@@ -0,0 +1,116 @@
+import time
+import uuid
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+from .base import BaseCache
+from .codecs import ValueSerializer
+from .lru import MISSING, LRUStore
+
+class InMemoryCache(BaseCache):
+    """
+    A pure in-process cache implementing the BaseCache interface.
+
+    Intended for local development, tests, benchmarks and single-node
+    deployments that should not depend on a running Redis. Values are
+    stored encoded by the same ValueSerializer as RedisCache, so callers
+    get independent copies and memory accounting reflects the encoded
+    size. Entries are evicted in LRU order once the entry count or byte
+    budget is exceeded.
+
+    Locks and namespace generations are local to the process.
+
+    Attributes:
+        store (LRUStore): The bounded store holding encoded values.
+        serializer (ValueSerializer): Encodes and decodes stored values.
+
+    Example:
+        >>> cache = InMemoryCache(max_bytes=16 * 1024 * 1024)
+        >>> await cache.set("key", {"text": "Bonjour"}, expire=60)
+        >>> await cache.get("key")
+        {'text': 'Bonjour'}
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 serializer: Optional[ValueSerializer] = None):
+        """
+        Initialize the InMemoryCache.
+
+        Args:
+            max_entries (int): The maximum number of entries held.
+            max_bytes (int): The maximum encoded size of all entries in bytes.
+            serializer (Optional[ValueSerializer]): The serializer for stored values.
+                Defaults to uncompressed JSON.
+        """
+        self.store = LRUStore(max_entries=max_entries, max_bytes=max_bytes)
+        self.serializer = serializer or ValueSerializer()
+        self._locks: Dict[str, Tuple[str, float]] = {}
+        self._generations: Dict[str, int] = {}
+
+    async def set(self, key: str, value: Any, expire: int = None, codec: Optional[str] = None) -> None:
+        data = self.serializer.dumps(value, codec=codec)
+        self.store.put(key, data, len(data), expire)
+
+    async def get(self, key: str) -> Optional[Any]:
+        data = self.store.get(key)
+        if data is MISSING:
+            return None
+        return self.serializer.loads(data)
+
+    async def delete(self, key: str) -> None:
+        self.store.pop(key)
+
+    async def set_many(self, items: Mapping[str, Any],
+                       expire: Union[int, Mapping[str, Optional[int]], None] = None,
+                       codec: Optional[str] = None) -> None:
+        for key, value in items.items():
+            await self.set(key, value, expire.get(key) if isinstance(expire, Mapping) else expire, codec)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        return {key: await self.get(key) for key in dict.fromkeys(keys)}
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        deleted = 0
+        for key in dict.fromkeys(keys):
+            if key in self.store:
+                self.store.pop(key)
+                deleted += 1
+        return deleted
+
+    async def acquire_lock(self, name: str, expire: int = 30) -> Optional[str]:
+        holder = self._locks.get(name)
+        now = time.monotonic()
+        if holder is not None and holder[1] > now:
+            return None
+        token = uuid.uuid4().hex
+        self._locks[name] = (token, now + expire)
+        return token
+
+    async def release_lock(self, name: str, token: str) -> None:
+        holder = self._locks.get(name)
+        if holder is not None and holder[0] == token:
+            del self._locks[name]
+
+    async def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    async def namespaced_key(self, namespace: str, key: str) -> str:
+        return f"{namespace}:g{await self.generation(namespace)}:{key}"
+
+    async def flush(self, namespace: str) -> None:
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+    async def sweep_namespace(self, namespace: str) -> int:
+        current = await self.generation(namespace)
+        prefix = f"{namespace}:g"
+        stale = []
+        for key in self.store.keys():
+            if not key.startswith(prefix):
+                continue
+            generation, _, _ = key[len(prefix):].partition(":")
+            if generation.isdigit() and int(generation) < current:
+                stale.append(key)
+        return await self.delete_many(stale)
+
+    async def close(self) -> None:
+        self.store.clear()
+        self._locks.clear()
@@ -0,0 +1,252 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from .codecs import ValueSerializer
+from .lru import MISSING, LRUStore
+from .redis_cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+class NearCache(RedisCache):
+    """
+    A RedisCache with an in-process L1 cache in front of it.
+
+    Hits in the L1 layer are served without a network round trip. Local
+    entries live at most `local_ttl` seconds and never outlive the Redis
+    key they mirror. Writes and deletes are published on a Redis pub/sub
+    channel; every replica subscribes to it and drops the affected local
+    entries, so stale values disappear quickly across pods. Namespace
+    flushes need no message: they change the keys resolved by
+    `namespaced_key`, and local entries under the old keys age out.
+
+    A read or write only populates the L1 layer if the key was not
+    invalidated while its Redis round trip was in flight, so a write
+    published by another replica meanwhile cannot be overwritten locally by
+    the value it replaced.
+
+    Values returned from the L1 layer are shared between callers and must
+    not be mutated. Values stored with `set` are copied first.
+
+    Attributes:
+        local (LRUStore): The in-process L1 store.
+        local_ttl (float): The maximum lifetime of an L1 entry in seconds.
+        channel (str): The pub/sub channel used for invalidation messages.
+
+    Methods:
+        start: Subscribe to invalidation messages from other replicas.
+        close: Stop the invalidation listener and close the Redis connection.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0, batch_size: int = 500,
+                 serializer: Optional[ValueSerializer] = None, generation_ttl: float = 1.0,
+                 max_entries: int = 10000,
+                 max_bytes: int = 64 * 1024 * 1024, local_ttl: float = 60.0,
+                 channel: str = "cache:invalidate"):
+        """
+        Initialize the NearCache.
+
+        Args:
+            host (str): The Redis server host. Defaults to 'localhost'.
+            port (int): The Redis server port. Defaults to 6379.
+            db (int): The Redis database number. Defaults to 0.
+            batch_size (int): The maximum number of keys per bulk command.
+            serializer (Optional[ValueSerializer]): The serializer for stored values.
+            generation_ttl (float): Seconds a namespace generation is cached in-process.
+            max_entries (int): The maximum number of L1 entries.
+            max_bytes (int): The maximum accounted size of the L1 layer in bytes.
+            local_ttl (float): The maximum lifetime of an L1 entry in seconds.
+            channel (str): The pub/sub channel used for invalidation messages.
+        """
+        super().__init__(host=host, port=port, db=db, batch_size=batch_size, serializer=serializer,
+                         generation_ttl=generation_ttl)
+        self.local = LRUStore(max_entries=max_entries, max_bytes=max_bytes)
+        self.local_ttl = local_ttl
+        self.channel = channel
+        self._instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._start_lock = asyncio.Lock()
+        # Invalidation version and number of Redis round trips in flight of each key being read or written.
+        self._fetches: Dict[str, List[int]] = {}
+
+    def _local_ttl(self, redis_ttl_ms: Optional[int]) -> float:
+        # PTTL returns -1 for keys without expiry and -2 for missing keys.
+        if redis_ttl_ms is None or redis_ttl_ms < 0:
+            return self.local_ttl
+        return min(self.local_ttl, redis_ttl_ms / 1000)
+
+    async def start(self) -> None:
+        """
+        Subscribe to invalidation messages from other replicas.
+
+        Called automatically on first use, and returns once the subscription
+        is active, so no invalidation published after it can be missed.
+        Calling it again is a no-op.
+        """
+        if self._listener is not None and not self._listener.done():
+            return
+        async with self._start_lock:
+            if self._listener is None or self._listener.done():
+                pubsub = self.redis.pubsub()
+                await pubsub.subscribe(self.channel)
+                self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub: Any) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                self._apply_invalidation(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Without invalidations the L1 layer could serve stale data indefinitely.
+            logger.exception("Near-cache invalidation listener failed; clearing local cache")
+            self.local.clear()
+            for fetch in self._fetches.values():
+                fetch[0] += 1
+        finally:
+            await pubsub.close()
+
+    def _apply_invalidation(self, data: Union[str, bytes]) -> None:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        origin, _, payload = data.partition("\n")
+        if origin == self._instance_id:
+            return
+        for key in payload.split("\n"):
+            self._invalidate_local(key)
+
+    def _invalidate_local(self, key: str) -> None:
+        self.local.pop(key)
+        fetch = self._fetches.get(key)
+        if fetch is not None:
+            fetch[0] += 1
+
+    def _begin_fetch(self, keys: List[str]) -> List[int]:
+        """
+        Register Redis round trips for keys and return their current invalidation versions.
+        """
+        versions = []
+        for key in keys:
+            fetch = self._fetches.setdefault(key, [0, 0])
+            fetch[1] += 1
+            versions.append(fetch[0])
+        return versions
+
+    def _end_fetch(self, key: str, version: int) -> bool:
+        """
+        Unregister a round trip and return whether the key was left alone while it was in flight.
+        """
+        fetch = self._fetches[key]
+        fetch[1] -= 1
+        if not fetch[1]:
+            del self._fetches[key]
+        return fetch[0] == version
+
+    async def _publish(self, keys: List[str]) -> None:
+        if keys:
+            await self.redis.publish(self.channel, "\n".join([self._instance_id, *keys]))
+
+    async def set(self, key: str, value: Any, expire: int = None, codec: Optional[str] = None) -> None:
+        await self.start()
+        data = self._encode(value, codec)
+        self._invalidate_local(key)
+        version, = self._begin_fetch([key])
+        try:
+            await self.redis.set(key, data, ex=expire)
+        finally:
+            unchanged = self._end_fetch(key, version)
+        if unchanged:
+            # The decoded copy is what a get from Redis would return, and is not shared with the caller.
+            self.local.put(key, self._decode(data), len(data),
+                           self._local_ttl(None if expire is None else expire * 1000))
+        await self._publish([key])
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not MISSING:
+            return value
+        await self.start()
+        version, = self._begin_fetch([key])
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                data, ttl = await pipe.execute()
+        finally:
+            unchanged = self._end_fetch(key, version)
+        if data is None:
+            return None
+        value = self._decode(data)
+        if unchanged:
+            self.local.put(key, value, len(data), self._local_ttl(ttl))
+        return value
+
+    async def delete(self, key: str) -> None:
+        self._invalidate_local(key)
+        await self.redis.delete(key)
+        await self._publish([key])
+
+    async def set_many(self, items: Mapping[str, Any],
+                       expire: Union[int, Mapping[str, Optional[int]], None] = None,
+                       codec: Optional[str] = None) -> None:
+        await self.start()
+        await super().set_many(items, expire=expire, codec=codec)
+        for key in items:
+            # Dropping rather than populating keeps set_many to a single encode per value.
+            self._invalidate_local(key)
+        await self._publish(list(items))
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        keys = list(dict.fromkeys(keys))
+        results: Dict[str, Optional[Any]] = {}
+        misses = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is MISSING:
+                misses.append(key)
+            else:
+                results[key] = value
+        if misses:
+            await self.start()
+        for chunk in self._chunks(misses):
+            versions = self._begin_fetch(chunk)
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.mget(*chunk)
+                    for key in chunk:
+                        pipe.pttl(key)
+                    values, *ttls = await pipe.execute()
+            finally:
+                unchanged = [self._end_fetch(key, version) for key, version in zip(chunk, versions)]
+            for key, data, ttl, keep in zip(chunk, values, ttls, unchanged):
+                if data is None:
+                    results[key] = None
+                    continue
+                value = results[key] = self._decode(data)
+                if keep:
+                    self.local.put(key, value, len(data), self._local_ttl(ttl))
+        return {key: results[key] for key in keys}
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        keys = list(dict.fromkeys(keys))
+        for key in keys:
+            self._invalidate_local(key)
+        deleted = await super().delete_many(keys)
+        await self._publish(keys)
+        return deleted
+
+    async def close(self) -> None:
+        """
+        Stop the invalidation listener and close the Redis connection.
+        """
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await super().close()
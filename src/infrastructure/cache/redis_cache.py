@@ -1,26 +1,57 @@
-import json
-from typing import Any, Optional
+import asyncio
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 import aioredis
 
-class RedisCache:
+from .base import BaseCache
+from .codecs import ValueSerializer
+
+# Deletes the lock only if it is still held by the caller's token.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+def _escape_pattern(value: str) -> str:
+    for char in "\\*?[]":
+        value = value.replace(char, "\\" + char)
+    return value
+
+class RedisCache(BaseCache):
     """
     A Redis-based caching implementation.
 
     This class provides methods to interact with a Redis cache, allowing for
     storing, retrieving, and deleting cached items. It uses aioredis for
-    asynchronous Redis operations.
+    asynchronous Redis operations. Values are encoded by a ValueSerializer,
+    which tags each stored value with its codec and compression.
 
     Attributes:
         redis (aioredis.Redis): The Redis client instance.
+        serializer (ValueSerializer): Encodes and decodes stored values.
+        batch_size (int): The maximum number of keys sent to Redis in a single bulk command.
+        generation_ttl (float): Seconds a namespace generation is cached in-process.
 
     Methods:
         set: Store a value in the cache.
         get: Retrieve a value from the cache.
         delete: Remove a value from the cache.
-        flush: Clear all items from the cache.
+        set_many: Store several values in the cache in pipelined round trips.
+        get_many: Retrieve several values from the cache with MGET.
+        delete_many: Remove several values from the cache in pipelined round trips.
+        acquire_lock: Try to acquire a short-lived distributed lock.
+        release_lock: Release a lock acquired with acquire_lock.
+        generation: Return the current generation of a namespace, cached for `generation_ttl` seconds.
+        namespaced_key: Resolve a key within the current generation of a namespace.
+        flush: Invalidate all items in a namespace in O(1).
+        sweep_namespace: Incrementally delete entries from outdated namespace generations.
     """
 
-    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0):
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0, batch_size: int = 500,
+                 serializer: Optional[ValueSerializer] = None, generation_ttl: float = 1.0):
         """
         Initialize the RedisCache.
 
@@ -28,27 +59,45 @@ class RedisCache:
             host (str): The Redis server host. Defaults to 'localhost'.
             port (int): The Redis server port. Defaults to 6379.
             db (int): The Redis database number. Defaults to 0.
+            batch_size (int): The maximum number of keys per bulk command. Larger key
+                sets are split into chunks of this size. Defaults to 500.
+            serializer (Optional[ValueSerializer]): The serializer for stored values.
+                Defaults to uncompressed JSON.
+            generation_ttl (float): Seconds a namespace generation is cached in-process.
+                Other replicas observe an invalidation after at most this delay. Defaults to 1.0.
         """
         self.redis = aioredis.from_url(f"redis://{host}:{port}/{db}")
+        self.batch_size = batch_size
+        self.serializer = serializer or ValueSerializer()
+        self.generation_ttl = generation_ttl
+        self._generations: Dict[str, Tuple[int, float]] = {}
+
+    def _encode(self, value: Any, codec: Optional[str] = None) -> bytes:
+        return self.serializer.dumps(value, codec=codec)
+
+    def _decode(self, value: Union[str, bytes]) -> Any:
+        return self.serializer.loads(value)
 
-    async def set(self, key: str, value: Any, expire: int = None) -> None:
+    def _chunks(self, keys: List[str]) -> Iterable[List[str]]:
+        for start in range(0, len(keys), self.batch_size):
+            yield keys[start:start + self.batch_size]
+
+    async def set(self, key: str, value: Any, expire: int = None, codec: Optional[str] = None) -> None:
         """
         Store a value in the cache.
 
         Args:
             key (str): The key under which to store the value.
-            value (Any): The value to store. Will be JSON-encoded.
+            value (Any): The value to store. Will be encoded with the configured codec.
             expire (int, optional): Time in seconds after which the key will expire.
                                     If None, the key will not expire.
+            codec (Optional[str]): The codec to use instead of the configured one,
+                e.g. "float32" or "int8" for embedding vectors.
 
         Raises:
-            ValueError: If the value cannot be JSON encoded.
+            ValueError: If the value cannot be encoded.
         """
-        try:
-            json_value = json.dumps(value)
-            await self.redis.set(key, json_value, ex=expire)
-        except TypeError as e:
-            raise ValueError(f"Unable to JSON encode the value: {e}")
+        await self.redis.set(key, self._encode(value, codec), ex=expire)
 
     async def get(self, key: str) -> Optional[Any]:
         """
@@ -59,18 +108,15 @@ class RedisCache:
 
         Returns:
             Optional[Any]: The retrieved value, or None if the key doesn't exist.
-                           The value is JSON-decoded before being returned.
+                           The value is decoded with the codec it was stored with.
 
         Raises:
-            ValueError: If the stored value cannot be JSON decoded.
+            ValueError: If the stored value cannot be decoded.
         """
         value = await self.redis.get(key)
         if value is None:
             return None
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Unable to JSON decode the stored value: {e}")
+        return self._decode(value)
 
     async def delete(self, key: str) -> None:
         """
@@ -81,13 +127,201 @@ class RedisCache:
         """
         await self.redis.delete(key)
 
-    async def flush(self) -> None:
+    async def set_many(self, items: Mapping[str, Any],
+                       expire: Union[int, Mapping[str, Optional[int]], None] = None,
+                       codec: Optional[str] = None) -> None:
+        """
+        Store several values in the cache.
+
+        The SET commands are sent through a non-transactional pipeline, one
+        round trip per `batch_size` keys.
+
+        Args:
+            items (Mapping[str, Any]): The values to store, keyed by cache key.
+            expire (Union[int, Mapping[str, Optional[int]], None]): Either a single expiry in
+                seconds applied to every key, or a mapping of per-key expiries. Keys without
+                an expiry will not expire.
+            codec (Optional[str]): The codec to use instead of the configured one.
+
+        Raises:
+            ValueError: If a value cannot be encoded.
+        """
+        encoded = {key: self._encode(value, codec) for key, value in items.items()}
+        for chunk in self._chunks(list(encoded)):
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in chunk:
+                    ttl = expire.get(key) if isinstance(expire, Mapping) else expire
+                    pipe.set(key, encoded[key], ex=ttl)
+                await pipe.execute()
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        """
+        Retrieve several values from the cache.
+
+        Keys are fetched with MGET, one round trip per `batch_size` keys.
+
+        Args:
+            keys (Iterable[str]): The keys of the values to retrieve.
+
+        Returns:
+            Dict[str, Optional[Any]]: The decoded values keyed by cache key,
+                with None for keys that don't exist.
+
+        Raises:
+            ValueError: If a stored value cannot be decoded.
+        """
+        keys = list(dict.fromkeys(keys))
+        results: Dict[str, Optional[Any]] = {}
+        for chunk in self._chunks(keys):
+            values = await self.redis.mget(*chunk)
+            for key, value in zip(chunk, values):
+                results[key] = None if value is None else self._decode(value)
+        return results
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Remove several values from the cache.
+
+        Each chunk of `batch_size` keys is removed with a single DEL command,
+        and all chunks are sent through one pipeline.
+
+        Args:
+            keys (Iterable[str]): The keys of the values to remove.
+
+        Returns:
+            int: The number of keys that were removed.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for chunk in self._chunks(keys):
+                pipe.delete(*chunk)
+            deleted = await pipe.execute()
+        return sum(deleted)
+
+    async def acquire_lock(self, name: str, expire: int = 30) -> Optional[str]:
+        """
+        Try to acquire a short-lived distributed lock.
+
+        Args:
+            name (str): The key of the lock.
+            expire (int): Time in seconds after which the lock is released automatically.
+
+        Returns:
+            Optional[str]: A token identifying the holder, or None if the lock is already held.
+        """
+        token = uuid.uuid4().hex
+        if await self.redis.set(name, token, nx=True, ex=expire):
+            return token
+        return None
+
+    async def release_lock(self, name: str, token: str) -> None:
+        """
+        Release a lock acquired with acquire_lock.
+
+        The lock is only removed if it is still held with the given token,
+        so a holder whose lock already expired cannot release someone else's.
+
+        Args:
+            name (str): The key of the lock.
+            token (str): The token returned by acquire_lock.
+        """
+        await self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, name, token)
+
+    @staticmethod
+    def _generation_key(namespace: str) -> str:
+        return f"cache_ns:{namespace}:generation"
+
+    async def generation(self, namespace: str) -> int:
+        """
+        Return the current generation of a namespace.
+
+        The value is cached in-process for `generation_ttl` seconds, so a
+        flush in another process is seen after at most that delay.
+
+        Args:
+            namespace (str): The namespace, e.g. a prompt name or a model name.
+
+        Returns:
+            int: The current generation.
+        """
+        cached = self._generations.get(namespace)
+        now = time.monotonic()
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        value = await self.redis.get(self._generation_key(namespace))
+        generation = 0 if value is None else int(value)
+        self._generations[namespace] = (generation, now + self.generation_ttl)
+        return generation
+
+    async def namespaced_key(self, namespace: str, key: str) -> str:
         """
-        Clear all items from the cache.
+        Resolve a key within the current generation of a namespace.
 
-        Warning: This will remove all keys from the current database.
+        Args:
+            namespace (str): The namespace, e.g. a prompt name or a model name.
+            key (str): The key within the namespace.
+
+        Returns:
+            str: The Redis key for the current generation of the namespace.
+
+        Example:
+            >>> key = await cache.namespaced_key("prompt:summarize", "abc123")
+            >>> await cache.set(key, response, expire=3600)
+        """
+        return f"{namespace}:g{await self.generation(namespace)}:{key}"
+
+    async def flush(self, namespace: str) -> None:
+        """
+        Invalidate all items in a namespace.
+
+        The namespace generation is incremented, so keys resolved through
+        `namespaced_key` afterwards no longer see the old entries. This is a
+        single INCR regardless of the number of entries; the old entries age
+        out through their TTL or are removed by `sweep_namespace`. Keys
+        outside the namespace, including data written by other features
+        sharing the database, are untouched.
+
+        Args:
+            namespace (str): The namespace to invalidate.
+        """
+        generation = await self.redis.incr(self._generation_key(namespace))
+        self._generations[namespace] = (generation, time.monotonic() + self.generation_ttl)
+
+    async def sweep_namespace(self, namespace: str) -> int:
+        """
+        Incrementally delete entries from outdated generations of a namespace.
+
+        Keys are discovered with SCAN and removed with UNLINK, one batch of
+        `batch_size` keys at a time, so Redis is never blocked. Intended to
+        run as a background task after `flush`.
+
+        Args:
+            namespace (str): The namespace to sweep.
+
+        Returns:
+            int: The number of keys that were removed.
         """
-        await self.redis.flushdb()
+        # A generation cached before a flush elsewhere only leaves more keys for the next sweep.
+        current = await self.generation(namespace)
+        prefix = f"{namespace}:g"
+        deleted = 0
+        batch: List[Union[str, bytes]] = []
+        async for key in self.redis.scan_iter(match=f"{_escape_pattern(prefix)}*", count=self.batch_size):
+            name = key.decode("utf-8") if isinstance(key, bytes) else key
+            generation, _, _ = name[len(prefix):].partition(":")
+            # Keys of other namespaces sharing the prefix do not parse as a generation.
+            if not generation.isdigit() or int(generation) >= current:
+                continue
+            batch.append(key)
+            if len(batch) >= self.batch_size:
+                deleted += await self.redis.unlink(*batch)
+                batch = []
+                await asyncio.sleep(0)
+        if batch:
+            deleted += await self.redis.unlink(*batch)
+        return deleted
 
     async def close(self) -> None:
         """
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Set
+
+from .base import BaseCache
+
+logger = logging.getLogger(__name__)
+
+class StaleWhileRevalidate:
+    """
+    Cache-aside reads with soft/hard expiry and stampede protection.
+
+    Values are stored in an envelope recording their soft expiry and how
+    long they took to compute. The cache entry itself lives until the hard
+    expiry. Reads behave as follows:
+
+    - Fresh values are returned directly. As the soft expiry approaches, a
+      read may trigger an early background refresh with a probability that
+      grows with the recomputation time (the XFetch algorithm).
+    - Values past their soft expiry are returned stale while one background
+      task refreshes them.
+    - On a miss, one caller computes the value under a distributed lock;
+      concurrent callers wait for it to appear instead of calling the
+      provider themselves. If the lock is released without a value, e.g.
+      because the computation failed, the next waiter to take the lock
+      computes it. Waiters only compute without the lock once
+      `wait_timeout` has passed, so it should be at least as long as the
+      slowest computation, and `lock_ttl` longer still.
+
+    Refreshes are serialized across replicas through the cache's lock, so
+    at most one task recomputes a given key at a time.
+
+    Attributes:
+        cache (BaseCache): The cache holding the value envelopes.
+        soft_ttl (int): Seconds after which a value is considered stale.
+        hard_ttl (int): Seconds after which a value is removed from the cache.
+        beta (float): XFetch aggressiveness. Values above 1 favour earlier refreshes; 0 disables them.
+        lock_ttl (int): Seconds after which a refresh lock is released automatically.
+        wait_timeout (float): Seconds a caller waits on a miss for another caller's result
+            while that caller holds the lock.
+
+    Methods:
+        get_or_compute: Return the cached value for a key, computing or refreshing it as needed.
+    """
+
+    def __init__(self, cache: BaseCache, soft_ttl: int, hard_ttl: int, beta: float = 1.0,
+                 lock_ttl: int = 180, wait_timeout: float = 120.0, poll_interval: float = 0.05):
+        if hard_ttl < soft_ttl:
+            raise ValueError("hard_ttl must not be shorter than soft_ttl")
+        self.cache = cache
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.beta = beta
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _lock_name(key: str) -> str:
+        return f"{key}:refresh_lock"
+
+    def _should_refresh_early(self, envelope: Dict[str, Any], now: float) -> bool:
+        # XFetch: -log(u) for u in (0, 1] is exponentially distributed, so the
+        # refresh probability rises sharply as the soft expiry approaches.
+        jitter = -envelope["delta"] * self.beta * math.log(1.0 - random.random())
+        return now + jitter >= envelope["soft_expiry"]
+
+    async def _compute_and_store(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.time()
+        value = await compute()
+        finished = time.time()
+        envelope = {"value": value, "soft_expiry": finished + self.soft_ttl, "delta": finished - started}
+        await self.cache.set(key, envelope, expire=self.hard_ttl)
+        return value
+
+    async def _refresh(self, key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+        lock_name = self._lock_name(key)
+        try:
+            token = await self.cache.acquire_lock(lock_name, self.lock_ttl)
+            if token is None:
+                return
+            try:
+                await self._compute_and_store(key, compute)
+            finally:
+                await self.cache.release_lock(lock_name, token)
+        except Exception:
+            logger.exception("Background refresh failed for cache key %s", key)
+        finally:
+            self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, compute))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for a key, computing or refreshing it as needed.
+
+        Args:
+            key (str): The cache key.
+            compute (Callable[[], Awaitable[Any]]): Coroutine function producing a fresh value.
+                Its result must be serializable by the cache.
+
+        Returns:
+            Any: The cached, stale or freshly computed value.
+        """
+        envelope = await self.cache.get(key)
+        if envelope is not None:
+            if self._should_refresh_early(envelope, time.time()):
+                self._schedule_refresh(key, compute)
+            return envelope["value"]
+
+        lock_name = self._lock_name(key)
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            # Taking the lock succeeds for the first caller, and again whenever its holder
+            # released it without storing a value, so only one caller computes at a time.
+            token = await self.cache.acquire_lock(lock_name, self.lock_ttl)
+            if token is not None:
+                try:
+                    return await self._compute_and_store(key, compute)
+                finally:
+                    await self.cache.release_lock(lock_name, token)
+            if time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(self.poll_interval)
+            envelope = await self.cache.get(key)
+            if envelope is not None:
+                return envelope["value"]
+
+        # The lock holder has been stuck for longer than any computation should take.
+        logger.warning("Timed out waiting for the computation of cache key %s; computing it", key)
+        return await self._compute_and_store(key, compute)
@@ -0,0 +1,154 @@
+import time
+from typing import Any, Dict, Iterable, Mapping, Optional, Union
+
+from .base import BaseCache
+from .disk_cache import SQLiteCache
+from .memory_cache import InMemoryCache
+
+class TieredCache(BaseCache):
+    """
+    A three-tier cache of process memory, Redis and local disk.
+
+    Writes go to the shared tier (Redis) with its TTL capped at
+    `shared_ttl`, and to the disk tier with the full TTL. Cold entries
+    therefore demote themselves: they expire from Redis but remain
+    available on disk. Reads check the tiers from fastest to slowest and
+    count accesses per key; once a key has been read `promote_hits` times
+    from Redis or disk it is copied into process memory, for at most
+    `memory_ttl` seconds and never past the entry's expiry on disk.
+
+    The disk tier is local to the pod, and writes and deletes on other
+    pods do not reach it. Entries are therefore never copied from disk
+    back into the shared tier, where an outdated value would be served to
+    every replica.
+
+    Locks and namespace generations are delegated to the shared tier, so
+    they remain consistent across replicas.
+
+    Attributes:
+        memory (InMemoryCache): The in-process tier.
+        shared (BaseCache): The shared tier, typically a RedisCache.
+        disk (SQLiteCache): The local disk tier.
+        shared_ttl (int): The maximum TTL in seconds of entries in the shared tier.
+        memory_ttl (int): The maximum TTL in seconds of entries promoted into memory.
+        promote_hits (int): The number of reads after which a key is promoted into memory.
+    """
+
+    def __init__(self, memory: InMemoryCache, shared: BaseCache, disk: SQLiteCache,
+                 shared_ttl: int = 3600, memory_ttl: int = 60, promote_hits: int = 3,
+                 max_tracked_keys: int = 100000):
+        self.memory = memory
+        self.shared = shared
+        self.disk = disk
+        self.shared_ttl = shared_ttl
+        self.memory_ttl = memory_ttl
+        self.promote_hits = promote_hits
+        self.max_tracked_keys = max_tracked_keys
+        self._hits: Dict[str, int] = {}
+
+    def _record_hit(self, key: str) -> int:
+        if len(self._hits) >= self.max_tracked_keys:
+            # Halve all counts so frequencies decay and the tracker stays bounded.
+            self._hits = {k: count // 2 for k, count in self._hits.items() if count > 1}
+        hits = self._hits.get(key, 0) + 1
+        self._hits[key] = hits
+        return hits
+
+    def _shared_expire(self, expire: Optional[int]) -> int:
+        return self.shared_ttl if expire is None else min(expire, self.shared_ttl)
+
+    async def _promote(self, key: str, value: Any, expires_at: Optional[float] = None) -> None:
+        if self._record_hit(key) < self.promote_hits:
+            return
+        self._hits.pop(key, None)
+        ttl = self.memory_ttl if expires_at is None else min(self.memory_ttl, expires_at - time.time())
+        if ttl > 0:
+            await self.memory.set(key, value, expire=ttl)
+
+    async def set(self, key: str, value: Any, expire: int = None, codec: Optional[str] = None) -> None:
+        await self.memory.delete(key)
+        await self.shared.set(key, value, expire=self._shared_expire(expire), codec=codec)
+        await self.disk.set(key, value, expire=expire, codec=codec)
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.memory.get(key)
+        if value is not None:
+            return value
+        value = await self.shared.get(key)
+        if value is not None:
+            await self._promote(key, value)
+            return value
+        found = await self.disk.get_many_with_expiry([key])
+        if key not in found:
+            return None
+        value, expires_at = found[key]
+        await self._promote(key, value, expires_at)
+        return value
+
+    async def delete(self, key: str) -> None:
+        self._hits.pop(key, None)
+        await self.memory.delete(key)
+        await self.shared.delete(key)
+        await self.disk.delete(key)
+
+    async def set_many(self, items: Mapping[str, Any],
+                       expire: Union[int, Mapping[str, Optional[int]], None] = None,
+                       codec: Optional[str] = None) -> None:
+        if isinstance(expire, Mapping):
+            shared_expire = {key: self._shared_expire(expire.get(key)) for key in items}
+        else:
+            shared_expire = self._shared_expire(expire)
+        await self.memory.delete_many(items)
+        await self.shared.set_many(items, expire=shared_expire, codec=codec)
+        await self.disk.set_many(items, expire=expire, codec=codec)
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        results = await self.memory.get_many(keys)
+        misses = [key for key, value in results.items() if value is None]
+        if misses:
+            for key, value in (await self.shared.get_many(misses)).items():
+                if value is not None:
+                    results[key] = value
+                    await self._promote(key, value)
+            misses = [key for key in misses if results[key] is None]
+        if misses:
+            for key, (value, expires_at) in (await self.disk.get_many_with_expiry(misses)).items():
+                results[key] = value
+                await self._promote(key, value, expires_at)
+        return results
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        keys = list(dict.fromkeys(keys))
+        for key in keys:
+            self._hits.pop(key, None)
+        await self.memory.delete_many(keys)
+        await self.disk.delete_many(keys)
+        # Counted in the shared tier, which holds the entries every replica sees.
+        return await self.shared.delete_many(keys)
+
+    async def acquire_lock(self, name: str, expire: int = 30) -> Optional[str]:
+        return await self.shared.acquire_lock(name, expire)
+
+    async def release_lock(self, name: str, token: str) -> None:
+        await self.shared.release_lock(name, token)
+
+    async def generation(self, namespace: str) -> int:
+        return await self.shared.generation(namespace)
+
+    async def namespaced_key(self, namespace: str, key: str) -> str:
+        return await self.shared.namespaced_key(namespace, key)
+
+    async def flush(self, namespace: str) -> None:
+        await self.shared.flush(namespace)
+
+    async def sweep_namespace(self, namespace: str) -> int:
+        # Keys in every tier embed the shared tier's generation.
+        generation = await self.shared.generation(namespace)
+        deleted = await self.shared.sweep_namespace(namespace)
+        deleted += await self.disk.sweep_namespace(namespace, generation=generation)
+        return deleted
+
+    async def close(self) -> None:
+        await self.memory.close()
+        await self.shared.close()
+        await self.disk.close()
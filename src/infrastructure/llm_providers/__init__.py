@@ -9,6 +9,9 @@ Components:
 - BaseLLMProvider: Abstract base class for all LLM providers
 - OpenAIProvider: Implementation for OpenAI's GPT models
 - AnthropicProvider: Implementation for Anthropic's Claude models
+- FakeLLMProvider: Offline provider simulating latency, token rate and failures
+- RecordingProvider: Wrapper recording a provider's traffic to a cassette
+- ReplayProvider: Offline provider replaying a recorded cassette
 
 Usage:
     from infrastructure.llm_providers import OpenAIProvider, AnthropicProvider
@@ -23,8 +26,11 @@ Usage:
 from .base import BaseLLMProvider
 from .openai import OpenAIProvider
 from .anthropic import AnthropicProvider
+from .fake import FakeLLMProvider
+from .cassette import CassetteWriter, RecordingProvider, ReplayProvider
 
-__all__ = ["BaseLLMProvider", "OpenAIProvider", "AnthropicProvider"]
+__all__ = ["BaseLLMProvider", "OpenAIProvider", "AnthropicProvider", "FakeLLMProvider", "CassetteWriter",
+           "RecordingProvider", "ReplayProvider"]
 
 # Version of the LLM providers module
 __version__ = "0.1.0"
\ No newline at end of file
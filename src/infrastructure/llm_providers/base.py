@@ -1,5 +1,10 @@
+import asyncio
+import time
+import uuid
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Sequence
+
+from domain.completion import CompletionChoice, CompletionResult
 
 class BaseLLMProvider(ABC):
     """
@@ -10,7 +15,10 @@ class BaseLLMProvider(ABC):
 
     Methods:
         generate_text: Generate text based on a given prompt.
+        generate_completion: Generate n completions with their finish reasons and usage.
+        stream_text: Generate text as an asynchronous stream of chunks.
         create_embedding: Create an embedding for a given text.
+        create_embeddings: Create embeddings for several texts.
         get_provider_info: Retrieve information about the LLM provider.
     """
 
@@ -38,6 +46,72 @@ class BaseLLMProvider(ABC):
         """
         pass
 
+    async def generate_completion(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                                  top_p: float = 1.0, n: int = 1, stop: Optional[List[str]] = None,
+                                  presence_penalty: float = 0.0, frequency_penalty: float = 0.0,
+                                  logit_bias: Optional[Dict[str, float]] = None) -> CompletionResult:
+        """
+        Generate n completions for the given prompt.
+
+        Providers whose API returns several choices, their finish reasons and
+        token usage in one response should override this method. The default
+        implementation calls generate_text concurrently once per choice, and
+        estimates usage by counting whitespace-separated words; finish
+        reasons are unknown and left as None.
+
+        Args:
+            prompt (str): The input prompt for text generation.
+            max_tokens (int): The maximum number of tokens to generate per choice.
+            temperature (float): Controls randomness in generation.
+            top_p (float): Controls diversity via nucleus sampling.
+            n (int): How many completions to generate.
+            stop (Optional[List[str]]): Up to 4 sequences where the API will stop generating further tokens.
+            presence_penalty (float): Penalize new tokens based on whether they appear in the text so far.
+            frequency_penalty (float): Penalize new tokens based on their existing frequency in the text so far.
+            logit_bias (Optional[Dict[str, float]]): Modify the likelihood of specified tokens appearing in the completion.
+
+        Returns:
+            CompletionResult: All n choices, in index order, with the usage of the call.
+        """
+        texts = await asyncio.gather(*(
+            self.generate_text(prompt, max_tokens=max_tokens, temperature=temperature, top_p=top_p, n=1,
+                               stop=stop, presence_penalty=presence_penalty,
+                               frequency_penalty=frequency_penalty, logit_bias=logit_bias)
+            for _ in range(n)
+        ))
+        return CompletionResult(
+            id=f"response-{uuid.uuid4().hex}",
+            object="text_completion",
+            created=int(time.time()),
+            model=getattr(self, "model", type(self).__name__),
+            choices=[CompletionChoice(text, index) for index, text in enumerate(texts)],
+            # Each fallback call sends the prompt again.
+            prompt_tokens=len(prompt.split()) * n,
+            completion_tokens=sum(len(text.split()) for text in texts)
+        )
+
+    async def stream_text(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                          top_p: float = 1.0, stop: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """
+        Generate text as an asynchronous stream of chunks.
+
+        Providers with a native streaming API should override this method.
+        The default implementation yields the complete result of
+        generate_text as a single chunk.
+
+        Args:
+            prompt (str): The input prompt for text generation.
+            max_tokens (int): The maximum number of tokens to generate.
+            temperature (float): Controls randomness in generation.
+            top_p (float): Controls diversity via nucleus sampling.
+            stop (Optional[List[str]]): Up to 4 sequences where the API will stop generating further tokens.
+
+        Yields:
+            str: Successive chunks of the generated text.
+        """
+        yield await self.generate_text(prompt, max_tokens=max_tokens, temperature=temperature,
+                                       top_p=top_p, stop=stop)
+
     @abstractmethod
     async def create_embedding(self, text: str) -> List[float]:
         """
@@ -51,6 +125,22 @@ class BaseLLMProvider(ABC):
         """
         pass
 
+    async def create_embeddings(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Create embeddings for several texts.
+
+        Providers whose API embeds a batch of texts in one request should
+        override this method. The default implementation calls
+        create_embedding concurrently once per text.
+
+        Args:
+            texts (Sequence[str]): The input texts to create embeddings for.
+
+        Returns:
+            List[List[float]]: One embedding vector per text, in order.
+        """
+        return list(await asyncio.gather(*(self.create_embedding(text) for text in texts)))
+
     @abstractmethod
     def get_provider_info(self) -> Dict[str, Any]:
         """
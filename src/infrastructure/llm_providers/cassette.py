@@ -0,0 +1,351 @@
+import asyncio
+import gzip
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, IO, Iterator, List, Optional, Sequence, Union
+
+from core.exceptions import LLMProviderError
+from domain.completion import CompletionResult
+from .base import BaseLLMProvider
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def request_key(kind: str, params: Dict[str, Any]) -> str:
+    """
+    Build the key that matches a replayed request to its recordings.
+
+    Args:
+        kind (str): "generate", "completion", "stream" or "embedding".
+        params (Dict[str, Any]): The request parameters.
+
+    Returns:
+        str: A hex digest of the canonical request.
+    """
+    canonical = json.dumps([kind, params], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+def read_cassette(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the interactions stored in a cassette.
+
+    Args:
+        path (str): The cassette path. Files ending in .gz are read as gzip.
+
+    Yields:
+        Dict[str, Any]: One recorded interaction per line, in recording order.
+    """
+    with _open(path, "r") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        except EOFError:
+            # A gzip cassette whose recorder is still running or was killed has no
+            # end-of-stream marker; every flushed line before that point is intact.
+            return
+
+class CassetteWriter:
+    """
+    Appends interactions to a cassette file.
+
+    Several RecordingProviders may share one writer, so that all traffic
+    lands in a single cassette without interleaved writes. Records are
+    encoded and written on a dedicated single-threaded executor, in the
+    order they were submitted, so recording never blocks the event loop.
+
+    Attributes:
+        path (str): The cassette path. Files ending in .gz are gzip-compressed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = _open(path, "a")
+        self._started = time.monotonic()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cassette-writer")
+
+    def offset(self, started: float) -> float:
+        """
+        Convert a time.monotonic() timestamp to an offset from the start of the recording.
+        """
+        return started - self._started
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        Queue one interaction to be appended and flushed to disk.
+
+        Args:
+            record (Dict[str, Any]): The interaction to store. It must not be modified afterwards.
+        """
+        self._executor.submit(self._write_sync, record)
+
+    def _write_sync(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Write the queued interactions and close the cassette.
+        """
+        self._executor.shutdown(wait=True)
+        self._file.close()
+
+class RecordingProvider(BaseLLMProvider):
+    """
+    Wraps a provider and records every interaction to a cassette.
+
+    A cassette is a JSON Lines file, gzip-compressed if the path ends in
+    .gz. Each line holds the request, its result or error, its offset from
+    the start of the recording, the time to first token and the total
+    duration. Streamed interactions also store the delay before each chunk.
+    A stream closed by its consumer before it finished, e.g. on a client
+    disconnect, is recorded with "incomplete" set. The requests themselves
+    are passed through unchanged.
+
+    Attributes:
+        provider (BaseLLMProvider): The wrapped provider.
+        cassette (CassetteWriter): The cassette new interactions are appended to.
+
+    Methods:
+        generate_text: Generate text through the wrapped provider and record it.
+        generate_completion: Generate n completions through the wrapped provider and record them.
+        stream_text: Stream text through the wrapped provider and record it.
+        create_embedding: Create an embedding through the wrapped provider and record it.
+        create_embeddings: Create embeddings for several texts through the wrapped provider and record them.
+        get_provider_info: Retrieve information about the wrapped provider.
+    """
+
+    def __init__(self, provider: BaseLLMProvider, cassette: Union[str, CassetteWriter]):
+        self.provider = provider
+        self.cassette = CassetteWriter(cassette) if isinstance(cassette, str) else cassette
+        self.model = getattr(provider, "model", type(provider).__name__)
+
+    def _write(self, kind: str, params: Dict[str, Any], started: float, entry: Dict[str, Any]) -> None:
+        self.cassette.write({"kind": kind, "model": self.model, "key": request_key(kind, params),
+                             "request": params, "offset": round(self.cassette.offset(started), 6), **entry})
+
+    async def generate_text(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                            top_p: float = 1.0, n: int = 1, stop: Optional[List[str]] = None,
+                            presence_penalty: float = 0.0, frequency_penalty: float = 0.0,
+                            logit_bias: Optional[Dict[str, float]] = None) -> str:
+        params = {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature, "top_p": top_p,
+                  "n": n, "stop": stop, "presence_penalty": presence_penalty,
+                  "frequency_penalty": frequency_penalty, "logit_bias": logit_bias}
+        started = time.monotonic()
+        try:
+            result = await self.provider.generate_text(**params)
+        except Exception as e:
+            duration = time.monotonic() - started
+            self._write("generate", params, started,
+                        {"error": str(e), "ttft": duration, "duration": duration})
+            raise
+        duration = time.monotonic() - started
+        self._write("generate", params, started,
+                    {"result": result, "ttft": duration, "duration": duration})
+        return result
+
+    async def generate_completion(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                                  top_p: float = 1.0, n: int = 1, stop: Optional[List[str]] = None,
+                                  presence_penalty: float = 0.0, frequency_penalty: float = 0.0,
+                                  logit_bias: Optional[Dict[str, float]] = None) -> CompletionResult:
+        params = {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature, "top_p": top_p,
+                  "n": n, "stop": stop, "presence_penalty": presence_penalty,
+                  "frequency_penalty": frequency_penalty, "logit_bias": logit_bias}
+        started = time.monotonic()
+        try:
+            result = await self.provider.generate_completion(**params)
+        except Exception as e:
+            duration = time.monotonic() - started
+            self._write("completion", params, started,
+                        {"error": str(e), "ttft": duration, "duration": duration})
+            raise
+        duration = time.monotonic() - started
+        self._write("completion", params, started,
+                    {"result": result.to_dict(), "ttft": duration, "duration": duration})
+        return result
+
+    async def stream_text(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                          top_p: float = 1.0, stop: Optional[List[str]] = None) -> AsyncIterator[str]:
+        params = {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature,
+                  "top_p": top_p, "stop": stop}
+        started = last = time.monotonic()
+        chunks: List[List[Any]] = []
+        error = None
+        finished = False
+        try:
+            async for chunk in self.provider.stream_text(**params):
+                now = time.monotonic()
+                chunks.append([round(now - last, 6), chunk])
+                last = now
+                yield chunk
+            finished = True
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            entry: Dict[str, Any] = {
+                "chunks": chunks,
+                "ttft": chunks[0][0] if chunks else time.monotonic() - started,
+                "duration": time.monotonic() - started,
+            }
+            if error is not None:
+                entry["error"] = error
+            elif not finished:
+                # Closed or cancelled by the consumer (GeneratorExit, CancelledError); the chunks are a prefix.
+                entry["incomplete"] = True
+            self._write("stream", params, started, entry)
+
+    async def create_embedding(self, text: str) -> List[float]:
+        params = {"text": text}
+        started = time.monotonic()
+        result = await self.provider.create_embedding(text)
+        duration = time.monotonic() - started
+        self._write("embedding", params, started,
+                    {"result": result, "ttft": duration, "duration": duration})
+        return result
+
+    async def create_embeddings(self, texts: Sequence[str]) -> List[List[float]]:
+        params = {"texts": list(texts)}
+        started = time.monotonic()
+        result = await self.provider.create_embeddings(texts)
+        duration = time.monotonic() - started
+        self._write("embeddings", params, started,
+                    {"result": result, "ttft": duration, "duration": duration})
+        return result
+
+    def get_provider_info(self) -> Dict[str, Any]:
+        return {**self.provider.get_provider_info(), "recording": self.cassette.path}
+
+class ReplayProvider(BaseLLMProvider):
+    """
+    Serves recorded interactions from a cassette without network access.
+
+    Requests are matched to recordings by their parameters. When a request
+    was recorded several times, its recordings are served in turn. Each
+    response waits for the recorded duration multiplied by `time_scale`, and
+    streamed responses keep the recorded spacing between chunks. Recorded
+    errors are raised as LLMProviderError, as are streams recorded as
+    incomplete, after their recorded chunks. Cassettes recorded before
+    generate_completion existed hold no "completion" interactions; for
+    those, completions are rebuilt from the recorded generate calls.
+    Likewise, batched embeddings are rebuilt from recorded single
+    embeddings when the cassette holds no "embeddings" interactions.
+
+    Attributes:
+        path (str): The cassette path.
+        model (str): The model name reported by the provider.
+        time_scale (float): Multiplier for recorded latencies. 1.0 replays in
+            real time, 0 replays instantly.
+        strict (bool): Whether requests missing from the cassette raise
+            LLMProviderError. When False, the recordings are served in
+            turn regardless of the request.
+
+    Methods:
+        generate_text: Replay a recorded completion.
+        generate_completion: Replay recorded n-choice completions.
+        stream_text: Replay a recorded streamed completion.
+        create_embedding: Replay a recorded embedding.
+        create_embeddings: Replay recorded embeddings of several texts.
+        get_provider_info: Retrieve information about the replay provider.
+    """
+
+    def __init__(self, path: str, model: Optional[str] = None, time_scale: float = 1.0, strict: bool = True):
+        self.path = path
+        self.time_scale = time_scale
+        self.strict = strict
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        kinds: Dict[str, List[Dict[str, Any]]] = {}
+        for record in read_cassette(path):
+            grouped.setdefault(record["key"], []).append(record)
+            kinds.setdefault(record["kind"], []).append(record)
+            model = model or record.get("model")
+        self.model = model or "replay"
+        self._by_key: Dict[str, Iterator[Dict[str, Any]]] = {
+            key: itertools.cycle(records) for key, records in grouped.items()
+        }
+        self._by_kind: Dict[str, Iterator[Dict[str, Any]]] = {
+            kind: itertools.cycle(records) for kind, records in kinds.items()
+        }
+
+    def _lookup(self, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        records = self._by_key.get(request_key(kind, params))
+        if records is None and not self.strict:
+            records = self._by_kind.get(kind)
+        if records is None:
+            raise LLMProviderError("Replay", f"no recorded {kind} interaction for this request")
+        return next(records)
+
+    async def _sleep(self, seconds: float) -> None:
+        if self.time_scale > 0 and seconds > 0:
+            await asyncio.sleep(seconds * self.time_scale)
+
+    async def generate_text(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                            top_p: float = 1.0, n: int = 1, stop: Optional[List[str]] = None,
+                            presence_penalty: float = 0.0, frequency_penalty: float = 0.0,
+                            logit_bias: Optional[Dict[str, float]] = None) -> str:
+        record = self._lookup("generate", {
+            "prompt": prompt, "max_tokens": max_tokens, "temperature": temperature, "top_p": top_p,
+            "n": n, "stop": stop, "presence_penalty": presence_penalty,
+            "frequency_penalty": frequency_penalty, "logit_bias": logit_bias})
+        await self._sleep(record["duration"])
+        if "error" in record:
+            raise LLMProviderError("Replay", record["error"])
+        return record["result"]
+
+    async def generate_completion(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                                  top_p: float = 1.0, n: int = 1, stop: Optional[List[str]] = None,
+                                  presence_penalty: float = 0.0, frequency_penalty: float = 0.0,
+                                  logit_bias: Optional[Dict[str, float]] = None) -> CompletionResult:
+        params = {"prompt": prompt, "max_tokens": max_tokens, "temperature": temperature, "top_p": top_p,
+                  "n": n, "stop": stop, "presence_penalty": presence_penalty,
+                  "frequency_penalty": frequency_penalty, "logit_bias": logit_bias}
+        if "completion" not in self._by_kind:
+            return await super().generate_completion(**params)
+        record = self._lookup("completion", params)
+        await self._sleep(record["duration"])
+        if "error" in record:
+            raise LLMProviderError("Replay", record["error"])
+        return CompletionResult.from_dict(record["result"])
+
+    async def stream_text(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                          top_p: float = 1.0, stop: Optional[List[str]] = None) -> AsyncIterator[str]:
+        record = self._lookup("stream", {"prompt": prompt, "max_tokens": max_tokens,
+                                         "temperature": temperature, "top_p": top_p, "stop": stop})
+        for delay, chunk in record["chunks"]:
+            await self._sleep(delay)
+            yield chunk
+        if "error" in record:
+            raise LLMProviderError("Replay", record["error"])
+        if record.get("incomplete"):
+            raise LLMProviderError("Replay", "the recorded stream was closed before it finished")
+
+    async def create_embedding(self, text: str) -> List[float]:
+        record = self._lookup("embedding", {"text": text})
+        await self._sleep(record["duration"])
+        return record["result"]
+
+    async def create_embeddings(self, texts: Sequence[str]) -> List[List[float]]:
+        if "embeddings" not in self._by_kind:
+            return await super().create_embeddings(texts)
+        record = self._lookup("embeddings", {"texts": list(texts)})
+        await self._sleep(record["duration"])
+        return record["result"]
+
+    def get_provider_info(self) -> Dict[str, Any]:
+        return {
+            "name": "Replay",
+            "model": self.model,
+            "type": "Recorded",
+            "version": "0.1.0",
+            "cassette": self.path,
+            "time_scale": self.time_scale,
+        }
@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import math
+import random
+import time
+from typing import AsyncIterator, List, Dict, Any, Optional
+
+from core.exceptions import LLMProviderError
+from domain.completion import CompletionChoice, CompletionResult
+from .base import BaseLLMProvider
+
+_WORDS = (
+    "the quick brown fox jumps over a lazy dog while seven wizards quietly "
+    "judge every boxing match under pale violet skies near old harbour towns"
+).split()
+
+class FakeLLMProvider(BaseLLMProvider):
+    """
+    An offline LLM provider that simulates latency, token throughput and failures.
+
+    Intended for load tests, benchmarks and local development. No network
+    calls are made. Each call waits for a time-to-first-token sampled from
+    the configured latency distribution, then produces tokens at
+    `tokens_per_second`. Completions are deterministic for a given prompt,
+    so they cache the same way real responses do.
+
+    Attributes:
+        model (str): The model name reported by the provider.
+        latency_mean (float): Mean time-to-first-token in seconds.
+        latency_stddev (float): Standard deviation of the time-to-first-token in seconds.
+        latency_distribution (str): One of "fixed", "normal", "lognormal" or "exponential".
+        tokens_per_second (float): Simulated generation rate. 0 produces all tokens at once.
+        error_rate (float): Probability that a call fails with LLMProviderError.
+        embedding_dim (int): The dimension of the embeddings returned by create_embedding.
+
+    Methods:
+        generate_text: Simulate a completion.
+        generate_completion: Simulate n completions from one call.
+        stream_text: Simulate a streamed completion.
+        create_embedding: Return a deterministic unit-length embedding for a text.
+        get_provider_info: Retrieve information about the fake provider.
+    """
+
+    DISTRIBUTIONS = ("fixed", "normal", "lognormal", "exponential")
+
+    def __init__(self, model: str = "fake-model", latency_mean: float = 0.2, latency_stddev: float = 0.05,
+                 latency_distribution: str = "lognormal", tokens_per_second: float = 50.0,
+                 error_rate: float = 0.0, embedding_dim: int = 1536, seed: Optional[int] = None):
+        if latency_distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unsupported latency distribution: {latency_distribution}")
+        self.model = model
+        self.latency_mean = latency_mean
+        self.latency_stddev = latency_stddev
+        self.latency_distribution = latency_distribution
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.embedding_dim = embedding_dim
+        self._rng = random.Random(seed)
+
+    def _sample_latency(self) -> float:
+        mean, stddev = self.latency_mean, self.latency_stddev
+        if mean <= 0:
+            return 0.0
+        if self.latency_distribution == "fixed":
+            return mean
+        if self.latency_distribution == "normal":
+            return max(0.0, self._rng.gauss(mean, stddev))
+        if self.latency_distribution == "exponential":
+            return self._rng.expovariate(1.0 / mean)
+        # Lognormal with the requested mean and standard deviation: long right tail, like real APIs.
+        sigma2 = math.log1p((stddev / mean) ** 2)
+        return self._rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+
+    def _should_fail(self) -> bool:
+        return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    def _failure(self) -> LLMProviderError:
+        return LLMProviderError("Fake", "injected failure")
+
+    def _tokens(self, prompt: str, max_tokens: int) -> List[str]:
+        offset = int.from_bytes(hashlib.blake2b(prompt.encode("utf-8"), digest_size=4).digest(), "little")
+        return [_WORDS[(offset + i) % len(_WORDS)] for i in range(max_tokens)]
+
+    async def generate_text(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                            top_p: float = 1.0, n: int = 1, stop: Optional[List[str]] = None,
+                            presence_penalty: float = 0.0, frequency_penalty: float = 0.0,
+                            logit_bias: Optional[Dict[str, float]] = None) -> str:
+        """
+        Simulate a completion.
+
+        Waits for the sampled time-to-first-token plus the time needed to
+        produce `max_tokens` tokens. The remaining parameters are accepted
+        for interface compatibility and ignored.
+
+        Args:
+            prompt (str): The input prompt. Determines the generated words.
+            max_tokens (int): The number of tokens to generate.
+
+        Returns:
+            str: The generated text.
+
+        Raises:
+            LLMProviderError: If a failure is injected.
+        """
+        tokens = self._tokens(prompt, max_tokens)
+        delay = self._sample_latency()
+        if self.tokens_per_second > 0:
+            delay += len(tokens) / self.tokens_per_second
+        await asyncio.sleep(delay)
+        if self._should_fail():
+            raise self._failure()
+        return " ".join(tokens)
+
+    async def generate_completion(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                                  top_p: float = 1.0, n: int = 1, stop: Optional[List[str]] = None,
+                                  presence_penalty: float = 0.0, frequency_penalty: float = 0.0,
+                                  logit_bias: Optional[Dict[str, float]] = None) -> CompletionResult:
+        """
+        Simulate n completions from one call.
+
+        The choices are generated in parallel, as by a real backend, so the
+        call takes as long as a single completion. Each choice has its own
+        deterministic text and finishes on "length".
+
+        Args:
+            prompt (str): The input prompt. Determines the generated words.
+            max_tokens (int): The number of tokens to generate per choice.
+            n (int): How many completions to generate.
+
+        Returns:
+            CompletionResult: The simulated choices and their usage.
+
+        Raises:
+            LLMProviderError: If a failure is injected.
+        """
+        texts = [" ".join(self._tokens(prompt if index == 0 else f"{prompt}\x00{index}", max_tokens))
+                 for index in range(n)]
+        delay = self._sample_latency()
+        if self.tokens_per_second > 0:
+            delay += max_tokens / self.tokens_per_second
+        await asyncio.sleep(delay)
+        if self._should_fail():
+            raise self._failure()
+        return CompletionResult(
+            id=f"response-{hashlib.blake2b(prompt.encode('utf-8'), digest_size=8).hexdigest()}",
+            object="text_completion",
+            created=int(time.time()),
+            model=self.model,
+            choices=[CompletionChoice(text, index, finish_reason="length") for index, text in enumerate(texts)],
+            prompt_tokens=len(prompt.split()),
+            completion_tokens=max_tokens * n
+        )
+
+    async def stream_text(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                          top_p: float = 1.0, stop: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """
+        Simulate a streamed completion, one token per chunk.
+
+        Injected failures happen after a random number of tokens, as a
+        dropped connection would.
+
+        Args:
+            prompt (str): The input prompt. Determines the generated words.
+            max_tokens (int): The number of tokens to generate.
+
+        Yields:
+            str: Successive tokens, each followed by a space except the last.
+
+        Raises:
+            LLMProviderError: If a failure is injected.
+        """
+        tokens = self._tokens(prompt, max_tokens)
+        fail_at = self._rng.randrange(len(tokens) + 1) if self._should_fail() else None
+        await asyncio.sleep(self._sample_latency())
+        interval = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        for i, token in enumerate(tokens):
+            if i == fail_at:
+                raise self._failure()
+            if i and interval:
+                await asyncio.sleep(interval)
+            yield token if i == len(tokens) - 1 else token + " "
+        if fail_at == len(tokens):
+            raise self._failure()
+
+    async def create_embedding(self, text: str) -> List[float]:
+        """
+        Return a deterministic unit-length embedding for a text.
+
+        Args:
+            text (str): The input text.
+
+        Returns:
+            List[float]: An `embedding_dim`-dimensional vector derived from a hash of the text.
+        """
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        rng = random.Random(seed)
+        vector = [rng.gauss(0.0, 1.0) for _ in range(self.embedding_dim)]
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    def get_provider_info(self) -> Dict[str, Any]:
+        """
+        Retrieve information about the fake provider.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing provider information.
+        """
+        return {
+            "name": "Fake",
+            "model": self.model,
+            "type": "Simulated",
+            "version": "0.1.0",
+            "latency_distribution": self.latency_distribution,
+            "tokens_per_second": self.tokens_per_second,
+            "error_rate": self.error_rate,
+        }
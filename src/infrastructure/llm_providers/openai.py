@@ -1,5 +1,7 @@
+import asyncio
 import openai
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Sequence
+from domain.completion import CompletionChoice, CompletionResult
 from .base import BaseLLMProvider
 
 class OpenAIProvider(BaseLLMProvider):
@@ -12,16 +14,25 @@ class OpenAIProvider(BaseLLMProvider):
     Attributes:
         api_key (str): The API key for authenticating with OpenAI's services.
         model (str): The specific GPT model to use (e.g., "gpt-3.5-turbo", "gpt-4").
+        embedding_model (str): The OpenAI model that creates embeddings.
 
     Methods:
         generate_text: Generate text using OpenAI's GPT models.
+        generate_completion: Generate n completions in a single OpenAI request.
+        stream_text: Stream generated text chunks from OpenAI's GPT models.
         create_embedding: Create an embedding using OpenAI's embedding models.
+        create_embeddings: Create embeddings for several texts in as few OpenAI requests as possible.
         get_provider_info: Retrieve information about the OpenAI provider.
     """
 
-    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
+    # The maximum number of inputs OpenAI accepts in one embedding request.
+    EMBEDDING_BATCH_SIZE = 2048
+
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo",
+                 embedding_model: str = "text-embedding-ada-002"):
         self.api_key = api_key
         self.model = model
+        self.embedding_model = embedding_model
         openai.api_key = api_key
 
     async def generate_text(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7, 
@@ -36,7 +47,7 @@ class OpenAIProvider(BaseLLMProvider):
             max_tokens (int): The maximum number of tokens to generate.
             temperature (float): Controls randomness in generation.
             top_p (float): Controls diversity via nucleus sampling.
-            n (int): How many completions to generate for each prompt.
+            n (int): Ignored, since only one completion is returned. Use generate_completion for n choices.
             stop (Optional[List[str]]): Up to 4 sequences where the API will stop generating further tokens.
             presence_penalty (float): Penalize new tokens based on whether they appear in the text so far.
             frequency_penalty (float): Penalize new tokens based on their existing frequency in the text so far.
@@ -45,6 +56,33 @@ class OpenAIProvider(BaseLLMProvider):
         Returns:
             str: The generated text.
         """
+        result = await self.generate_completion(
+            prompt, max_tokens=max_tokens, temperature=temperature, top_p=top_p, n=1, stop=stop,
+            presence_penalty=presence_penalty, frequency_penalty=frequency_penalty, logit_bias=logit_bias
+        )
+        return result.choices[0].text
+
+    async def generate_completion(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                                  top_p: float = 1.0, n: int = 1, stop: Optional[List[str]] = None,
+                                  presence_penalty: float = 0.0, frequency_penalty: float = 0.0,
+                                  logit_bias: Optional[Dict[str, float]] = None) -> CompletionResult:
+        """
+        Generate n completions in a single OpenAI request.
+
+        Args:
+            prompt (str): The input prompt for text generation.
+            max_tokens (int): The maximum number of tokens to generate per choice.
+            temperature (float): Controls randomness in generation.
+            top_p (float): Controls diversity via nucleus sampling.
+            n (int): How many completions to generate.
+            stop (Optional[List[str]]): Up to 4 sequences where the API will stop generating further tokens.
+            presence_penalty (float): Penalize new tokens based on whether they appear in the text so far.
+            frequency_penalty (float): Penalize new tokens based on their existing frequency in the text so far.
+            logit_bias (Optional[Dict[str, float]]): Modify the likelihood of specified tokens appearing in the completion.
+
+        Returns:
+            CompletionResult: Every choice with its finish reason, and the usage reported by OpenAI.
+        """
         response = await openai.Completion.acreate(
             engine=self.model,
             prompt=prompt,
@@ -57,7 +95,46 @@ class OpenAIProvider(BaseLLMProvider):
             frequency_penalty=frequency_penalty,
             logit_bias=logit_bias
         )
-        return response.choices[0].text.strip()
+        choices = sorted(response.choices, key=lambda choice: choice.index)
+        return CompletionResult(
+            id=response.id,
+            object=response.object,
+            created=response.created,
+            model=response.model,
+            choices=[CompletionChoice(choice.text.strip(), choice.index, choice.get("logprobs"),
+                                      choice.get("finish_reason")) for choice in choices],
+            prompt_tokens=response.usage.prompt_tokens,
+            completion_tokens=response.usage.completion_tokens
+        )
+
+    async def stream_text(self, prompt: str, max_tokens: int = 100, temperature: float = 0.7,
+                          top_p: float = 1.0, stop: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """
+        Stream generated text chunks from OpenAI's GPT models.
+
+        Args:
+            prompt (str): The input prompt for text generation.
+            max_tokens (int): The maximum number of tokens to generate.
+            temperature (float): Controls randomness in generation.
+            top_p (float): Controls diversity via nucleus sampling.
+            stop (Optional[List[str]]): Up to 4 sequences where the API will stop generating further tokens.
+
+        Yields:
+            str: Successive chunks of the generated text.
+        """
+        response = await openai.Completion.acreate(
+            engine=self.model,
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            stop=stop,
+            stream=True
+        )
+        async for chunk in response:
+            text = chunk.choices[0].text
+            if text:
+                yield text
 
     async def create_embedding(self, text: str) -> List[float]:
         """
@@ -69,11 +146,28 @@ class OpenAIProvider(BaseLLMProvider):
         Returns:
             List[float]: The embedding vector.
         """
-        response = await openai.Embedding.acreate(
-            input=[text],
-            model="text-embedding-ada-002"
-        )
-        return response['data'][0]['embedding']
+        return (await self.create_embeddings([text]))[0]
+
+    async def create_embeddings(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Create embeddings for several texts, sending up to EMBEDDING_BATCH_SIZE texts per request.
+
+        Args:
+            texts (Sequence[str]): The input texts to create embeddings for.
+
+        Returns:
+            List[List[float]]: One embedding vector per text, in order.
+        """
+        texts = list(texts)
+        responses = await asyncio.gather(*(
+            openai.Embedding.acreate(
+                input=texts[start:start + self.EMBEDDING_BATCH_SIZE],
+                model=self.embedding_model
+            )
+            for start in range(0, len(texts), self.EMBEDDING_BATCH_SIZE)
+        ))
+        return [item['embedding'] for response in responses
+                for item in sorted(response['data'], key=lambda item: item['index'])]
 
     def get_provider_info(self) -> Dict[str, Any]:
         """
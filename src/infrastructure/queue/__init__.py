@@ -0,0 +1,33 @@
+"""
+Job Queue Module
+
+This module provides durable queues for LLM requests processed
+asynchronously by worker processes.
+
+Components:
+- BaseJobQueue: Abstract interface shared by all job queues
+- RedisJobQueue: A job queue backed by a Redis stream and consumer group
+
+Usage:
+    from domain.job import Job
+    from infrastructure.queue import RedisJobQueue
+
+    queue = RedisJobQueue(host='localhost', port=6379, db=0)
+
+    # Submitting a job
+    job = Job(request_type="generate", input_text="Once upon a time")
+    await queue.submit(job)
+
+    # In a worker: claim, process and complete jobs
+    for delivery_id, job in await queue.claim("worker-1", count=8, block=5):
+        ...
+        await queue.complete(delivery_id, job)
+"""
+
+from .base import BaseJobQueue
+from .redis_queue import RedisJobQueue
+
+__all__ = ["BaseJobQueue", "RedisJobQueue"]
+
+# Version of the job queue module
+__version__ = "0.1.0"
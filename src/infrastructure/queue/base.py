@@ -0,0 +1,132 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+
+from domain.job import Job
+
+# A job handed to a worker, with the delivery ID used to acknowledge it.
+Claim = Tuple[str, Job]
+
+class BaseJobQueue(ABC):
+    """
+    Abstract base class for job queues.
+
+    A job queue stores submitted jobs and hands each one to a single worker
+    at a time. Delivery is at-least-once: a job claimed by a worker that
+    stops before completing it is handed to another worker once it has been
+    idle for long enough.
+
+    Methods:
+        submit: Store a job and queue it for processing.
+        get: Retrieve a job by ID.
+        save: Update a job's stored state.
+        claim: Claim queued jobs for a worker.
+        reclaim: Claim jobs abandoned by other workers.
+        touch: Mark claimed jobs as still in progress.
+        complete: Store a finished job and remove it from the queue.
+        depth: Count the jobs queued or in progress.
+        close: Release the resources held by the queue.
+    """
+
+    @abstractmethod
+    async def submit(self, job: Job) -> None:
+        """
+        Store a job and queue it for processing.
+
+        Args:
+            job (Job): The job to submit.
+
+        Raises:
+            JobQueueFullError: If the queue is at capacity.
+        """
+        pass
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]:
+        """
+        Retrieve a job by ID.
+
+        Args:
+            job_id (str): The ID of the job.
+
+        Returns:
+            Optional[Job]: The job, or None if it doesn't exist or has expired.
+        """
+        pass
+
+    @abstractmethod
+    async def save(self, job: Job) -> None:
+        """
+        Update a job's stored state without changing its place in the queue.
+
+        Args:
+            job (Job): The job to store.
+        """
+        pass
+
+    @abstractmethod
+    async def claim(self, consumer: str, count: int, block: float = 0) -> List[Claim]:
+        """
+        Claim queued jobs for a worker.
+
+        Args:
+            consumer (str): The name of the claiming worker.
+            count (int): The maximum number of jobs to claim.
+            block (float): Seconds to wait for a job when none is queued. 0 returns immediately.
+
+        Returns:
+            List[Claim]: The claimed jobs with their delivery IDs.
+        """
+        pass
+
+    @abstractmethod
+    async def reclaim(self, consumer: str, min_idle: float, count: int) -> List[Claim]:
+        """
+        Claim jobs that other workers claimed but have not touched or completed recently.
+
+        Args:
+            consumer (str): The name of the claiming worker.
+            min_idle (float): Seconds a claimed job must have been idle to be reclaimed.
+            count (int): The maximum number of jobs to reclaim.
+
+        Returns:
+            List[Claim]: The reclaimed jobs with their delivery IDs.
+        """
+        pass
+
+    @abstractmethod
+    async def touch(self, consumer: str, delivery_ids: Sequence[str]) -> None:
+        """
+        Reset the idle time of jobs a worker is still processing, so they are not reclaimed.
+
+        Args:
+            consumer (str): The name of the worker holding the jobs.
+            delivery_ids (Sequence[str]): The delivery IDs of the jobs.
+        """
+        pass
+
+    @abstractmethod
+    async def complete(self, delivery_id: str, job: Job) -> None:
+        """
+        Store a finished job and remove it from the queue.
+
+        Args:
+            delivery_id (str): The delivery ID returned with the job by claim or reclaim.
+            job (Job): The finished job, with its result or error.
+        """
+        pass
+
+    @abstractmethod
+    async def depth(self) -> int:
+        """
+        Count the jobs queued or in progress.
+
+        Returns:
+            int: The number of jobs not yet completed.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Release the resources held by the queue.
+        """
+        pass
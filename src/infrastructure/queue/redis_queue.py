@@ -0,0 +1,186 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import aioredis
+from aioredis.exceptions import ResponseError
+
+from core.exceptions import JobQueueFullError
+from domain.job import Job
+from .base import BaseJobQueue, Claim
+
+# Resets the idle time of the entries in ARGV[3:] that are still pending for
+# the consumer ARGV[2]. Checking the owner and claiming in one script keeps a
+# worker from taking back an entry another worker has reclaimed in between.
+_TOUCH_SCRIPT = """
+local touched = 0
+for i = 3, #ARGV do
+    local entry = redis.call('XPENDING', KEYS[1], ARGV[1], ARGV[i], ARGV[i], 1)[1]
+    if entry and entry[2] == ARGV[2] then
+        redis.call('XCLAIM', KEYS[1], ARGV[1], ARGV[2], 0, ARGV[i], 'JUSTID')
+        touched = touched + 1
+    end
+end
+return touched
+"""
+
+def _text(value: Union[str, bytes]) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+def _next_id(entry_id: Union[str, bytes]) -> str:
+    # The smallest stream ID after entry_id, used as an inclusive range start.
+    ms, seq = _text(entry_id).split("-")
+    return f"{ms}-{int(seq) + 1}"
+
+class RedisJobQueue(BaseJobQueue):
+    """
+    A job queue backed by a Redis stream and consumer group.
+
+    Each job is stored as JSON under its own key with a TTL, and its ID is
+    appended to a stream. Workers read the stream through a consumer group,
+    so every entry is delivered to one worker and stays in the group's
+    pending list until the worker acknowledges it. Entries are deleted once
+    acknowledged, so the stream length is the number of unfinished jobs.
+    Entries pending for longer than the idle timeout belong to workers that
+    died, and are reclaimed with XCLAIM. Touching an entry claims it again
+    only while it is still pending for the same worker.
+
+    Attributes:
+        redis (aioredis.Redis): The Redis client instance.
+        prefix (str): Prefix of the stream, consumer group and job keys.
+        max_pending (int): Maximum number of unfinished jobs. 0 disables the limit.
+        job_ttl (int): Seconds an unfinished job record is kept.
+        result_ttl (int): Seconds a finished job and its result are kept.
+
+    Methods:
+        submit: Store a job and add it to the stream.
+        get: Retrieve a job by ID.
+        save: Update a job's stored state.
+        claim: Read new jobs with XREADGROUP.
+        reclaim: Take over idle pending jobs with XCLAIM.
+        touch: Reset the idle time of the pending jobs a worker still holds.
+        complete: Store a finished job, acknowledge and delete its entry.
+        depth: Count the unfinished jobs with XLEN.
+        close: Close the Redis connection pool.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0, prefix: str = "llm_jobs",
+                 max_pending: int = 10000, job_ttl: int = 86400, result_ttl: int = 86400):
+        """
+        Initialize the RedisJobQueue.
+
+        Args:
+            host (str): The Redis server host. Defaults to 'localhost'.
+            port (int): The Redis server port. Defaults to 6379.
+            db (int): The Redis database number. Defaults to 0.
+            prefix (str): Prefix of the keys used by the queue. Defaults to "llm_jobs".
+            max_pending (int): Maximum number of unfinished jobs. Submissions beyond it
+                are rejected. 0 disables the limit. Defaults to 10000.
+            job_ttl (int): Seconds an unfinished job record is kept. Defaults to one day.
+            result_ttl (int): Seconds a finished job and its result are kept. Defaults to one day.
+        """
+        self.redis = aioredis.from_url(f"redis://{host}:{port}/{db}")
+        self.prefix = prefix
+        self.max_pending = max_pending
+        self.job_ttl = job_ttl
+        self.result_ttl = result_ttl
+        self._stream = f"{prefix}:stream"
+        self._group = f"{prefix}:workers"
+        self._group_ready = False
+        self._touch_script = self.redis.register_script(_TOUCH_SCRIPT)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            await self.redis.xgroup_create(self._stream, self._group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def _load(self, entries: List[Tuple[Any, Optional[Dict[Any, Any]]]]) -> List[Claim]:
+        # Entries whose job record has expired cannot be processed; acknowledge
+        # them so they are not delivered again. XCLAIM returns entries deleted
+        # while pending without an ID on older Redis versions, and skips them on newer ones.
+        entries = [(entry_id, fields) for entry_id, fields in entries if entry_id is not None]
+        job_ids = {_text(entry_id): _text(fields[b"job_id"]) for entry_id, fields in entries if fields}
+        orphans = [_text(entry_id) for entry_id, fields in entries if not fields]
+        claims: List[Claim] = []
+        if job_ids:
+            records = await self.redis.mget(*(self._job_key(job_id) for job_id in job_ids.values()))
+            for delivery_id, record in zip(job_ids, records):
+                if record is None:
+                    orphans.append(delivery_id)
+                else:
+                    claims.append((delivery_id, Job.parse_raw(record)))
+        if orphans:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.xack(self._stream, self._group, *orphans)
+                pipe.xdel(self._stream, *orphans)
+                await pipe.execute()
+        return claims
+
+    async def submit(self, job: Job) -> None:
+        if self.max_pending:
+            depth = await self.depth()
+            if depth >= self.max_pending:
+                raise JobQueueFullError(depth)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._job_key(job.id), job.json(), ex=self.job_ttl)
+            pipe.xadd(self._stream, {"job_id": job.id})
+            await pipe.execute()
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        record = await self.redis.get(self._job_key(job_id))
+        return None if record is None else Job.parse_raw(record)
+
+    async def save(self, job: Job) -> None:
+        await self.redis.set(self._job_key(job.id), job.json(), ex=self.job_ttl)
+
+    async def claim(self, consumer: str, count: int, block: float = 0) -> List[Claim]:
+        await self._ensure_group()
+        response = await self.redis.xreadgroup(
+            self._group, consumer, {self._stream: ">"}, count=count,
+            block=int(block * 1000) if block > 0 else None
+        )
+        if not response:
+            return []
+        return await self._load(response[0][1])
+
+    async def reclaim(self, consumer: str, min_idle: float, count: int) -> List[Claim]:
+        await self._ensure_group()
+        min_idle_ms = int(min_idle * 1000)
+        # Page through the whole pending list, oldest first. Entries idle for
+        # long enough can sit behind any number of recently delivered ones.
+        idle: List[Any] = []
+        start = "-"
+        page_size = max(count * 4, 100)
+        while len(idle) < count:
+            pending = await self.redis.xpending_range(self._stream, self._group, start, "+", page_size)
+            idle.extend(entry["message_id"] for entry in pending if entry["time_since_delivered"] >= min_idle_ms)
+            if len(pending) < page_size:
+                break
+            start = _next_id(pending[-1]["message_id"])
+        if not idle:
+            return []
+        # XCLAIM re-checks the idle time, so a job is reclaimed by one worker only.
+        claimed = await self.redis.xclaim(self._stream, self._group, consumer, min_idle_ms, idle[:count])
+        return await self._load(claimed)
+
+    async def touch(self, consumer: str, delivery_ids: Sequence[str]) -> None:
+        if delivery_ids:
+            await self._touch_script(keys=[self._stream], args=[self._group, consumer, *delivery_ids])
+
+    async def complete(self, delivery_id: str, job: Job) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._job_key(job.id), job.json(), ex=self.result_ttl)
+            pipe.xack(self._stream, self._group, delivery_id)
+            pipe.xdel(self._stream, delivery_id)
+            await pipe.execute()
+
+    async def depth(self) -> int:
+        return await self.redis.xlen(self._stream)
+
+    async def close(self) -> None:
+        await self.redis.close()
@@ -0,0 +1,47 @@
+"""
+Vector Store Module
+
+This module provides storage and similarity search for embedding vectors.
+
+Components:
+- BaseVectorStore: Abstract interface shared by all vector stores
+- VectorMatch: A search result with the stored ID, score and metadata
+- MemmapVectorStore: An append-only float32 store in memory-mapped files,
+  searched by exact cosine similarity with NumPy and shared across processes
+  through the page cache
+- IVFVectorStore: A MemmapVectorStore with an inverted file index over k-means
+  clusters, for approximate search with a tunable nprobe
+- ScalarQuantizer, ProductQuantizer: Compact int8 and product-quantized codes
+  that both stores can search instead of float32 rows
+
+Usage:
+    from infrastructure.vector_store import IVFVectorStore, MemmapVectorStore
+
+    store = MemmapVectorStore("/var/lib/llm-vectors", dim=1536)
+
+    # Storing vectors with IDs and metadata
+    store.add(["doc-1", "doc-2"], [embedding_1, embedding_2], [{"title": "One"}, {"title": "Two"}])
+
+    # Finding the most similar vectors
+    for match in store.search(query_embedding, k=5):
+        print(match.id, match.score, match.metadata)
+
+    # Approximate search over large stores
+    store = IVFVectorStore("/var/lib/llm-vectors", dim=1536, nprobe=16)
+    store.train(n_lists=1024)
+    matches = store.search(query_embedding, k=5, nprobe=32)
+
+    # Searching int8 codes, re-ranking the best 4 * k with full precision
+    store = MemmapVectorStore("/var/lib/llm-vectors", dim=1536, quantization="int8", rerank=4)
+"""
+
+from .base import BaseVectorStore, VectorMatch
+from .mmap_store import MemmapVectorStore
+from .ivf_index import IVFVectorStore
+from .quantization import ProductQuantizer, Quantizer, ScalarQuantizer
+
+__all__ = ["BaseVectorStore", "VectorMatch", "MemmapVectorStore", "IVFVectorStore",
+           "Quantizer", "ScalarQuantizer", "ProductQuantizer"]
+
+# Version of the vector store module
+__version__ = "0.1.0"
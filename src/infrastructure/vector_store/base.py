@@ -0,0 +1,91 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+class VectorMatch(NamedTuple):
+    """
+    A search result.
+
+    Attributes:
+        id (str): The ID the vector was stored with.
+        score (float): The cosine similarity to the query.
+        metadata (Dict[str, Any]): The metadata the vector was stored with.
+    """
+
+    id: str
+    score: float
+    metadata: Dict[str, Any]
+
+class BaseVectorStore(ABC):
+    """
+    Abstract base class for vector stores.
+
+    A vector store keeps embedding vectors with an ID and metadata, and
+    answers nearest-neighbour queries by cosine similarity.
+
+    Attributes:
+        dim (int): The dimension of the stored vectors.
+
+    Methods:
+        add: Store vectors with their IDs and metadata.
+        search: Find the stored vectors most similar to a query vector.
+        train_if_due: Train the store's search index if it is due.
+        close: Release the resources held by the store.
+    """
+
+    dim: int
+
+    @abstractmethod
+    def add(self, ids: Sequence[str], vectors: Sequence[Sequence[float]],
+            metadata: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        """
+        Store vectors with their IDs and metadata.
+
+        Args:
+            ids (Sequence[str]): One ID per vector.
+            vectors (Sequence[Sequence[float]]): The vectors, each of dimension `dim`.
+            metadata (Optional[Sequence[Dict[str, Any]]]): One metadata dict per vector.
+
+        Returns:
+            int: The row number of the first stored vector.
+
+        Raises:
+            ValueError: If the number of IDs, vectors and metadata differ, or a vector has the wrong dimension.
+        """
+        pass
+
+    @abstractmethod
+    def search(self, query: Sequence[float], k: int = 10) -> List[VectorMatch]:
+        """
+        Find the stored vectors most similar to a query vector.
+
+        Args:
+            query (Sequence[float]): The query vector.
+            k (int): The number of results to return.
+
+        Returns:
+            List[VectorMatch]: Up to k matches, most similar first.
+        """
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        Return the number of stored vectors.
+        """
+        pass
+
+    def train_if_due(self) -> bool:
+        """
+        Train the store's search index if enough vectors have been added since it was last trained.
+        Stores without a trained index never need training.
+
+        Returns:
+            bool: Whether the index was trained.
+        """
+        return False
+
+    def close(self) -> None:
+        """
+        Release the resources held by the store.
+        """
+        pass
@@ -0,0 +1,323 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .base import VectorMatch
+from .mmap_store import MemmapVectorStore, VECTOR_DTYPE
+from .vector_ops import assign, kmeans, normalize, top_k
+
+LIST_DTYPE = "<i4"
+
+class IVFVectorStore(MemmapVectorStore):
+    """
+    A memory-mapped vector store with an inverted file (IVF) index.
+
+    The stored vectors are clustered with spherical k-means. A search scores
+    the `nprobe` closest clusters instead of every row, which trades recall
+    for speed: more probes find more of the exact nearest neighbours, fewer
+    probes answer faster.
+
+    The index is persisted next to the store files: `ivf.json` names the
+    current index generation, `ivf.<generation>.centroids.f32` holds the
+    centroids, and `ivf.<generation>.lists.i32` holds the cluster of every
+    indexed row. Inserts are incremental: `add` assigns new rows to their
+    closest cluster and appends them to the lists file. Rows that are not
+    yet in a process's in-memory lists, such as rows appended by another
+    process, are scored exhaustively, so new rows are found immediately.
+    The in-memory lists are rebuilt once `merge_threshold` assigned rows are
+    pending.
+
+    Candidates are scored with the store's quantized codes when quantization
+    is configured.
+
+    `add` never trains the index. It is trained by `train`, from the
+    `vector_index` CLI or a background task, and `train_if_due` trains it only
+    once the store holds `train_threshold` rows, or `retrain_growth` times as
+    many rows as the current generation was trained on. Until the first
+    generation lands searches are exact. Clustering runs without the write
+    lock, so inserts continue meanwhile; the lock is only held to assign the
+    rows added since and to publish the new generation, which other processes
+    pick up on their next search. Training and assignment use faiss when it is
+    installed.
+
+    Attributes:
+        path (str): The directory holding the store and index files.
+        dim (int): The dimension of the stored vectors.
+        n_lists (int): The number of clusters built by training. 0 picks about 4 * sqrt(rows).
+        nprobe (int): The default number of clusters scored per search.
+        train_threshold (int): Row count at which `train_if_due` first trains the index. 0 disables it.
+        retrain_growth (float): Growth factor of the row count since the last training at which
+            `train_if_due` retrains the index. 0 disables retraining.
+        merge_threshold (int): Number of pending assigned rows that triggers a rebuild of the in-memory lists.
+        quantization (str): Quantization of the candidate scoring, as for MemmapVectorStore.
+        pq_subspaces (int): The code size in bytes of product quantization, as for MemmapVectorStore.
+        rerank (int): Multiple of k re-scored with full precision, as for MemmapVectorStore.
+
+    Methods:
+        add: Append vectors and assign them to clusters.
+        search: Find approximately the most similar stored vectors, scoring `nprobe` clusters.
+        train: Cluster the stored vectors and index every row.
+        train_if_due: Train the index if the store has grown enough since it was last trained.
+        training_due: Whether the store has grown enough since the index was last trained.
+        trained: Whether the index has been trained.
+
+    Example:
+        >>> store = IVFVectorStore("/var/lib/llm-vectors", dim=1536, nprobe=16)
+        >>> store.train(n_lists=1024)
+        >>> store.search(query_embedding, k=5)
+        >>> store.search(query_embedding, k=5, nprobe=64)  # Higher recall, slower
+    """
+
+    INDEX_HEADER_FILE = "ivf.json"
+    TRAIN_LOCK_FILE = ".train.lock"
+
+    def __init__(self, path: str, dim: int, n_lists: int = 0, nprobe: int = 8,
+                 train_threshold: int = 100000, retrain_growth: float = 2.0, merge_threshold: int = 10000,
+                 quantization: str = "none", pq_subspaces: int = 0, rerank: int = 4):
+        super().__init__(path, dim, quantization=quantization, pq_subspaces=pq_subspaces, rerank=rerank)
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.retrain_growth = retrain_growth
+        self.merge_threshold = merge_threshold
+        open(self._file(self.TRAIN_LOCK_FILE), "ab").close()
+        self._header_stat: Optional[Tuple[int, int]] = None
+        self._generation: Optional[int] = None
+        self._trained_rows = 0
+        self._centroids: Optional["np.ndarray"] = None
+        self._order: Optional["np.ndarray"] = None
+        self._bounds: Optional["np.ndarray"] = None
+        self._listed = 0
+        self._index_lock = threading.Lock()
+
+    def _index_file(self, generation: int, kind: str) -> str:
+        return self._file(f"ivf.{generation}.{kind}")
+
+    @contextmanager
+    def _train_lock(self, blocking: bool = True) -> Iterator[bool]:
+        """
+        Serialize trainings across processes. Yields whether the lock was acquired.
+        """
+        with open(self._file(self.TRAIN_LOCK_FILE), "rb") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @property
+    def trained(self) -> bool:
+        """
+        Whether the index has been trained, by this or another process.
+        """
+        return self._load_index()[0] is not None
+
+    def _load_index(self) -> Tuple[Optional[int], Optional["np.ndarray"]]:
+        """
+        Reload the centroids if another generation has been written since they were loaded.
+        """
+        try:
+            stat = os.stat(self._file(self.INDEX_HEADER_FILE))
+        except FileNotFoundError:
+            return None, None
+        with self._index_lock:
+            if self._header_stat != (stat.st_mtime_ns, stat.st_size):
+                with open(self._file(self.INDEX_HEADER_FILE)) as f:
+                    header = json.load(f)
+                generation = header["generation"]
+                self._trained_rows = header["trained_rows"]
+                if generation != self._generation:
+                    centroids = np.fromfile(self._index_file(generation, "centroids.f32"), dtype=VECTOR_DTYPE)
+                    self._centroids = centroids.reshape(-1, self.dim)
+                    self._generation = generation
+                    self._order = self._bounds = None
+                    self._listed = 0
+                self._header_stat = (stat.st_mtime_ns, stat.st_size)
+            return self._generation, self._centroids
+
+    def _lists(self) -> Tuple[Optional["np.ndarray"], Optional["np.ndarray"], Optional["np.ndarray"], int]:
+        """
+        Return the centroids, the row numbers grouped by cluster, the start of each cluster's
+        group, and the number of rows covered. Rebuilt when enough rows have been assigned since.
+        """
+        while True:
+            generation, _ = self._load_index()
+            if generation is None:
+                return None, None, None, 0
+            lists_path = self._index_file(generation, "lists.i32")
+            with self._index_lock:
+                if generation != self._generation:
+                    continue
+                try:
+                    assigned = os.path.getsize(lists_path) // np.dtype(LIST_DTYPE).itemsize
+                    if self._order is None or assigned - self._listed >= self.merge_threshold:
+                        labels = np.fromfile(lists_path, dtype=LIST_DTYPE, count=assigned)
+                        self._order = np.argsort(labels, kind="stable")
+                        self._bounds = np.searchsorted(labels[self._order], np.arange(self._centroids.shape[0] + 1))
+                        self._listed = assigned
+                except FileNotFoundError:
+                    # Replaced by a retraining in another process since the header was read.
+                    self._header_stat = None
+                    continue
+                return self._centroids, self._order, self._bounds, self._listed
+
+    def add(self, ids: Sequence[str], vectors: Sequence[Sequence[float]],
+            metadata: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        matrix, lines = self._encode(ids, vectors, metadata)
+        with self._write_lock():
+            first_row = self._append(matrix, lines)
+            if self._load_index()[0] is not None:
+                self._assign_pending()
+        return first_row
+
+    def _assign_pending(self) -> None:
+        """
+        Assign rows that are not in the lists file yet. The caller holds the write lock.
+        """
+        generation, centroids = self._load_index()
+        lists_path = self._index_file(generation, "lists.i32")
+        assigned = os.path.getsize(lists_path) // np.dtype(LIST_DTYPE).itemsize
+        rows, vectors, _ = self._refresh()
+        if assigned < rows:
+            with open(lists_path, "ab") as f:
+                f.write(assign(vectors[assigned:rows], centroids).astype(LIST_DTYPE).tobytes())
+
+    def training_due(self) -> bool:
+        """
+        Whether the store holds `train_threshold` rows and the index is untrained, or it has grown
+        `retrain_growth` times since the index was last trained.
+        """
+        generation, _ = self._load_index()
+        rows = len(self)
+        if generation is None:
+            return bool(self.train_threshold) and rows >= self.train_threshold
+        return bool(self.retrain_growth) and rows >= self.retrain_growth * self._trained_rows
+
+    def train_if_due(self, sample_size: Optional[int] = None, iterations: int = 20, seed: int = 0) -> bool:
+        """
+        Train the index if `training_due`, unless another process is training it already.
+
+        Meant to be run from a background task after inserts; searches are unaffected until the
+        new generation lands.
+
+        Args:
+            sample_size (Optional[int]): The number of rows k-means is trained on, as for `train`.
+            iterations (int): The number of k-means iterations.
+            seed (int): Seed for sampling and the initial centroids.
+
+        Returns:
+            bool: Whether the index was trained.
+        """
+        with self._train_lock(blocking=False) as acquired:
+            if not acquired or not self.training_due():
+                return False
+            self._train(sample_size=sample_size, iterations=iterations, seed=seed)
+            return True
+
+    def train(self, n_lists: Optional[int] = None, sample_size: Optional[int] = None,
+              iterations: int = 20, seed: int = 0) -> int:
+        """
+        Cluster the stored vectors and index every row, replacing the current index.
+
+        Inserts continue while the vectors are clustered. Other processes keep searching the
+        previous generation, or exhaustively if there is none, until their next search after
+        the new generation lands.
+
+        Args:
+            n_lists (Optional[int]): The number of clusters. Defaults to `n_lists`, or about 4 * sqrt(rows).
+            sample_size (Optional[int]): The number of rows k-means is trained on. Defaults to 64 per cluster.
+            iterations (int): The number of k-means iterations.
+            seed (int): Seed for sampling and the initial centroids.
+
+        Returns:
+            int: The number of clusters.
+
+        Raises:
+            ValueError: If the store holds fewer rows than clusters.
+        """
+        with self._train_lock():
+            return self._train(n_lists, sample_size, iterations, seed)
+
+    def _train(self, n_lists: Optional[int] = None, sample_size: Optional[int] = None,
+               iterations: int = 20, seed: int = 0) -> int:
+        """
+        Train a new generation. The caller holds the training lock, but not the write lock.
+        """
+        rows, vectors, _ = self._refresh()
+        n_lists = n_lists or self.n_lists or max(1, int(4 * rows ** 0.5))
+        if rows < n_lists:
+            raise ValueError(f"Cannot train {n_lists} lists on {rows} vectors")
+        rng = np.random.default_rng(seed)
+        sample_size = min(rows, sample_size or 64 * n_lists)
+        sample = vectors[np.sort(rng.choice(rows, sample_size, replace=False))]
+        centroids = kmeans(sample, n_lists, iterations=iterations, seed=seed)
+
+        # Only one process trains at a time, so the next generation number is not taken meanwhile.
+        previous = self._load_index()[0]
+        generation = (previous or 0) + 1
+        centroids.astype(VECTOR_DTYPE).tofile(self._index_file(generation, "centroids.f32"))
+        lists_path = self._index_file(generation, "lists.i32")
+        with open(lists_path, "wb") as f:
+            f.write(assign(vectors[:rows], centroids).astype(LIST_DTYPE).tobytes())
+
+        with self._write_lock():
+            # Rows appended while clustering were assigned to the previous generation, if any.
+            appended, vectors, _ = self._refresh()
+            if appended > rows:
+                with open(lists_path, "ab") as f:
+                    f.write(assign(vectors[rows:appended], centroids).astype(LIST_DTYPE).tobytes())
+            # The header is replaced last, so readers only ever see a complete generation.
+            header_path = self._file(self.INDEX_HEADER_FILE)
+            temporary = f"{header_path}.{os.getpid()}.tmp"
+            with open(temporary, "w") as f:
+                json.dump({"generation": generation, "n_lists": n_lists, "trained_rows": rows}, f)
+            os.replace(temporary, header_path)
+        if previous is not None:
+            # Processes still mapping the previous generation keep their open copies.
+            for kind in ("centroids.f32", "lists.i32"):
+                os.remove(self._index_file(previous, kind))
+        return n_lists
+
+    def search(self, query: Sequence[float], k: int = 10, nprobe: Optional[int] = None) -> List[VectorMatch]:
+        """
+        Find approximately the most similar stored vectors.
+
+        Args:
+            query (Sequence[float]): The query vector.
+            k (int): The number of results to return.
+            nprobe (Optional[int]): The number of clusters scored. Defaults to `nprobe`.
+
+        Returns:
+            List[VectorMatch]: Up to k matches, most similar first. Exact until the index is trained.
+        """
+        centroids, order, bounds, listed = self._lists()
+        if centroids is None:
+            return super().search(query, k)
+        rows = len(self)
+        if not rows:
+            return []
+        probes = top_k(centroids @ normalize(query), nprobe or self.nprobe)[0]
+        candidates = np.concatenate(
+            [order[bounds[probe]:bounds[probe + 1]] for probe in probes] + [np.arange(min(listed, rows), rows)]
+        )
+        # Sorted, so that the memory map is read front to back.
+        return self._rank(query, k, np.sort(candidates[candidates < rows]))
+
+    def close(self) -> None:
+        with self._index_lock:
+            self._centroids = self._order = self._bounds = None
+            self._generation = self._header_stat = None
+            self._listed = 0
+        super().close()
@@ -0,0 +1,429 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .base import BaseVectorStore, VectorMatch
+from .quantization import QUANTIZERS, ProductQuantizer, Quantizer
+from .vector_ops import normalize, top_k
+
+FORMAT_VERSION = 1
+# Stored components are little-endian float32; index entries are (offset, length) pairs of little-endian int64.
+VECTOR_DTYPE = "<f4"
+INDEX_DTYPE = "<i8"
+# Rows encoded per step while building quantized codes, bounding temporary memory.
+ENCODE_CHUNK_ROWS = 65536
+
+class MemmapVectorStore(BaseVectorStore):
+    """
+    An append-only vector store in memory-mapped files.
+
+    Vectors are normalized and appended as float32 rows to `vectors.f32`.
+    Each row's ID and metadata are appended as a JSON line to
+    `metadata.jsonl`, and the line's offset and length to `metadata.idx`.
+    Searches map the files read-only and score every row with one NumPy
+    matrix-vector product. The files are shared through the page cache, so
+    several processes on one host can search the same store without each
+    holding a copy of the vectors.
+
+    Writers from any process are serialized with an exclusive lock on the
+    store directory's lock file. The index file is written last, so its
+    length is the number of complete rows. Readers pick up rows appended by
+    other processes on their next search. IDs are not deduplicated: adding
+    an ID again stores a second row.
+
+    With quantization, every row is also stored as a compact code (see
+    `quantization`), and searches score the codes instead of the float32
+    rows. The codes are a quarter ("int8") to a thirty-second ("pq") of the
+    size of the rows, so that much more of the store fits in the page cache.
+    The float32 rows stay on disk: the `rerank` * k best approximate matches
+    are re-scored with full precision, reading only those rows. Codes are
+    persisted as `quantizer.<generation>.codes`, named by `quantizer.json`.
+    int8 codes are written as rows are added. Product quantization must be
+    trained with `train_quantizer` first; until then, and for rows not yet
+    encoded, searches score the float32 rows.
+
+    Requires the optional `numpy` package.
+
+    Attributes:
+        path (str): The directory holding the store files.
+        dim (int): The dimension of the stored vectors.
+        quantization (str): "none", "int8" for scalar quantization, or "pq" for product quantization.
+        pq_subspaces (int): The code size in bytes of product quantization. 0 picks dim / 8.
+        rerank (int): Multiple of k re-scored with full precision after a quantized search. 0 disables it.
+
+    Methods:
+        add: Append vectors with their IDs and metadata.
+        search: Find the stored vectors with the highest cosine similarity to a query.
+        train_quantizer: Train the quantizer and encode every row.
+        quantizer: The quantizer whose codes are searched.
+        get_vectors: Map the stored vectors, one normalized row per vector.
+        get_match: Build the search result for a row.
+        close: Release the memory maps and file handles.
+
+    Example:
+        >>> store = MemmapVectorStore("/var/lib/llm-vectors", dim=1536)
+        >>> store.add(["doc-1"], [embedding], [{"title": "Hello"}])
+        >>> store.search(query_embedding, k=5)
+        [VectorMatch(id='doc-1', score=0.93, metadata={'title': 'Hello'})]
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    METADATA_FILE = "metadata.jsonl"
+    INDEX_FILE = "metadata.idx"
+    HEADER_FILE = "header.json"
+    LOCK_FILE = ".lock"
+    QUANTIZER_HEADER_FILE = "quantizer.json"
+
+    def __init__(self, path: str, dim: int, quantization: str = "none", pq_subspaces: int = 0,
+                 rerank: int = 4):
+        if np is None:
+            raise ImportError("The 'numpy' package is required for the memory-mapped vector store")
+        if quantization != "none" and quantization not in QUANTIZERS:
+            raise ValueError(f"Unknown vector quantization: {quantization}")
+        self.path = path
+        self.dim = dim
+        self.quantization = quantization
+        self.pq_subspaces = pq_subspaces
+        self.rerank = rerank
+        os.makedirs(path, exist_ok=True)
+        self._check_header()
+        for name in (self.VECTORS_FILE, self.METADATA_FILE, self.INDEX_FILE, self.LOCK_FILE):
+            open(self._file(name), "ab").close()
+        self._metadata_fd = os.open(self._file(self.METADATA_FILE), os.O_RDONLY)
+        self._rows = 0
+        self._vectors: Optional["np.ndarray"] = None
+        self._index: Optional["np.ndarray"] = None
+        self._map_lock = threading.Lock()
+        self._quantizer_stat: Optional[Tuple[int, int]] = None
+        self._quantizer_generation: Optional[int] = None
+        self._quantizer: Optional[Quantizer] = None
+        self._codes: Optional["np.ndarray"] = None
+        self._coded = 0
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _check_header(self) -> None:
+        header_path = self._file(self.HEADER_FILE)
+        if os.path.exists(header_path):
+            with open(header_path) as f:
+                header = json.load(f)
+            if header["dim"] != self.dim:
+                raise ValueError(f"Vector store at {self.path} holds {header['dim']}-dimensional vectors, not {self.dim}")
+            return
+        temporary = f"{header_path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"version": FORMAT_VERSION, "dim": self.dim, "dtype": VECTOR_DTYPE}, f)
+        os.replace(temporary, header_path)
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        with open(self._file(self.LOCK_FILE), "rb") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _refresh(self) -> Tuple[int, Optional["np.ndarray"], Optional["np.ndarray"]]:
+        rows = os.path.getsize(self._file(self.INDEX_FILE)) // (2 * np.dtype(INDEX_DTYPE).itemsize)
+        with self._map_lock:
+            if rows != self._rows:
+                # Remapped rather than grown in place: existing maps stay valid for concurrent searches.
+                self._vectors = np.memmap(self._file(self.VECTORS_FILE), dtype=VECTOR_DTYPE, mode="r",
+                                          shape=(rows, self.dim)) if rows else None
+                self._index = np.memmap(self._file(self.INDEX_FILE), dtype=INDEX_DTYPE, mode="r",
+                                        shape=(rows, 2)) if rows else None
+                self._rows = rows
+            return self._rows, self._vectors, self._index
+
+    def add(self, ids: Sequence[str], vectors: Sequence[Sequence[float]],
+            metadata: Optional[Sequence[Dict[str, Any]]] = None) -> int:
+        matrix, lines = self._encode(ids, vectors, metadata)
+        with self._write_lock():
+            return self._append(matrix, lines)
+
+    def _encode(self, ids: Sequence[str], vectors: Sequence[Sequence[float]],
+                metadata: Optional[Sequence[Dict[str, Any]]]) -> Tuple["np.ndarray", List[bytes]]:
+        """
+        Validate and normalize the vectors, and encode one metadata line per vector.
+        """
+        matrix = normalize(vectors)
+        if matrix.ndim != 2 or matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got shape {matrix.shape}")
+        metadata = metadata if metadata is not None else [{}] * len(ids)
+        if not len(ids) == len(metadata) == matrix.shape[0]:
+            raise ValueError("ids, vectors and metadata must have the same length")
+        lines = [json.dumps({"id": id, "metadata": meta}, separators=(",", ":")).encode("utf-8") + b"\n"
+                 for id, meta in zip(ids, metadata)]
+        return matrix, lines
+
+    def _append(self, matrix: "np.ndarray", lines: List[bytes]) -> int:
+        """
+        Append normalized rows and their encoded metadata lines. The caller holds the write lock.
+        """
+        index_path = self._file(self.INDEX_FILE)
+        first_row = os.path.getsize(index_path) // (2 * np.dtype(INDEX_DTYPE).itemsize)
+        metadata_end = 0
+        if first_row:
+            with open(index_path, "rb") as f:
+                f.seek((first_row - 1) * 2 * np.dtype(INDEX_DTYPE).itemsize)
+                offset, length = np.frombuffer(f.read(), dtype=INDEX_DTYPE)
+                metadata_end = int(offset + length)
+        # Drop partial rows left by a writer that died mid-append.
+        with open(self._file(self.VECTORS_FILE), "r+b") as f:
+            f.truncate(first_row * self.dim * np.dtype(VECTOR_DTYPE).itemsize)
+            f.seek(0, os.SEEK_END)
+            f.write(matrix.astype(VECTOR_DTYPE, copy=False).tobytes())
+        entries = np.empty((len(lines), 2), dtype=INDEX_DTYPE)
+        with open(self._file(self.METADATA_FILE), "r+b") as f:
+            f.truncate(metadata_end)
+            f.seek(metadata_end)
+            offset = metadata_end
+            for i, line in enumerate(lines):
+                entries[i] = (offset, len(line))
+                offset += len(line)
+            f.write(b"".join(lines))
+        with open(index_path, "ab") as f:
+            f.write(entries.tobytes())
+        if self.quantization != "none":
+            self._encode_pending()
+        return first_row
+
+    def _quantizer_file(self, generation: int, kind: str) -> str:
+        return self._file(f"quantizer.{generation}.{kind}")
+
+    @property
+    def quantizer(self) -> Optional[Quantizer]:
+        """
+        The quantizer whose codes are searched, or None until codes of the configured quantization exist.
+        """
+        return self._load_quantizer()[1]
+
+    def _load_quantizer(self) -> Tuple[Optional[int], Optional[Quantizer]]:
+        """
+        Reload the quantizer if another generation has been written since it was loaded.
+        Codes of another kind than `quantization` are ignored.
+        """
+        if self.quantization == "none":
+            return None, None
+        try:
+            stat = os.stat(self._file(self.QUANTIZER_HEADER_FILE))
+        except FileNotFoundError:
+            return None, None
+        with self._map_lock:
+            if self._quantizer_stat != (stat.st_mtime_ns, stat.st_size):
+                with open(self._file(self.QUANTIZER_HEADER_FILE)) as f:
+                    header = json.load(f)
+                if header["kind"] != self.quantization:
+                    self._quantizer_generation = self._quantizer = self._codes = None
+                elif header["generation"] != self._quantizer_generation:
+                    if header["kind"] == ProductQuantizer.name:
+                        quantizer = ProductQuantizer(self.dim, header["subspaces"])
+                        codebooks = np.fromfile(self._quantizer_file(header["generation"], "codebooks.f32"),
+                                                dtype=VECTOR_DTYPE)
+                        quantizer.codebooks = codebooks.reshape(quantizer.subspaces, quantizer.CENTROIDS, -1)
+                    else:
+                        quantizer = QUANTIZERS[header["kind"]](self.dim)
+                    self._quantizer_generation = header["generation"]
+                    self._quantizer = quantizer
+                    self._codes = None
+                    self._coded = 0
+                self._quantizer_stat = (stat.st_mtime_ns, stat.st_size)
+            return self._quantizer_generation, self._quantizer
+
+    def _load_codes(self, rows: int) -> Tuple[Optional[Quantizer], Optional["np.ndarray"], int]:
+        """
+        Return the quantizer, the mapped codes and the number of leading rows they cover.
+        """
+        while True:
+            generation, quantizer = self._load_quantizer()
+            if generation is None:
+                return None, None, 0
+            try:
+                coded = os.path.getsize(self._quantizer_file(generation, "codes")) // quantizer.code_size
+            except FileNotFoundError:
+                # Replaced by a retraining in another process since the header was read.
+                self._quantizer_stat = None
+                continue
+            coded = min(coded, rows)
+            with self._map_lock:
+                if generation != self._quantizer_generation:
+                    continue
+                if coded != self._coded:
+                    self._codes = np.memmap(self._quantizer_file(generation, "codes"), dtype=np.uint8, mode="r",
+                                            shape=(coded, quantizer.code_size)) if coded else None
+                    self._coded = coded
+                return self._quantizer, self._codes, self._coded
+
+    def _encode_pending(self) -> None:
+        """
+        Encode rows that have no code yet. The caller holds the write lock.
+        """
+        generation, quantizer = self._load_quantizer()
+        if generation is None:
+            # int8 codes need no training, so they are started with the first added rows.
+            if not QUANTIZERS[self.quantization].requires_training:
+                self._train_quantizer()
+            return
+        codes_path = self._quantizer_file(generation, "codes")
+        coded = os.path.getsize(codes_path) // quantizer.code_size
+        rows, vectors, _ = self._refresh()
+        with open(codes_path, "r+b") as f:
+            # Drop a partial code left by a writer that died mid-append.
+            f.truncate(coded * quantizer.code_size)
+            f.seek(0, os.SEEK_END)
+            for start in range(coded, rows, ENCODE_CHUNK_ROWS):
+                f.write(quantizer.encode(vectors[start:min(rows, start + ENCODE_CHUNK_ROWS)]).tobytes())
+
+    def train_quantizer(self, sample_size: Optional[int] = None, iterations: int = 10, seed: int = 0) -> int:
+        """
+        Train the quantizer on the stored vectors and encode every row, replacing existing codes.
+
+        Other processes keep searching the previous codes until their next search.
+
+        Args:
+            sample_size (Optional[int]): The number of rows product quantization is trained on.
+                Defaults to 64 per centroid.
+            iterations (int): The number of k-means iterations of product quantization.
+            seed (int): Seed for sampling and the initial centroids.
+
+        Returns:
+            int: The number of encoded rows.
+
+        Raises:
+            ValueError: If the store has no quantization, or too few rows to train on.
+        """
+        if self.quantization == "none":
+            raise ValueError("The vector store is not configured with a quantization")
+        with self._write_lock():
+            return self._train_quantizer(sample_size, iterations, seed)
+
+    def _train_quantizer(self, sample_size: Optional[int] = None, iterations: int = 10, seed: int = 0) -> int:
+        rows, vectors, _ = self._refresh()
+        if self.quantization == ProductQuantizer.name:
+            quantizer = ProductQuantizer(self.dim, self.pq_subspaces)
+            if rows < quantizer.CENTROIDS:
+                raise ValueError(f"Cannot train a product quantizer on {rows} vectors")
+            rng = np.random.default_rng(seed)
+            sample_size = min(rows, sample_size or 64 * quantizer.CENTROIDS)
+            sample = vectors[np.sort(rng.choice(rows, sample_size, replace=False))]
+            quantizer.train(sample, iterations=iterations, seed=seed)
+        else:
+            quantizer = QUANTIZERS[self.quantization](self.dim)
+
+        # The header may describe codes of another kind, written by a differently configured store.
+        try:
+            with open(self._file(self.QUANTIZER_HEADER_FILE)) as f:
+                previous = json.load(f)["generation"]
+        except FileNotFoundError:
+            previous = None
+        generation = (previous or 0) + 1
+        header = {"kind": quantizer.name, "generation": generation}
+        if isinstance(quantizer, ProductQuantizer):
+            quantizer.codebooks.astype(VECTOR_DTYPE).tofile(self._quantizer_file(generation, "codebooks.f32"))
+            header["subspaces"] = quantizer.subspaces
+        with open(self._quantizer_file(generation, "codes"), "wb") as f:
+            for start in range(0, rows, ENCODE_CHUNK_ROWS):
+                f.write(quantizer.encode(vectors[start:start + ENCODE_CHUNK_ROWS]).tobytes())
+        # The header is replaced last, so readers only ever see a complete generation.
+        header_path = self._file(self.QUANTIZER_HEADER_FILE)
+        temporary = f"{header_path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(header, f)
+        os.replace(temporary, header_path)
+        if previous is not None:
+            for name in os.listdir(self.path):
+                if name.startswith(f"quantizer.{previous}."):
+                    os.remove(self._file(name))
+        return rows
+
+    def search(self, query: Sequence[float], k: int = 10) -> List[VectorMatch]:
+        return self._rank(query, k)
+
+    def _rank(self, query: Sequence[float], k: int,
+              candidates: Optional["np.ndarray"] = None) -> List[VectorMatch]:
+        """
+        Score rows against a query and return the top k, with quantized scores
+        where codes exist and full-precision re-ranking of the best of them.
+
+        Args:
+            query (Sequence[float]): The query vector.
+            k (int): The number of results to return.
+            candidates (Optional[np.ndarray]): Sorted row numbers to score. All rows when None.
+
+        Returns:
+            List[VectorMatch]: Up to k matches, most similar first.
+        """
+        rows, vectors, _ = self._refresh()
+        if not rows:
+            return []
+        query = normalize(query)
+        quantizer, codes, coded = self._load_codes(rows)
+        if candidates is None:
+            if coded:
+                scores = np.concatenate((quantizer.score(codes, query), vectors[coded:rows] @ query))
+            else:
+                scores = vectors @ query
+        else:
+            scores = np.empty(candidates.shape[0], dtype=np.float32)
+            quantized = candidates < coded
+            if coded:
+                scores[quantized] = quantizer.score(codes[candidates[quantized]], query)
+            scores[~quantized] = vectors[candidates[~quantized]] @ query
+
+        if coded and self.rerank:
+            positions, _ = top_k(scores, k * self.rerank)
+            shortlist = np.sort(positions if candidates is None else candidates[positions])
+            positions, values = top_k(vectors[shortlist] @ query, k)
+            found = shortlist[positions]
+        else:
+            positions, values = top_k(scores, k)
+            found = positions if candidates is None else candidates[positions]
+        return [self.get_match(int(row), float(score)) for row, score in zip(found, values)]
+
+    def get_vectors(self) -> Optional["np.ndarray"]:
+        """
+        Map the stored vectors.
+
+        Returns:
+            Optional[np.ndarray]: A read-only (rows, dim) float32 array of normalized vectors,
+                or None if the store is empty.
+        """
+        return self._refresh()[1]
+
+    def get_match(self, row: int, score: float) -> VectorMatch:
+        """
+        Build the search result for a row, reading its ID and metadata.
+
+        Args:
+            row (int): The row number.
+            score (float): The row's similarity to the query.
+
+        Returns:
+            VectorMatch: The search result.
+        """
+        _, _, index = self._refresh()
+        offset, length = index[row]
+        record = json.loads(os.pread(self._metadata_fd, int(length), int(offset)))
+        return VectorMatch(record["id"], score, record["metadata"])
+
+    def __len__(self) -> int:
+        return self._refresh()[0]
+
+    def close(self) -> None:
+        with self._map_lock:
+            self._vectors = self._index = None
+            self._rows = 0
+            self._quantizer = self._codes = None
+            self._quantizer_generation = self._quantizer_stat = None
+            self._coded = 0
+        os.close(self._metadata_fd)
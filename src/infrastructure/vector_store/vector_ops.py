@@ -0,0 +1,112 @@
+from typing import Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    import faiss
+except ImportError:  # pragma: no cover - optional dependency
+    faiss = None
+
+# Rows scored per matrix product while assigning vectors to centroids, bounding temporary memory.
+ASSIGN_CHUNK_ROWS = 65536
+
+def normalize(vectors: "np.ndarray") -> "np.ndarray":
+    """
+    Scale vectors to unit length, so that cosine similarity is a dot product.
+
+    Args:
+        vectors (np.ndarray): A 1-D vector or a 2-D array with one vector per row.
+
+    Returns:
+        np.ndarray: The normalized float32 vectors. Zero vectors are left as zeros.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+def top_k(scores: "np.ndarray", k: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Select the k highest scores without sorting the whole array.
+
+    Args:
+        scores (np.ndarray): A 1-D array of scores.
+        k (int): The number of scores to select.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The positions and values of the top scores, highest first.
+    """
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return order, scores[order]
+
+def kmeans(vectors: "np.ndarray", n_clusters: int, iterations: int = 20, seed: int = 0,
+           spherical: bool = True) -> "np.ndarray":
+    """
+    Cluster vectors with k-means.
+
+    Uses faiss when it is installed, and NumPy otherwise. Clusters that
+    become empty are reseeded with random vectors.
+
+    Args:
+        vectors (np.ndarray): A (rows, dim) float32 array. Normalized when `spherical` is set.
+        n_clusters (int): The number of clusters.
+        iterations (int): The number of refinement iterations.
+        seed (int): Seed for the initial centroids.
+        spherical (bool): Whether to cluster by cosine similarity, with unit-length centroids,
+            instead of by Euclidean distance.
+
+    Returns:
+        np.ndarray: A (n_clusters, dim) float32 array of centroids.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if faiss is not None:
+        clustering = faiss.Kmeans(vectors.shape[1], n_clusters, niter=iterations, spherical=spherical, seed=seed)
+        clustering.train(vectors)
+        return normalize(clustering.centroids) if spherical else clustering.centroids
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(vectors.shape[0], n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        labels = assign(vectors, centroids, spherical=spherical)
+        order = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=n_clusters)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        centroids[filled] = np.add.reduceat(vectors[order], starts, axis=0)
+        if not spherical:
+            centroids[filled] /= counts[filled, None]
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            centroids[empty] = vectors[rng.choice(vectors.shape[0], empty.size, replace=False)]
+        if spherical:
+            centroids = normalize(centroids)
+    return centroids
+
+def assign(vectors: "np.ndarray", centroids: "np.ndarray", spherical: bool = True) -> "np.ndarray":
+    """
+    Assign each vector to its closest centroid.
+
+    Args:
+        vectors (np.ndarray): A (rows, dim) array of vectors.
+        centroids (np.ndarray): A (n_clusters, dim) array of centroids.
+        spherical (bool): Whether closest means the highest dot product, as for unit vectors,
+            instead of the smallest Euclidean distance.
+
+    Returns:
+        np.ndarray: The int32 centroid number of each vector.
+    """
+    # argmin |x - c|^2 is argmax x.c - |c|^2 / 2, since |x|^2 is the same for every centroid.
+    offsets = 0.0 if spherical else 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+    labels = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], ASSIGN_CHUNK_ROWS):
+        chunk = np.asarray(vectors[start:start + ASSIGN_CHUNK_ROWS], dtype=np.float32)
+        labels[start:start + chunk.shape[0]] = np.argmax(chunk @ centroids.T - offsets, axis=1)
+    return labels
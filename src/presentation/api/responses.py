@@ -0,0 +1,36 @@
+import json
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when installed.
+
+    Routes return it directly for payloads the service built itself, which
+    also makes FastAPI skip re-validating them against the route's
+    response_model. The response_model is still declared for the OpenAPI
+    schema. Without orjson, compact stdlib JSON is used.
+
+    Pydantic models may be passed as content directly. Their field values
+    are serialized straight from the instance, without first copying them
+    into a dict with .dict().
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_model_fields)
+        return json.dumps(content, default=_model_fields, ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":")).encode("utf-8")
+
+def _model_fields(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        # Pydantic keeps field values in the instance __dict__.
+        return value.__dict__
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
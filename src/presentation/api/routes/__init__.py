@@ -7,18 +7,30 @@ summarization, and other NLP tasks.
 
 Components:
 - llm_router: Router containing all LLM-related API endpoints
+- metrics_router: Router exposing Prometheus metrics at /metrics
+- profiling_router: Admin endpoints for on-demand request profiling
+- job_router: Submit, poll and fetch asynchronous LLM jobs processed by workers
+- embedding_router: Create and store embeddings, and search stored embeddings by similarity
 
 Usage:
     from fastapi import FastAPI
-    from presentation.api.routes import llm_router
+    from presentation.api.routes import embedding_router, job_router, llm_router, metrics_router, profiling_router
 
     app = FastAPI()
     app.include_router(llm_router, prefix="/api/llm", tags=["LLM"])
+    app.include_router(metrics_router)
+    app.include_router(profiling_router)
+    app.include_router(job_router, prefix="/api", tags=["Jobs"])
+    app.include_router(embedding_router, prefix="/api", tags=["Embeddings"])
 """
 
 from .llm_routes import router as llm_router
+from .metrics_routes import router as metrics_router
+from .profiling_routes import router as profiling_router
+from .job_routes import router as job_router
+from .embedding_routes import router as embedding_router
 
-__all__ = ["llm_router"]
+__all__ = ["llm_router", "metrics_router", "profiling_router", "job_router", "embedding_router"]
 
 # Version of the routes module
 __version__ = "0.1.0"
\ No newline at end of file
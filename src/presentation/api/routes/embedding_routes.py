@@ -0,0 +1,80 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field, validator
+
+from application.services.embedding_service import EmbeddingService
+from core.dependencies import get_embedding_service
+from core.cross_cutting import log_error
+from core.metrics import track_in_flight
+from presentation.api.responses import FastJSONResponse
+
+router = APIRouter()
+
+class EmbeddingRequest(BaseModel):
+    """Request model for creating, and optionally storing, embeddings"""
+    input: List[str] = Field(..., min_items=1, max_items=100)
+    store: bool = False
+    ids: Optional[List[str]] = None
+    metadata: Optional[List[Dict[str, Any]]] = None
+
+    @validator("ids", "metadata")
+    def match_input(cls, value, values):
+        if value is not None and "input" in values and len(value) != len(values["input"]):
+            raise ValueError("must have one entry per input")
+        return value
+
+class SearchRequest(BaseModel):
+    """Request model for similarity search over stored embeddings"""
+    query: str
+    k: int = Field(10, ge=1, le=100)
+
+class SearchMatch(BaseModel):
+    """A stored embedding matching a search query"""
+    id: str
+    score: float
+    metadata: Dict[str, Any]
+
+class SearchResponse(BaseModel):
+    """Response model for similarity search"""
+    matches: List[SearchMatch]
+
+@router.post("/embeddings")
+async def create_embeddings(
+    request: EmbeddingRequest,
+    service: EmbeddingService = Depends(get_embedding_service)
+) -> FastJSONResponse:
+    """Create embeddings for the input texts. With store=true they are also added to the vector store."""
+    try:
+        with track_in_flight("/embeddings"):
+            if request.store:
+                vectors = await service.add(request.input, ids=request.ids, metadata=request.metadata)
+            else:
+                vectors = await service.embed(request.input)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        log_error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+    return FastJSONResponse(content={
+        "object": "list",
+        "model": service.model_name,
+        "data": [
+            {"object": "embedding", "index": index, "embedding": vector}
+            for index, vector in enumerate(vectors)
+        ]
+    })
+
+@router.post("/search", response_model=SearchResponse)
+async def search_embeddings(
+    request: SearchRequest,
+    service: EmbeddingService = Depends(get_embedding_service)
+) -> FastJSONResponse:
+    """Return the k stored embeddings most similar to the query text, by cosine similarity."""
+    try:
+        with track_in_flight("/search"):
+            matches = await service.search(request.query, k=request.k)
+    except Exception as e:
+        log_error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+    return FastJSONResponse(content={"matches": [match._asdict() for match in matches]})
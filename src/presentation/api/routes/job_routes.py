@@ -0,0 +1,110 @@
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from domain.job import Job, JobStatus
+from domain.llm_response import LLMResponse
+from core.cross_cutting import log_error
+from core.dependencies import get_job_queue
+from core.exceptions import JobQueueFullError
+from infrastructure.queue.base import BaseJobQueue
+from presentation.api.responses import FastJSONResponse
+from .llm_routes import GenerateTextRequest, SummarizeTextRequest
+
+router = APIRouter()
+
+# Seconds clients are asked to wait before polling again or resubmitting.
+RETRY_AFTER = "2"
+
+class JobStatusResponse(BaseModel):
+    """Response model for the state of an asynchronous job"""
+    id: str
+    request_type: str
+    status: JobStatus
+    attempts: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+@router.post("/jobs/generate", status_code=202)
+async def submit_generate_job(
+    request: GenerateTextRequest,
+    http_request: Request,
+    queue: BaseJobQueue = Depends(get_job_queue)
+) -> JSONResponse:
+    """Queue a text generation job. Poll /jobs/{job_id} and fetch /jobs/{job_id}/result."""
+    return await _submit(http_request, queue, Job(
+        request_type="generate",
+        input_text=request.prompt,
+        params={
+            "max_tokens": request.max_tokens,
+            "temperature": request.temperature,
+            "top_p": request.top_p,
+            "n": request.n
+        }
+    ))
+
+@router.post("/jobs/summarize", status_code=202)
+async def submit_summarize_job(
+    request: SummarizeTextRequest,
+    http_request: Request,
+    queue: BaseJobQueue = Depends(get_job_queue)
+) -> JSONResponse:
+    """Queue a text summarization job. Poll /jobs/{job_id} and fetch /jobs/{job_id}/result."""
+    return await _submit(http_request, queue, Job(
+        request_type="summarize",
+        input_text=request.text,
+        params={
+            "max_length": request.max_length,
+            "max_tokens": request.max_length * 2,
+            "temperature": 0.7
+        }
+    ))
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str, queue: BaseJobQueue = Depends(get_job_queue)) -> JobStatusResponse:
+    """Return the state of a job."""
+    job = await _get_job(queue, job_id)
+    return JobStatusResponse(**job.dict(exclude={"input_text", "params", "result"}))
+
+@router.get("/jobs/{job_id}/result", response_model=LLMResponse,
+            responses={202: {"description": "The job has not finished yet"}})
+async def get_job_result(job_id: str, queue: BaseJobQueue = Depends(get_job_queue)) -> JSONResponse:
+    """Return the response of a succeeded job, or 202 while it is queued or running."""
+    job = await _get_job(queue, job_id)
+    if not job.status.finished:
+        return JSONResponse({"id": job.id, "status": job.status.value}, status_code=202,
+                            headers={"Retry-After": RETRY_AFTER})
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    return FastJSONResponse(content=job.result)
+
+async def _submit(request: Request, queue: BaseJobQueue, job: Job) -> JSONResponse:
+    try:
+        await queue.submit(job)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message, headers={"Retry-After": RETRY_AFTER})
+    except Exception as e:
+        log_error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+    status_url = str(request.url_for("get_job", job_id=job.id))
+    content: Dict[str, Any] = {
+        "id": job.id,
+        "status": job.status.value,
+        "status_url": status_url,
+        "result_url": str(request.url_for("get_job_result", job_id=job.id))
+    }
+    return JSONResponse(content, status_code=202, headers={"Location": status_url})
+
+async def _get_job(queue: BaseJobQueue, job_id: str) -> Job:
+    try:
+        job = await queue.get(job_id)
+    except Exception as e:
+        log_error(e)
+        raise HTTPException(status_code=500, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -1,68 +1,126 @@
+import json
 from fastapi import APIRouter, Depends, HTTPException
-from typing import Dict, Any
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, Optional
+from pydantic import BaseModel, Field
 
 from application.services.llm_orchestrator import LLMOrchestrator
-from domain.llm_request import LLMRequest
 from domain.llm_response import LLMResponse
 from core.dependencies import get_llm_orchestrator
 from core.cross_cutting import log_error, process_request
+from core.metrics import track_in_flight
+from core.profiling import current_profile_id
+from presentation.api.responses import FastJSONResponse
+from .profiling_routes import profile_opt_in
 
 router = APIRouter()
 
 class GenerateTextRequest(BaseModel):
     """Request model for text generation"""
     prompt: str
-    max_tokens: int = 100
-    temperature: float = 0.7
-    top_p: float = 1.0
-    n: int = 1
+    max_tokens: int = Field(100, ge=1)
+    temperature: float = Field(0.7, ge=0, le=1)
+    top_p: float = Field(1.0, ge=0, le=1)
+    n: int = Field(1, ge=1, le=10)
 
 class SummarizeTextRequest(BaseModel):
     """Request model for text summarization"""
     text: str
-    max_length: int = 100
+    max_length: int = Field(100, ge=1)
 
-@router.post("/generate", response_model=LLMResponse)
+@router.post("/generate", response_model=LLMResponse, dependencies=[Depends(profile_opt_in)])
 async def generate_text(
     request: GenerateTextRequest,
     orchestrator: LLMOrchestrator = Depends(get_llm_orchestrator)
-) -> LLMResponse:
+) -> FastJSONResponse:
     """Generate text based on the given prompt."""
     try:
-        llm_request = LLMRequest(
-            prompt=request.prompt,
-            max_tokens=request.max_tokens,
-            temperature=request.temperature,
-            top_p=request.top_p,
-            n=request.n
-        )
-        response = await process_request(orchestrator.process_request("generate", llm_request))
-        return response
+        with track_in_flight("/generate"):
+            result = await process_request(orchestrator.process_request(
+                "generate",
+                request.prompt,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+                top_p=request.top_p,
+                n=request.n
+            ))
+        return _json_response(result)
     except Exception as e:
         log_error(e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/summarize", response_model=LLMResponse)
+@router.post("/summarize", response_model=LLMResponse, dependencies=[Depends(profile_opt_in)])
 async def summarize_text(
     request: SummarizeTextRequest,
     orchestrator: LLMOrchestrator = Depends(get_llm_orchestrator)
-) -> LLMResponse:
+) -> FastJSONResponse:
     """Summarize the given text."""
     try:
-        llm_request = LLMRequest(
-            prompt=f"Summarize the following text in no more than {request.max_length} words:\n\n{request.text}",
-            max_tokens=request.max_length * 2,
-            temperature=0.7,
-            top_p=1.0,
-            n=1
-        )
-        response = await process_request(orchestrator.process_request("summarize", llm_request))
-        return response
+        with track_in_flight("/summarize"):
+            result = await process_request(orchestrator.process_request(
+                "summarize",
+                request.text,
+                max_length=request.max_length,
+                max_tokens=request.max_length * 2,
+                temperature=0.7
+            ))
+        return _json_response(result)
     except Exception as e:
         log_error(e)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate/stream")
+async def generate_text_stream(
+    request: GenerateTextRequest,
+    orchestrator: LLMOrchestrator = Depends(get_llm_orchestrator)
+) -> StreamingResponse:
+    """
+    Generate text based on the given prompt, streaming chunks as they are produced.
+
+    The response is a server-sent event stream. Each chunk is sent as a
+    `data: {"text": ...}` event. The stream ends with a `done` event, or with
+    an `error` event carrying the error message if generation failed after
+    the response started, so clients can tell a complete stream from a
+    truncated one. Only one choice can be streamed, so `n` must be 1.
+    """
+    if request.n > 1:
+        raise HTTPException(status_code=400, detail="Only one choice can be streamed; n must be 1")
+
+    async def body():
+        with track_in_flight("/generate/stream"):
+            try:
+                async for chunk in orchestrator.stream_request(
+                    "generate",
+                    request.prompt,
+                    max_tokens=request.max_tokens,
+                    temperature=request.temperature,
+                    top_p=request.top_p
+                ):
+                    yield _sse_event({"text": chunk})
+            except Exception as e:
+                # Headers are already sent, so the error is reported in the stream.
+                log_error(e)
+                yield _sse_event({"error": str(e)}, event="error")
+            else:
+                yield _sse_event({}, event="done")
+
+    return StreamingResponse(body(), media_type="text/event-stream")
+
+def _sse_event(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    if event is None:
+        return f"data: {payload}\n\n"
+    return f"event: {event}\ndata: {payload}\n\n"
+
+def _json_response(result: LLMResponse) -> FastJSONResponse:
+    # The orchestrator's responses are trusted; returning a Response skips
+    # FastAPI's re-validation against response_model.
+    response = FastJSONResponse(content=result)
+    profile_id = current_profile_id.get()
+    if profile_id is not None:
+        response.headers["X-Profile-Id"] = profile_id
+    return response
+
 @router.get("/models", response_model=Dict[str, Any])
 async def list_models(
     orchestrator: LLMOrchestrator = Depends(get_llm_orchestrator)
@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+
+from core.metrics import CONTENT_TYPE_LATEST, render_metrics
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Expose Prometheus metrics."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
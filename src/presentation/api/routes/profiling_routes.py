@@ -0,0 +1,40 @@
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from core.profiling import profile_requested, profiler
+
+router = APIRouter()
+
+async def profile_opt_in(x_profile_token: Optional[str] = Header(None)) -> None:
+    """Profile the current request if it carries a valid X-Profile-Token header."""
+    if x_profile_token is not None and profiler.authorize(x_profile_token):
+        profile_requested.set(True)
+
+async def require_profiling_token(x_profile_token: Optional[str] = Header(None)) -> None:
+    """Reject admin profiling calls without a valid X-Profile-Token header."""
+    if not profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not profiler.authorize(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+@router.post("/admin/profiling/arm", include_in_schema=False, dependencies=[Depends(require_profiling_token)])
+async def arm_profiler(count: int = Query(1, ge=0, le=1000)) -> Dict[str, int]:
+    """Profile the next `count` requests served by the orchestrator."""
+    profiler.arm(count)
+    return {"armed": count}
+
+@router.get("/admin/profiling", include_in_schema=False, dependencies=[Depends(require_profiling_token)])
+async def list_profiles() -> List[Dict[str, Any]]:
+    """List recorded profiles, newest first."""
+    return profiler.list_profiles()
+
+@router.get("/admin/profiling/{profile_id}", include_in_schema=False, response_class=PlainTextResponse,
+            dependencies=[Depends(require_profiling_token)])
+async def get_profile(profile_id: str) -> str:
+    """Return a recorded profile as folded stacks, ready for flamegraph.pl or speedscope."""
+    folded = profiler.get_profile(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return folded
@@ -0,0 +1,22 @@
+"""
+CLI Module
+
+This module contains command-line interfaces to the LLM-powered microservice,
+for work that runs outside the HTTP API.
+
+Components:
+- BulkRunner: Streams a JSONL file of requests through the LLMOrchestrator with checkpoint/resume
+- RateLimiter: An asyncio token bucket limiting requests or tokens per second
+- vector_index: Trains or retrains the IVF index or the quantizer of the vector store
+
+Usage:
+    cd src && python -m presentation.cli.bulk prompts.jsonl results.jsonl --concurrency 32 --rate 20
+    cd src && python -m presentation.cli.vector_index --lists 4096
+"""
+
+from .bulk import BulkRunner, RateLimiter
+
+__all__ = ["BulkRunner", "RateLimiter"]
+
+# Version of the CLI module
+__version__ = "0.1.0"
@@ -0,0 +1,428 @@
+"""
+Bulk Processing CLI
+
+Streams a JSONL file of requests through the LLMOrchestrator and appends
+one JSON result per line to an output file. Input is read incrementally and
+at most `--window` lines are held at a time, so memory use does not depend
+on the size of the file.
+
+Each input line is a JSON object. The text to process is read from
+`--text-field` and the item ID from `--id-field`. The optional
+"request_type" and "params" fields override `--request-type` and the
+generation parameters for that line. Each output line holds the input
+line number and ID with either the response or the error.
+
+Progress is saved to a checkpoint file. Rerunning the same command resumes
+after the last checkpoint. Items that completed before it are not
+processed again, and output written after it is discarded and redone.
+SIGINT and SIGTERM stop reading input, finish the items in progress and
+save a final checkpoint, so a resumed run repeats nothing.
+
+Usage:
+    cd src && python -m presentation.cli.bulk prompts.jsonl results.jsonl --concurrency 32 --rate 20
+    cd src && python -m presentation.cli.bulk requests.jsonl out.jsonl --id-field request_id --text-field body
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import sys
+import time
+from typing import Any, Dict, IO, List, Optional, Set, Tuple
+
+from application.services.llm_orchestrator import LLMOrchestrator
+
+class RateLimiter:
+    """
+    An asyncio token bucket.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        burst (float): Maximum number of tokens the bucket holds.
+
+    Methods:
+        acquire: Wait until enough tokens are available, then take them.
+        consume: Take tokens without waiting, e.g. to charge usage known only after a call.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """
+        Wait until `amount` tokens are available, then take them.
+
+        With amount 0, waits until the bucket is no longer in debt.
+
+        Args:
+            amount (float): The number of tokens to take. Capped at `burst`.
+        """
+        async with self._lock:
+            needed = min(amount, self.burst)
+            while True:
+                self._refill()
+                if self._tokens >= needed and self._tokens >= 0:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((max(needed, 0.0) - self._tokens) / self.rate)
+
+    def consume(self, amount: float) -> None:
+        """
+        Take tokens without waiting. The bucket may go into debt.
+
+        Args:
+            amount (float): The number of tokens to take.
+        """
+        self._refill()
+        self._tokens -= amount
+
+class BulkRunner:
+    """
+    Processes a JSONL file of requests with bounded concurrency and resumable progress.
+
+    Lines are read in order and dispatched as soon as a concurrency slot is
+    free, so items complete out of order. The checkpoint records the byte
+    offset of the earliest line not yet completed (the low watermark), the
+    lines after it that have completed, and the size of the output file.
+    Reading pauses while the newest line is `window` lines ahead of the
+    watermark, which bounds memory use and the size of the checkpoint.
+
+    Attributes:
+        orchestrator (LLMOrchestrator): The orchestrator that processes each item.
+        input_path (str): The JSONL input file.
+        output_path (str): The JSONL output file. Truncated unless resuming.
+        checkpoint_path (str): The checkpoint file. Defaults to the output path with ".checkpoint" appended.
+        request_type (str): The request type of lines without a "request_type" field.
+        params (Dict[str, Any]): Parameters passed to the orchestrator, overridden by a line's "params" field.
+        id_field (str): The field holding the item ID. The line number is used when it is missing.
+        text_field (str): The field holding the input text.
+        concurrency (int): Maximum number of items processed at once.
+        window (int): Maximum distance in lines between the watermark and the newest line read.
+        retries (int): Number of times a failed item is retried, with exponential backoff.
+        request_limiter (Optional[RateLimiter]): Limits requests per second.
+        token_limiter (Optional[RateLimiter]): Limits tokens per second, charged with the usage of each response.
+        checkpoint_interval (float): Seconds between checkpoints.
+        report_interval (float): Seconds between progress reports.
+
+    Methods:
+        run: Process the input until it is exhausted or stop is called.
+        stop: Stop reading input; run returns once the items in progress are written.
+    """
+
+    def __init__(self, orchestrator: LLMOrchestrator, input_path: str, output_path: str,
+                 checkpoint_path: Optional[str] = None, request_type: str = "generate",
+                 params: Optional[Dict[str, Any]] = None, id_field: str = "id", text_field: str = "prompt",
+                 concurrency: int = 16, window: int = 1000, retries: int = 2,
+                 request_limiter: Optional[RateLimiter] = None, token_limiter: Optional[RateLimiter] = None,
+                 checkpoint_interval: float = 5.0, report_interval: float = 10.0, report_stream: IO[str] = sys.stderr):
+        self.orchestrator = orchestrator
+        self.input_path = input_path
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+        self.request_type = request_type
+        self.params = params or {}
+        self.id_field = id_field
+        self.text_field = text_field
+        self.concurrency = concurrency
+        self.window = window
+        self.retries = retries
+        self.request_limiter = request_limiter
+        self.token_limiter = token_limiter
+        self.checkpoint_interval = checkpoint_interval
+        self.report_interval = report_interval
+        self.report_stream = report_stream
+        self._stopping = False
+        # Lines read but not yet written, in line order, mapped to their byte offsets.
+        self._in_flight: Dict[int, int] = {}
+        # Lines after the watermark that are complete or were skipped.
+        self._done_ahead: Set[int] = set()
+        self._next_line = 0
+        self._next_offset = 0
+        self._progress = asyncio.Event()
+        self._output: Optional[IO[bytes]] = None
+        self._output_bytes = 0
+        self._stats = {"succeeded": 0, "failed": 0, "tokens": 0}
+        self._started = 0.0
+
+    def stop(self) -> None:
+        """
+        Stop reading input. Items in progress are finished and checkpointed before run returns.
+        """
+        self._stopping = True
+        self._progress.set()
+
+    async def run(self, restart: bool = False) -> Dict[str, Any]:
+        """
+        Process the input, resuming from the checkpoint if there is one.
+
+        Args:
+            restart (bool): Ignore the checkpoint and truncate the output.
+
+        Returns:
+            Dict[str, Any]: Final statistics of this run.
+        """
+        checkpoint = None if restart else self._load_checkpoint()
+        skip: Set[int] = set()
+        if checkpoint is not None:
+            self._next_line = checkpoint["line"]
+            self._next_offset = checkpoint["offset"]
+            skip = set(checkpoint["done_ahead"])
+
+        self._started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks: Set[asyncio.Future] = set()
+        background = [asyncio.ensure_future(self._checkpoint_periodically())]
+        if self.report_interval > 0:
+            background.append(asyncio.ensure_future(self._report_periodically()))
+
+        with open(self.input_path, "rb") as source, open(self.output_path, "ab") as output:
+            # Output written after the last checkpoint belongs to items that will be redone.
+            # An appending file keeps its position at the old end after a truncate, so the
+            # checkpointed size is counted in _output_bytes rather than read with tell().
+            self._output_bytes = checkpoint["output_bytes"] if checkpoint is not None else 0
+            output.truncate(self._output_bytes)
+            output.seek(0, os.SEEK_END)
+            self._output = output
+            source.seek(self._next_offset)
+            try:
+                while not self._stopping:
+                    raw = source.readline()
+                    if not raw:
+                        break
+                    line, offset = self._next_line, self._next_offset
+                    self._next_line += 1
+                    self._next_offset += len(raw)
+                    if line in skip or not raw.strip():
+                        skip.discard(line)
+                        self._done_ahead.add(line)
+                        continue
+                    self._in_flight[line] = offset
+                    while line - self._watermark()[0] >= self.window and not self._stopping:
+                        self._progress.clear()
+                        await self._progress.wait()
+                    await semaphore.acquire()
+                    task = asyncio.ensure_future(self._process(line, raw))
+                    task.add_done_callback(lambda _: semaphore.release())
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                if tasks:
+                    await asyncio.wait(set(tasks))
+            finally:
+                for task in background:
+                    task.cancel()
+                self._save_checkpoint()
+
+        summary = self._snapshot()
+        summary["finished"] = not self._stopping and not self._in_flight
+        self._report(summary)
+        return summary
+
+    def _watermark(self) -> Tuple[int, int]:
+        for line, offset in self._in_flight.items():
+            return line, offset
+        return self._next_line, self._next_offset
+
+    async def _process(self, line: int, raw: bytes) -> None:
+        item_id: Any = line
+        result: Dict[str, Any]
+        try:
+            record = json.loads(raw)
+            item_id = record.get(self.id_field, line)
+            text = record[self.text_field]
+            request_type = record.get("request_type", self.request_type)
+            params = {**self.params, **record.get("params", {})}
+        except (ValueError, KeyError, AttributeError) as e:
+            self._stats["failed"] += 1
+            result = {"line": line, "id": item_id, "error": f"Invalid input line: {e!r}"}
+        else:
+            result = await self._call(line, item_id, request_type, text, params)
+
+        self._write(result)
+        self._in_flight.pop(line, None)
+        self._done_ahead.add(line)
+        self._progress.set()
+
+    async def _call(self, line: int, item_id: Any, request_type: str, text: str,
+                    params: Dict[str, Any]) -> Dict[str, Any]:
+        for attempt in range(self.retries + 1):
+            if self.request_limiter is not None:
+                await self.request_limiter.acquire()
+            if self.token_limiter is not None:
+                await self.token_limiter.acquire(0)
+            try:
+                response = await self.orchestrator.process_request(request_type, text, **params)
+            except Exception as e:
+                if attempt == self.retries:
+                    self._stats["failed"] += 1
+                    return {"line": line, "id": item_id, "error": str(e)}
+                await asyncio.sleep(min(30.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.5))
+            else:
+                tokens = response.usage.total_tokens
+                if self.token_limiter is not None:
+                    self.token_limiter.consume(tokens)
+                self._stats["succeeded"] += 1
+                self._stats["tokens"] += tokens
+                return {"line": line, "id": item_id, "response": response.dict()}
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        data = json.dumps(result, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+        self._output.write(data)
+        self._output_bytes += len(data)
+
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("input") != os.path.abspath(self.input_path):
+            raise ValueError(f"Checkpoint {self.checkpoint_path} belongs to {checkpoint.get('input')}; "
+                             f"pass --restart to start over")
+        return checkpoint
+
+    def _save_checkpoint(self) -> None:
+        if self._output is None:
+            return
+        self._output.flush()
+        os.fsync(self._output.fileno())
+        line, offset = self._watermark()
+        self._done_ahead = {done for done in self._done_ahead if done > line}
+        checkpoint = {
+            "input": os.path.abspath(self.input_path),
+            "line": line,
+            "offset": offset,
+            "done_ahead": sorted(self._done_ahead),
+            "output_bytes": self._output_bytes,
+            "saved_at": time.time(),
+        }
+        # Written to a temporary file first so a crash never leaves a partial checkpoint.
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.checkpoint_path)
+
+    async def _checkpoint_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            self._save_checkpoint()
+
+    def _snapshot(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self._started
+        completed = self._stats["succeeded"] + self._stats["failed"]
+        return {
+            "elapsed": round(elapsed, 3),
+            "succeeded": self._stats["succeeded"],
+            "failed": self._stats["failed"],
+            "in_flight": len(self._in_flight),
+            "next_line": self._next_line,
+            "items_per_second": round(completed / elapsed, 3) if elapsed > 0 else 0.0,
+            "tokens_per_second": round(self._stats["tokens"] / elapsed, 3) if elapsed > 0 else 0.0,
+        }
+
+    async def _report_periodically(self) -> None:
+        previous_completed, previous_time = 0, time.monotonic()
+        while True:
+            await asyncio.sleep(self.report_interval)
+            snapshot = self._snapshot()
+            completed = snapshot["succeeded"] + snapshot["failed"]
+            now = time.monotonic()
+            snapshot["recent_items_per_second"] = round((completed - previous_completed) / (now - previous_time), 3)
+            previous_completed, previous_time = completed, now
+            self._report(snapshot)
+
+    def _report(self, snapshot: Dict[str, Any]) -> None:
+        self.report_stream.write(json.dumps(snapshot) + "\n")
+        self.report_stream.flush()
+
+def build_orchestrator(use_cache: bool) -> LLMOrchestrator:
+    """
+    Build an orchestrator from the application settings.
+
+    Args:
+        use_cache (bool): Whether to use the configured response cache.
+
+    Returns:
+        LLMOrchestrator: The orchestrator.
+    """
+    from core.config import settings
+    from core.dependencies import get_cache, get_model_factory, get_prompt_repository
+
+    return LLMOrchestrator(
+        get_model_factory(),
+        get_prompt_repository(),
+        get_cache() if use_cache else None,
+        cache_soft_ttl=settings.LLM_CACHE_SOFT_TTL,
+        cache_hard_ttl=settings.LLM_CACHE_HARD_TTL,
+        cache_lock_ttl=settings.LLM_CACHE_LOCK_TTL,
+        cache_wait_timeout=settings.LLM_CACHE_WAIT_TIMEOUT
+    )
+
+async def run_bulk(args: argparse.Namespace) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+    if args.max_tokens is not None:
+        params["max_tokens"] = args.max_tokens
+    if args.temperature is not None:
+        params["temperature"] = args.temperature
+    runner = BulkRunner(
+        build_orchestrator(args.cache),
+        args.input,
+        args.output,
+        checkpoint_path=args.checkpoint,
+        request_type=args.request_type,
+        params=params,
+        id_field=args.id_field,
+        text_field=args.text_field,
+        concurrency=args.concurrency,
+        window=max(args.window, args.concurrency),
+        retries=args.retries,
+        request_limiter=RateLimiter(args.rate) if args.rate else None,
+        token_limiter=RateLimiter(args.token_rate / 60.0, burst=args.token_rate) if args.token_rate else None,
+        checkpoint_interval=args.checkpoint_interval,
+        report_interval=args.report_interval
+    )
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, runner.stop)
+    return await runner.run(restart=args.restart)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Process a JSONL file of requests through the LLM orchestrator.")
+    parser.add_argument("input", help="JSONL input file, one request per line.")
+    parser.add_argument("output", help="JSONL output file, one result per input line.")
+    parser.add_argument("--checkpoint", help="Checkpoint file. Defaults to OUTPUT.checkpoint.")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and truncate the output.")
+    parser.add_argument("--request-type", default="generate", help="Request type of lines without a request_type field.")
+    parser.add_argument("--id-field", default="id", help="Field holding the item ID.")
+    parser.add_argument("--text-field", default="prompt", help="Field holding the input text.")
+    parser.add_argument("--max-tokens", type=int, help="max_tokens for lines without it in params.")
+    parser.add_argument("--temperature", type=float, help="temperature for lines without it in params.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum number of items processed at once.")
+    parser.add_argument("--rate", type=float, help="Maximum requests per second.")
+    parser.add_argument("--token-rate", type=float, help="Maximum tokens per minute, from reported usage.")
+    parser.add_argument("--window", type=int, default=1000,
+                        help="Maximum lines read ahead of the earliest unfinished line.")
+    parser.add_argument("--retries", type=int, default=2, help="Retries per failed item.")
+    parser.add_argument("--checkpoint-interval", type=float, default=5.0, help="Seconds between checkpoints.")
+    parser.add_argument("--report-interval", type=float, default=10.0,
+                        help="Seconds between progress reports on stderr. 0 disables them.")
+    parser.add_argument("--cache", action="store_true", help="Use the configured response cache.")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run_bulk(args))
+    return 0 if summary["finished"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
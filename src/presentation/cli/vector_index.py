@@ -0,0 +1,77 @@
+"""
+Vector Index CLI
+
+Trains, or retrains, the IVF index of the vector store at VECTOR_STORE_PATH.
+The API also trains it in the background once VECTOR_INDEX_TRAIN_THRESHOLD
+vectors are stored, and retrains it whenever the store has grown by
+VECTOR_INDEX_RETRAIN_GROWTH; retrain it here when the stored vectors drift,
+so the clusters stay balanced. With --if-due, it only trains when the API
+would, which suits a periodic job. Inserts continue while the index is
+trained. With --quantize, it trains the VECTOR_QUANTIZATION
+quantizer instead and re-encodes every stored vector. Product quantization
+is only used once trained this way. Running API processes pick up the new
+index or codes on their next search. A JSON report is printed on stdout.
+
+Usage:
+    cd src && python -m presentation.cli.vector_index
+    cd src && python -m presentation.cli.vector_index --lists 4096 --sample-size 262144
+    cd src && python -m presentation.cli.vector_index --if-due
+    cd src && VECTOR_QUANTIZATION=pq python -m presentation.cli.vector_index --quantize
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import List, Optional
+
+from core.config import settings
+from infrastructure.vector_store.ivf_index import IVFVectorStore
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Train the IVF index of the vector store.")
+    parser.add_argument("--path", default=settings.VECTOR_STORE_PATH, help="Vector store directory.")
+    parser.add_argument("--lists", type=int, default=settings.VECTOR_INDEX_LISTS,
+                        help="Number of IVF lists; 0 picks about 4 * sqrt(vectors).")
+    parser.add_argument("--quantize", action="store_true",
+                        help="Train the VECTOR_QUANTIZATION quantizer instead of the IVF index.")
+    parser.add_argument("--sample-size", type=int,
+                        help="Vectors k-means is trained on. Defaults to 64 per list or product quantizer centroid.")
+    parser.add_argument("--iterations", type=int, help="k-means iterations. Defaults to 20, or 10 with --quantize.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--if-due", action="store_true",
+                        help="Only train if the store has grown past VECTOR_INDEX_TRAIN_THRESHOLD or "
+                             "VECTOR_INDEX_RETRAIN_GROWTH since the last training.")
+    args = parser.parse_args(argv)
+
+    store = IVFVectorStore(args.path, settings.EMBEDDING_DIM, n_lists=args.lists,
+                           train_threshold=settings.VECTOR_INDEX_TRAIN_THRESHOLD,
+                           retrain_growth=settings.VECTOR_INDEX_RETRAIN_GROWTH,
+                           quantization=settings.VECTOR_QUANTIZATION, pq_subspaces=settings.VECTOR_PQ_SUBSPACES)
+    started = time.perf_counter()
+    try:
+        if args.quantize:
+            store.train_quantizer(sample_size=args.sample_size, iterations=args.iterations or 10, seed=args.seed)
+            report = {"quantization": settings.VECTOR_QUANTIZATION}
+        elif args.if_due:
+            report = {"trained": store.train_if_due(sample_size=args.sample_size, iterations=args.iterations or 20,
+                                                    seed=args.seed)}
+        else:
+            report = {"lists": store.train(n_lists=args.lists or None, sample_size=args.sample_size,
+                                           iterations=args.iterations or 20, seed=args.seed)}
+        vectors = len(store)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    print(json.dumps({
+        "path": args.path,
+        "vectors": vectors,
+        **report,
+        "seconds": round(time.perf_counter() - started, 3)
+    }))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Job Worker Process
+
+Runs a JobWorker that processes asynchronous jobs submitted through the
+/jobs API. Workers are separate processes from the API server, so they can
+be scaled independently; each one processes up to JOB_WORKER_CONCURRENCY
+jobs at once. SIGTERM and SIGINT stop claiming new jobs and exit once the
+jobs in progress have finished.
+
+Usage:
+    cd src && python -m worker
+    cd src && python -m worker --concurrency 32
+"""
+
+import argparse
+import asyncio
+import signal
+from typing import List, Optional
+
+from prometheus_client import start_http_server
+
+from application.services.job_worker import JobWorker
+from core.config import settings
+from core.cross_cutting import setup_logging, setup_tracing
+from core.dependencies import get_cache, get_job_queue, get_llm_orchestrator, get_model_factory, get_prompt_repository
+
+async def run_worker(concurrency: int) -> None:
+    """
+    Process jobs until the process receives SIGTERM or SIGINT.
+
+    Args:
+        concurrency (int): Maximum number of jobs processed at once.
+    """
+    queue = get_job_queue()
+    orchestrator = get_llm_orchestrator(get_cache(), get_model_factory(), get_prompt_repository())
+    worker = JobWorker(
+        queue,
+        orchestrator,
+        concurrency=concurrency,
+        claim_idle=settings.JOB_WORKER_CLAIM_IDLE,
+        max_attempts=settings.JOB_WORKER_MAX_ATTEMPTS
+    )
+    loop = asyncio.get_event_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        await queue.close()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Process asynchronous LLM jobs.")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY,
+                        help="Maximum number of jobs processed at once.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    setup_tracing()
+    if settings.JOB_WORKER_METRICS_PORT:
+        start_http_server(settings.JOB_WORKER_METRICS_PORT)
+    asyncio.run(run_worker(args.concurrency))
+
+if __name__ == "__main__":
+    main()
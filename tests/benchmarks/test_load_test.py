@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "benchmarks"))
+
+import load_test  # noqa: E402
+
+def _result(throughput=100.0, error_rate=0.0, p95=0.2, ttft=None):
+    return {
+        "throughput_rps": throughput,
+        "error_rate": error_rate,
+        "latency_seconds": {"mean": 0.1, "p50": 0.1, "p95": p95, "p99": 0.3, "max": 0.5},
+        "ttft_seconds": ttft,
+    }
+
+def _regressions(result, baseline, tolerance=0.1):
+    return {entry["metric"] for entry in load_test.compare(result, baseline, tolerance) if entry["regression"]}
+
+def test_flatten_keeps_percentiles_only():
+    metrics = load_test.flatten(_result(ttft={"mean": 0.05, "p50": 0.04, "p95": None, "p99": 0.09, "max": 0.1}))
+
+    assert metrics == {
+        "throughput_rps": 100.0,
+        "error_rate": 0.0,
+        "latency_seconds.p50": 0.1,
+        "latency_seconds.p95": 0.2,
+        "latency_seconds.p99": 0.3,
+        "ttft_seconds.p50": 0.04,
+        "ttft_seconds.p99": 0.09,
+    }
+
+def test_compare_within_tolerance():
+    assert _regressions(_result(throughput=95.0, p95=0.21), _result()) == set()
+
+def test_compare_flags_lower_throughput_and_higher_latency():
+    assert _regressions(_result(throughput=80.0, p95=0.3), _result()) == {"throughput_rps", "latency_seconds.p95"}
+
+def test_compare_treats_improvements_as_no_regression():
+    comparisons = {entry["metric"]: entry for entry in load_test.compare(_result(throughput=150.0, p95=0.1),
+                                                                          _result(), 0.1)}
+
+    assert not any(entry["regression"] for entry in comparisons.values())
+    assert comparisons["throughput_rps"]["change"] == pytest.approx(0.5)
+    assert comparisons["latency_seconds.p95"]["change"] == pytest.approx(-0.5)
+
+def test_compare_error_rate_in_absolute_terms():
+    assert _regressions(_result(error_rate=0.005), _result()) == set()
+    assert _regressions(_result(error_rate=0.02), _result()) == {"error_rate"}
+
+def test_compare_skips_metrics_missing_from_the_baseline():
+    ttft = {"p50": 0.04, "p95": 0.08, "p99": 0.09}
+    metrics = {entry["metric"] for entry in load_test.compare(_result(ttft=ttft), _result(), 0.1)}
+
+    assert not any(metric.startswith("ttft_seconds") for metric in metrics)
+
+@pytest.mark.parametrize("body, expected", [
+    (b'data: {"text":"a"}\n\nevent: done\ndata: {}\n\n', "done"),
+    (b'data: {"text":"a"}\n\nevent: error\ndata: {"error":"boom"}\n\n', "error"),
+    (b'data: {"text":"a"}\n\n', "message"),
+    (b"", None),
+])
+def test_stream_final_event(body, expected):
+    assert load_test.stream_final_event(body) == expected
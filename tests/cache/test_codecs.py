@@ -0,0 +1,69 @@
+import json
+import math
+
+import pytest
+
+from infrastructure.cache.codecs import HEADER_SIZE, MAGIC, ValueSerializer
+
+RESPONSE = {"id": "response-1", "choices": [{"text": "Bonjour", "index": 0}], "usage": {"total_tokens": 6}}
+VECTOR = [0.5, -0.25, 0.125, 1.0, -1.0, 0.0, 0.333]
+
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_json_round_trip(compression):
+    serializer = ValueSerializer(codec="json", compression=compression, compress_threshold=0)
+
+    data = serializer.dumps(RESPONSE)
+
+    assert data[0] == MAGIC
+    assert serializer.loads(data) == RESPONSE
+
+def test_zlib_applies_above_the_threshold_only():
+    serializer = ValueSerializer(codec="json", compression="zlib", compress_threshold=1024)
+    large = {"text": "Bonjour " * 1000}
+
+    small_data = serializer.dumps(RESPONSE)
+    large_data = serializer.dumps(large)
+
+    assert small_data[2] != large_data[2]
+    assert len(large_data) < len(json.dumps(large))
+    assert serializer.loads(small_data) == RESPONSE
+    assert serializer.loads(large_data) == large
+
+def test_float32_round_trip():
+    serializer = ValueSerializer()
+
+    data = serializer.dumps(VECTOR, codec="float32")
+
+    assert len(data) == HEADER_SIZE + 4 * len(VECTOR)
+    assert serializer.loads(data) == pytest.approx(VECTOR, rel=1e-6)
+
+def test_int8_round_trip_within_half_a_step():
+    serializer = ValueSerializer()
+
+    data = serializer.dumps(VECTOR, codec="int8")
+
+    assert len(data) == HEADER_SIZE + 4 + len(VECTOR)
+    step = max(abs(component) for component in VECTOR) / 127
+    decoded = serializer.loads(data)
+    assert all(math.isclose(a, b, abs_tol=step / 2 + 1e-7) for a, b in zip(decoded, VECTOR))
+
+def test_values_stay_readable_after_the_default_codec_changes():
+    data = ValueSerializer(codec="json", compression="zlib", compress_threshold=0).dumps(RESPONSE)
+
+    assert ValueSerializer(codec="float32").loads(data) == RESPONSE
+
+@pytest.mark.parametrize("legacy", [json.dumps(RESPONSE).encode("utf-8"), json.dumps(RESPONSE)])
+def test_legacy_untagged_json_is_decoded(legacy):
+    assert ValueSerializer().loads(legacy) == RESPONSE
+
+def test_undecodable_values_raise_value_error():
+    serializer = ValueSerializer()
+
+    with pytest.raises(ValueError):
+        serializer.loads(bytes((MAGIC, 99, 0)) + b"payload")
+    with pytest.raises(ValueError):
+        serializer.loads(b"not json")
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        ValueSerializer(codec="pickle")
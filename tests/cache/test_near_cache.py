@@ -0,0 +1,94 @@
+import asyncio
+import uuid
+
+import pytest
+
+try:
+    from infrastructure.cache.near_cache import NearCache
+except (ImportError, TypeError) as e:  # aioredis 2.0 fails to import on Python 3.11 with a TypeError
+    pytest.skip(f"aioredis is unavailable: {e}", allow_module_level=True)
+
+from core.config import settings
+from infrastructure.cache.lru import MISSING
+
+def _near_cache(channel):
+    return NearCache(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB, channel=channel)
+
+@pytest.fixture
+async def caches():
+    channel = f"test_invalidate:{uuid.uuid4().hex}"
+    first, second = _near_cache(channel), _near_cache(channel)
+    try:
+        await first.redis.ping()
+    except Exception as e:
+        await first.close()
+        await second.close()
+        pytest.skip(f"Redis is unavailable: {e}")
+    prefix = f"test_near:{uuid.uuid4().hex}"
+    yield first, second, prefix
+    keys = [key async for key in first.redis.scan_iter(match=f"{prefix}:*")]
+    if keys:
+        await first.redis.delete(*keys)
+    await first.close()
+    await second.close()
+
+async def _eventually(predicate, timeout=2.0):
+    deadline = asyncio.get_event_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_event_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+@pytest.mark.asyncio
+async def test_get_populates_the_local_layer(caches):
+    first, second, prefix = caches
+    key = f"{prefix}:key"
+    await second.set(key, {"text": "Bonjour"})
+
+    assert await first.get(key) == {"text": "Bonjour"}
+    assert first.local.get(key) == {"text": "Bonjour"}
+
+@pytest.mark.asyncio
+async def test_invalidation_during_a_get_leaves_no_local_entry(caches):
+    first, _, prefix = caches
+    key = f"{prefix}:key"
+    await first.redis.set(key, first._encode("old"))
+    end_fetch = first._end_fetch
+
+    def invalidate_then_end(fetched_key, version):
+        # Another replica's write is announced while the GET is in flight.
+        first._apply_invalidation(f"other-replica\n{fetched_key}")
+        return end_fetch(fetched_key, version)
+
+    first._end_fetch = invalidate_then_end
+    assert await first.get(key) == "old"
+    assert await first.get_many([key]) == {key: "old"}
+    del first._end_fetch
+
+    assert first.local.get(key) is MISSING
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_other_replicas(caches):
+    first, second, prefix = caches
+    key = f"{prefix}:key"
+    await first.set(key, "old")
+    assert await second.get(key) == "old"
+
+    await first.set(key, "new")
+
+    await _eventually(lambda: second.local.get(key) is MISSING)
+    assert await second.get(key) == "new"
+
+    await first.delete(key)
+    await _eventually(lambda: second.local.get(key) is MISSING)
+    assert await second.get(key) is None
+
+@pytest.mark.asyncio
+async def test_set_stores_a_copy(caches):
+    first, _, prefix = caches
+    key = f"{prefix}:key"
+    value = {"text": "Bonjour"}
+
+    await first.set(key, value)
+    value["text"] = "changed"
+
+    assert await first.get(key) == {"text": "Bonjour"}
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from infrastructure.cache.memory_cache import InMemoryCache
+from infrastructure.cache.stampede import StaleWhileRevalidate
+
+def _cache(**kwargs):
+    options = {"soft_ttl": 60, "hard_ttl": 120, "beta": 0, "poll_interval": 0.01}
+    options.update(kwargs)
+    return StaleWhileRevalidate(InMemoryCache(), **options)
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once():
+    cache = _cache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_compute("key", compute) for _ in range(20)))
+
+    assert results == ["value"] * 20
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_waiters_take_over_after_a_failed_computation():
+    cache = _cache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        if len(calls) == 1:
+            raise RuntimeError("upstream failure")
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_compute("key", compute) for _ in range(10)),
+                                   return_exceptions=True)
+
+    assert sum(isinstance(result, RuntimeError) for result in results) == 1
+    assert results.count("value") == 9
+    assert len(calls) == 2
+
+@pytest.mark.asyncio
+async def test_waiters_compute_after_the_wait_timeout():
+    cache = _cache(wait_timeout=0.05)
+    # Another replica holds the lock and never stores a value.
+    await cache.cache.acquire_lock(cache._lock_name("key"), 60)
+
+    async def compute():
+        return "value"
+
+    assert await cache.get_or_compute("key", compute) == "value"
+
+@pytest.mark.asyncio
+async def test_stale_values_are_served_while_refreshing():
+    cache = _cache(soft_ttl=0)
+    values = iter(["first", "second"])
+
+    async def compute():
+        return next(values)
+
+    assert await cache.get_or_compute("key", compute) == "first"
+    assert await cache.get_or_compute("key", compute) == "first"
+    await asyncio.gather(*cache._tasks)
+    assert await cache.get_or_compute("key", compute) == "second"
+
+def test_hard_ttl_must_cover_soft_ttl():
+    with pytest.raises(ValueError):
+        StaleWhileRevalidate(InMemoryCache(), soft_ttl=120, hard_ttl=60)
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from infrastructure.cache.disk_cache import SQLiteCache
+from infrastructure.cache.memory_cache import InMemoryCache
+from infrastructure.cache.tiered_cache import TieredCache
+
+@pytest.fixture
+async def tiered(tmp_path):
+    disk = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    cache = TieredCache(InMemoryCache(), InMemoryCache(), disk, shared_ttl=60, memory_ttl=60, promote_hits=2)
+    yield cache
+    await disk.close()
+
+@pytest.mark.asyncio
+async def test_writes_skip_memory(tiered):
+    await tiered.set("key", "value")
+
+    assert await tiered.memory.get("key") is None
+    assert await tiered.shared.get("key") == "value"
+    assert await tiered.disk.get("key") == "value"
+
+@pytest.mark.asyncio
+async def test_shared_hits_are_promoted_after_promote_hits_reads(tiered):
+    await tiered.set("key", "value")
+
+    assert await tiered.get("key") == "value"
+    assert await tiered.memory.get("key") is None
+    assert await tiered.get("key") == "value"
+    assert await tiered.memory.get("key") == "value"
+
+@pytest.mark.asyncio
+async def test_disk_hits_are_promoted_to_memory_only(tiered):
+    await tiered.set("key", "value")
+    await tiered.shared.delete("key")
+
+    assert await tiered.get_many(["key", "missing"]) == {"key": "value", "missing": None}
+    assert await tiered.get("key") == "value"
+
+    assert await tiered.memory.get("key") == "value"
+    assert await tiered.shared.get("key") is None
+
+@pytest.mark.asyncio
+async def test_promoted_entries_expire_with_the_disk_entry(tiered):
+    await tiered.set("key", "value", expire=1)
+    await tiered.shared.delete("key")
+    await tiered.get("key")
+    await tiered.get("key")
+    assert await tiered.memory.get("key") == "value"
+
+    await asyncio.sleep(1.1)
+
+    assert await tiered.memory.get("key") is None
+    assert await tiered.get("key") is None
+
+@pytest.mark.asyncio
+async def test_set_and_delete_drop_the_promoted_copy(tiered):
+    await tiered.set("key", "old")
+    await tiered.get("key")
+    await tiered.get("key")
+
+    await tiered.set("key", "new")
+    assert await tiered.get("key") == "new"
+
+    await tiered.delete("key")
+    assert await tiered.get("key") is None
+
+@pytest.mark.asyncio
+async def test_sweep_removes_outdated_generations_from_every_tier(tiered):
+    old = await tiered.namespaced_key("prompt:generate", "a")
+    await tiered.set(old, "old")
+    await tiered.flush("prompt:generate")
+    current = await tiered.namespaced_key("prompt:generate", "a")
+    await tiered.set(current, "current")
+
+    assert await tiered.generation("prompt:generate") == 1
+    assert await tiered.sweep_namespace("prompt:generate") == 2
+    assert await tiered.shared.get(old) is None
+    assert await tiered.disk.get(old) is None
+    assert await tiered.get(current) == "current"
+
+@pytest.mark.asyncio
+async def test_delete_many_counts_the_shared_tier(tiered):
+    await tiered.set_many({"a": 1, "b": 2})
+    await tiered.shared.delete("b")
+
+    assert await tiered.delete_many(["a", "b", "missing"]) == 1
+    assert await tiered.get_many(["a", "b"]) == {"a": None, "b": None}
@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List
+
+import pytest
+
+from application.chains import OutlineChain
+from application.models.base_model import BaseModel
+from application.models.model_factory import ModelFactory
+from application.prompt_management import PromptRepository, PromptTemplate
+
+class ScriptedModel(BaseModel):
+    """Streams the outline in lines, holding back everything after the first line until released."""
+
+    def __init__(self, model_name: str):
+        super().__init__(model_name)
+        self.prompts: List[str] = []
+        self.release = asyncio.Event()
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        raise NotImplementedError
+
+    async def generate_completion(self, prompt: str, **kwargs):
+        raise NotImplementedError
+
+    async def generate_stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        self.prompts.append(prompt)
+        if prompt.startswith("Outline"):
+            yield "Intro\n"
+            await self.release.wait()
+            yield "Body\nEnd"
+        else:
+            yield "Expanded "
+            yield "intro"
+
+    async def create_embedding(self, text: str) -> List[float]:
+        raise NotImplementedError
+
+    def get_model_info(self) -> Dict[str, Any]:
+        return {"name": self.model_name}
+
+@pytest.fixture
+def model():
+    return ScriptedModel("scripted")
+
+@pytest.fixture
+def chain(model):
+    factory = ModelFactory()
+    factory.register_model("scripted", lambda model_name: model)
+    prompts = PromptRepository()
+    prompts.add_prompt(PromptTemplate(name="outline", template="Outline: $topic", version="1.0"))
+    prompts.add_prompt(PromptTemplate(name="expand", template="Expand: $heading", version="1.0"))
+    return OutlineChain(prompts, factory, model_name="scripted")
+
+@pytest.mark.asyncio
+async def test_expansion_starts_before_the_outline_finishes(chain, model):
+    stream = chain.stream({"topic": "caching"})
+
+    # The outline is still held back after its first line.
+    assert await stream.__anext__() == "Expanded "
+    assert model.prompts == ["Outline: caching", "Expand: Intro"]
+    assert not model.release.is_set()
+    assert await stream.__anext__() == "intro"
+    await stream.aclose()
+
+@pytest.mark.asyncio
+async def test_run_reports_the_time_to_first_chunk_of_each_step(chain):
+    result = await chain.run({"topic": "caching"})
+
+    assert result["response"] == "Expanded intro"
+    assert list(result["timings"]) == ["source", "outline", "expand"]
+    assert all(seconds is not None and seconds >= 0 for seconds in result["timings"].values())
@@ -0,0 +1,80 @@
+import io
+import json
+
+import pytest
+
+from presentation.cli.bulk import BulkRunner
+
+class _Usage:
+    def __init__(self, total_tokens: int):
+        self.total_tokens = total_tokens
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+        self.usage = _Usage(len(text))
+
+    def dict(self):
+        return {"text": self.text}
+
+class StoppingOrchestrator:
+    """Answers each request with its input and stops the runner after `limit` items."""
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.runner = None
+        self.calls = 0
+
+    async def process_request(self, request_type, text, **params):
+        self.calls += 1
+        if self.limit is not None and self.calls >= self.limit:
+            self.runner.stop()
+        return _Response(text)
+
+def _runner(tmp_path, orchestrator):
+    runner = BulkRunner(orchestrator, str(tmp_path / "input.jsonl"), str(tmp_path / "output.jsonl"),
+                        concurrency=1, report_interval=0, report_stream=io.StringIO())
+    orchestrator.runner = runner
+    return runner
+
+@pytest.fixture
+def input_lines(tmp_path):
+    lines = [{"id": f"item-{i}", "prompt": f"text {i}"} for i in range(8)]
+    (tmp_path / "input.jsonl").write_text("".join(json.dumps(line) + "\n" for line in lines))
+    return lines
+
+@pytest.mark.asyncio
+async def test_resume_after_crashes_writes_each_item_once(tmp_path, input_lines):
+    summary = await _runner(tmp_path, StoppingOrchestrator(limit=3)).run()
+    assert not summary["finished"]
+
+    # A crash after the checkpoint leaves output that the next run discards.
+    with open(tmp_path / "output.jsonl", "ab") as output:
+        output.write(b'{"line":3,"id":"item-3","resp')
+
+    # Stopped right after resuming, before anything new is written.
+    runner = _runner(tmp_path, StoppingOrchestrator())
+    runner.stop()
+    summary = await runner.run()
+    assert not summary["finished"]
+
+    summary = await _runner(tmp_path, StoppingOrchestrator(limit=2)).run()
+    assert not summary["finished"]
+
+    summary = await _runner(tmp_path, StoppingOrchestrator()).run()
+    assert summary["finished"]
+
+    data = (tmp_path / "output.jsonl").read_bytes()
+    assert b"\0" not in data
+    results = [json.loads(line) for line in data.splitlines()]
+    assert sorted(result["line"] for result in results) == list(range(len(input_lines)))
+    assert all(result["response"]["text"] == input_lines[result["line"]]["prompt"] for result in results)
+
+@pytest.mark.asyncio
+async def test_restart_truncates_output(tmp_path, input_lines):
+    await _runner(tmp_path, StoppingOrchestrator()).run()
+    summary = await _runner(tmp_path, StoppingOrchestrator()).run(restart=True)
+
+    assert summary["finished"]
+    lines = (tmp_path / "output.jsonl").read_bytes().splitlines()
+    assert len(lines) == len(input_lines)
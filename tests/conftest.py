@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The application imports its packages relative to src, as when run from there.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+# Settings require the provider keys; tests never call the real providers.
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
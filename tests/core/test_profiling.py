@@ -0,0 +1,83 @@
+import asyncio
+from functools import partial
+from unittest import mock
+
+import pytest
+
+from application.models.model_factory import ModelFactory
+from application.models.provider_model import ProviderModel
+from application.prompt_management import PromptRepository, PromptTemplate
+from application.services import llm_orchestrator
+from core import profiling
+from core.profiling import RequestProfiler, profile_requested
+from infrastructure.llm_providers.fake import FakeLLMProvider
+
+@pytest.fixture
+def orchestrator():
+    factory = ModelFactory()
+    provider = FakeLLMProvider(latency_mean=0.05, latency_distribution="fixed", tokens_per_second=0)
+    factory.register_model("gpt-3.5-turbo", partial(ProviderModel, provider=provider))
+    prompts = PromptRepository()
+    prompts.add_prompt(PromptTemplate(name="generate", template="$input_text", version="1.0"))
+    return llm_orchestrator.LLMOrchestrator(factory, prompts)
+
+@pytest.fixture
+def requested():
+    token = profile_requested.set(True)
+    yield
+    profile_requested.reset(token)
+
+def test_authorize_requires_the_configured_token():
+    profiler = RequestProfiler("secret")
+
+    assert profiler.authorize("secret")
+    assert not profiler.authorize("wrong")
+    assert not profiler.authorize(None)
+
+def test_disabled_profiler_authorizes_nothing():
+    profiler = RequestProfiler(None)
+
+    assert not profiler.enabled
+    assert not profiler.authorize("")
+    assert not profiler.authorize(None)
+
+def test_armed_profiler_profiles_the_next_requests_only():
+    profiler = RequestProfiler("secret")
+    profiler.arm(2)
+
+    assert [profiler.should_profile() for _ in range(3)] == [True, True, False]
+
+@pytest.mark.asyncio
+async def test_requested_profile_is_recorded(orchestrator, requested):
+    profiler = RequestProfiler("secret", interval=0.002)
+
+    with mock.patch.object(llm_orchestrator, "profiler", profiler):
+        await orchestrator.process_request("generate", "Hello", max_tokens=5)
+
+    [summary] = profiler.list_profiles()
+    assert summary["label"] == "generate"
+    assert summary["samples"] > 0
+    assert profiling.current_profile_id.get() == summary["id"]
+    # The request waits on the provider, so samples show the suspended task.
+    assert "[awaiting]" in profiler.get_profile(summary["id"])
+
+@pytest.mark.asyncio
+async def test_disabled_profiler_never_samples(orchestrator, requested):
+    profiler = RequestProfiler(None)
+    profiler.arm(5)
+
+    with mock.patch.object(llm_orchestrator, "profiler", profiler), \
+            mock.patch.object(profiling, "TaskSampler") as sampler:
+        await orchestrator.process_request("generate", "Hello", max_tokens=5)
+
+    sampler.assert_not_called()
+    assert profiler.list_profiles() == []
+
+@pytest.mark.asyncio
+async def test_only_max_profiles_are_kept():
+    profiler = RequestProfiler("secret", max_profiles=2)
+
+    for label in ("first", "second", "third"):
+        await profiler.profile(asyncio.sleep(0), label=label)
+
+    assert [summary["label"] for summary in profiler.list_profiles()] == ["third", "second"]
@@ -0,0 +1,91 @@
+import pytest
+
+from core.exceptions import LLMProviderError
+from infrastructure.llm_providers.cassette import CassetteWriter, RecordingProvider, ReplayProvider, read_cassette
+from infrastructure.llm_providers.fake import FakeLLMProvider
+
+def _fake(**kwargs):
+    return FakeLLMProvider(latency_mean=0, tokens_per_second=0, embedding_dim=8, **kwargs)
+
+@pytest.fixture(params=["cassette.jsonl", "cassette.jsonl.gz"])
+def path(request, tmp_path):
+    return str(tmp_path / request.param)
+
+@pytest.mark.asyncio
+async def test_record_then_replay_round_trip(path):
+    recorder = RecordingProvider(_fake(), path)
+    text = await recorder.generate_text("Hello", max_tokens=5)
+    completion = await recorder.generate_completion("Hello", max_tokens=5, n=2)
+    chunks = [chunk async for chunk in recorder.stream_text("Hello", max_tokens=5)]
+    embedding = await recorder.create_embedding("Hello")
+    embeddings = await recorder.create_embeddings(["Hello", "Goodbye"])
+    recorder.cassette.close()
+
+    replay = ReplayProvider(path, time_scale=0)
+
+    assert replay.model == "fake-model"
+    assert await replay.generate_text("Hello", max_tokens=5) == text
+    assert (await replay.generate_completion("Hello", max_tokens=5, n=2)).to_dict() == completion.to_dict()
+    assert [chunk async for chunk in replay.stream_text("Hello", max_tokens=5)] == chunks
+    assert await replay.create_embedding("Hello") == embedding
+    assert await replay.create_embeddings(["Hello", "Goodbye"]) == embeddings
+
+@pytest.mark.asyncio
+async def test_batched_embeddings_are_rebuilt_from_single_recordings(path):
+    recorder = RecordingProvider(_fake(), path)
+    embeddings = [await recorder.create_embedding(text) for text in ("Hello", "Goodbye")]
+    recorder.cassette.close()
+
+    assert await ReplayProvider(path, time_scale=0).create_embeddings(["Hello", "Goodbye"]) == embeddings
+
+@pytest.mark.asyncio
+async def test_recorded_errors_are_replayed(path):
+    recorder = RecordingProvider(_fake(error_rate=1.0), path)
+    with pytest.raises(LLMProviderError):
+        await recorder.generate_text("Hello", max_tokens=5)
+    recorder.cassette.close()
+
+    with pytest.raises(LLMProviderError, match="injected failure"):
+        await ReplayProvider(path, time_scale=0).generate_text("Hello", max_tokens=5)
+
+@pytest.mark.asyncio
+async def test_strict_replay_rejects_unrecorded_requests(path):
+    recorder = RecordingProvider(_fake(), path)
+    text = await recorder.generate_text("Hello", max_tokens=5)
+    recorder.cassette.close()
+
+    with pytest.raises(LLMProviderError, match="no recorded generate interaction"):
+        await ReplayProvider(path, time_scale=0).generate_text("Goodbye", max_tokens=5)
+    with pytest.raises(LLMProviderError):
+        await ReplayProvider(path, time_scale=0, strict=False).create_embedding("Hello")
+    assert await ReplayProvider(path, time_scale=0, strict=False).generate_text("Goodbye") == text
+
+@pytest.mark.asyncio
+async def test_streams_closed_early_are_replayed_as_incomplete(path):
+    recorder = RecordingProvider(_fake(), path)
+    stream = recorder.stream_text("Hello", max_tokens=5)
+    received = [await stream.__anext__(), await stream.__anext__()]
+    await stream.aclose()
+    recorder.cassette.close()
+
+    [record] = read_cassette(path)
+    assert record["incomplete"]
+
+    replayed = []
+    with pytest.raises(LLMProviderError, match="closed before it finished"):
+        async for chunk in ReplayProvider(path, time_scale=0).stream_text("Hello", max_tokens=5):
+            replayed.append(chunk)
+    assert replayed == received
+
+@pytest.mark.asyncio
+async def test_repeated_requests_are_served_in_turn(tmp_path):
+    path = str(tmp_path / "cassette.jsonl")
+    writer = CassetteWriter(path)
+    for text in ("first", "second"):
+        writer.write({"kind": "embedding", "model": "m", "key": "k", "request": {}, "offset": 0,
+                      "result": [text == "first"], "ttft": 0, "duration": 0})
+    writer.close()
+
+    replay = ReplayProvider(path, time_scale=0, strict=False)
+
+    assert [await replay.create_embedding("x") for _ in range(3)] == [[True], [False], [True]]
@@ -0,0 +1,114 @@
+import math
+import statistics
+import time
+
+import pytest
+
+from core.exceptions import LLMProviderError
+from infrastructure.llm_providers.fake import FakeLLMProvider
+
+def _instant(**kwargs):
+    return FakeLLMProvider(latency_mean=0, tokens_per_second=0, **kwargs)
+
+@pytest.mark.asyncio
+async def test_completions_are_deterministic_per_prompt():
+    provider = _instant()
+
+    first = await provider.generate_text("Hello", max_tokens=8)
+
+    assert len(first.split()) == 8
+    assert await provider.generate_text("Hello", max_tokens=8) == first
+    assert await provider.generate_text("Goodbye", max_tokens=8) != first
+
+@pytest.mark.asyncio
+async def test_call_time_covers_latency_and_token_rate():
+    provider = FakeLLMProvider(latency_mean=0.05, latency_distribution="fixed", tokens_per_second=100)
+
+    started = time.monotonic()
+    await provider.generate_text("Hello", max_tokens=5)
+    elapsed = time.monotonic() - started
+
+    assert 0.1 <= elapsed < 0.5
+
+@pytest.mark.parametrize("distribution", ["normal", "lognormal", "exponential"])
+def test_sampled_latency_has_the_configured_mean(distribution):
+    provider = FakeLLMProvider(latency_mean=0.2, latency_stddev=0.05, latency_distribution=distribution, seed=1)
+
+    samples = [provider._sample_latency() for _ in range(5000)]
+
+    assert min(samples) >= 0
+    assert statistics.mean(samples) == pytest.approx(0.2, rel=0.05)
+
+def test_lognormal_latency_has_the_configured_stddev():
+    provider = FakeLLMProvider(latency_mean=0.2, latency_stddev=0.05, seed=1)
+
+    samples = [provider._sample_latency() for _ in range(5000)]
+
+    assert statistics.stdev(samples) == pytest.approx(0.05, rel=0.1)
+
+def test_unknown_distribution_is_rejected():
+    with pytest.raises(ValueError):
+        FakeLLMProvider(latency_distribution="uniform")
+
+@pytest.mark.asyncio
+async def test_error_rate_injects_failures():
+    always = _instant(error_rate=1.0)
+    with pytest.raises(LLMProviderError):
+        await always.generate_text("Hello")
+    with pytest.raises(LLMProviderError):
+        await always.generate_completion("Hello")
+
+    sometimes = _instant(error_rate=0.3, seed=1)
+    failures = 0
+    for _ in range(500):
+        try:
+            await sometimes.generate_text("Hello", max_tokens=1)
+        except LLMProviderError:
+            failures += 1
+    assert 100 <= failures <= 200
+
+@pytest.mark.asyncio
+async def test_stream_yields_the_completion_token_by_token():
+    provider = _instant()
+
+    chunks = [chunk async for chunk in provider.stream_text("Hello", max_tokens=6)]
+
+    assert len(chunks) == 6
+    assert "".join(chunks) == await provider.generate_text("Hello", max_tokens=6)
+
+@pytest.mark.asyncio
+async def test_stream_failures_happen_mid_stream():
+    provider = _instant(error_rate=1.0, seed=3)
+    received = []
+
+    for _ in range(20):
+        chunks = []
+        with pytest.raises(LLMProviderError):
+            async for chunk in provider.stream_text("Hello", max_tokens=10):
+                chunks.append(chunk)
+        received.append(len(chunks))
+
+    assert all(count <= 10 for count in received)
+    assert len(set(received)) > 1
+
+@pytest.mark.asyncio
+async def test_completion_returns_n_distinct_choices_with_usage():
+    provider = _instant()
+
+    result = await provider.generate_completion("Hello world", max_tokens=4, n=3)
+
+    assert [choice.index for choice in result.choices] == [0, 1, 2]
+    assert result.choices[0].text == await provider.generate_text("Hello world", max_tokens=4)
+    assert len({choice.text for choice in result.choices}) == 3
+    assert (result.prompt_tokens, result.completion_tokens) == (2, 12)
+
+@pytest.mark.asyncio
+async def test_embeddings_are_deterministic_unit_vectors():
+    provider = _instant(embedding_dim=16)
+
+    embedding = await provider.create_embedding("Hello")
+
+    assert len(embedding) == 16
+    assert math.fsum(x * x for x in embedding) == pytest.approx(1.0)
+    assert await provider.create_embedding("Hello") == embedding
+    assert await provider.create_embedding("Goodbye") != embedding
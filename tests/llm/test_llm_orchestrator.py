@@ -0,0 +1,115 @@
+import asyncio
+from functools import partial
+from unittest import mock
+
+import pytest
+
+from application.models.model_factory import ModelFactory
+from application.models.provider_model import ProviderModel
+from application.prompt_management import PromptRepository, PromptTemplate
+from application.services.llm_orchestrator import LLMOrchestrator
+from infrastructure.cache.memory_cache import InMemoryCache
+from infrastructure.llm_providers.fake import FakeLLMProvider
+
+@pytest.fixture
+def provider():
+    provider = FakeLLMProvider(latency_mean=0.01, latency_distribution="fixed", tokens_per_second=0)
+    # Wrapped so that tests can count the upstream calls.
+    with mock.patch.object(provider, "generate_completion", wraps=provider.generate_completion):
+        yield provider
+
+def _orchestrator(provider, cache=None):
+    factory = ModelFactory()
+    factory.register_model("gpt-3.5-turbo", partial(ProviderModel, provider=provider))
+    prompts = PromptRepository()
+    prompts.add_prompt(PromptTemplate(name="generate", template="$input_text", version="1.0"))
+    return LLMOrchestrator(factory, prompts, cache)
+
+@pytest.mark.asyncio
+async def test_cache_hit_returns_the_stored_response(provider):
+    orchestrator = _orchestrator(provider, InMemoryCache())
+
+    first = await orchestrator.process_request("generate", "Hello", max_tokens=5)
+    second = await orchestrator.process_request("generate", "Hello", max_tokens=5)
+
+    assert provider.generate_completion.await_count == 1
+    assert second.dict() == first.dict()
+
+@pytest.mark.asyncio
+async def test_cache_miss_for_different_parameters(provider):
+    orchestrator = _orchestrator(provider, InMemoryCache())
+
+    await orchestrator.process_request("generate", "Hello", max_tokens=5)
+    await orchestrator.process_request("generate", "Hello", max_tokens=6)
+    await orchestrator.process_request("generate", "Goodbye", max_tokens=5)
+
+    assert provider.generate_completion.await_count == 3
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_call_the_provider_once(provider):
+    orchestrator = _orchestrator(provider, InMemoryCache())
+
+    responses = await asyncio.gather(*(orchestrator.process_request("generate", "Hello", max_tokens=5)
+                                       for _ in range(10)))
+
+    assert provider.generate_completion.await_count == 1
+    assert len({response.id for response in responses}) == 1
+
+@pytest.mark.asyncio
+async def test_invalidate_responses_forces_a_miss(provider):
+    orchestrator = _orchestrator(provider, InMemoryCache())
+
+    await orchestrator.process_request("generate", "Hello", max_tokens=5)
+    await orchestrator.invalidate_responses("generate")
+    await orchestrator.process_request("generate", "Hello", max_tokens=5)
+
+    assert provider.generate_completion.await_count == 2
+
+@pytest.mark.asyncio
+async def test_invalidate_responses_sweeps_the_old_entries(provider):
+    cache = InMemoryCache()
+    orchestrator = _orchestrator(provider, cache)
+    await orchestrator.process_request("generate", "Hello", max_tokens=5)
+    assert len(cache.store) == 1
+
+    await orchestrator.invalidate_responses("generate")
+    await asyncio.gather(*orchestrator._sweeps)
+
+    assert not cache.store
+
+@pytest.mark.asyncio
+async def test_n_choices_come_from_one_call(provider):
+    orchestrator = _orchestrator(provider)
+
+    response = await orchestrator.process_request("generate", "Hello", max_tokens=4, n=3)
+
+    assert provider.generate_completion.await_count == 1
+    assert [choice.index for choice in response.choices] == [0, 1, 2]
+    assert len({choice.text for choice in response.choices}) == 3
+    assert all(len(choice.text.split()) == 4 for choice in response.choices)
+    assert response.usage.completion_tokens == 12
+    assert response.usage.total_tokens == response.usage.prompt_tokens + 12
+
+@pytest.mark.asyncio
+async def test_stream_request_yields_the_completion(provider):
+    orchestrator = _orchestrator(provider)
+
+    chunks = [chunk async for chunk in orchestrator.stream_request("generate", "Hello", max_tokens=6)]
+
+    assert len("".join(chunks).split()) == 6
+
+@pytest.mark.asyncio
+async def test_stream_request_forwards_sampling_parameters(provider):
+    orchestrator = _orchestrator(provider)
+
+    with mock.patch.object(provider, "stream_text", wraps=provider.stream_text) as stream_text:
+        [chunk async for chunk in orchestrator.stream_request("generate", "Hello", max_tokens=6,
+                                                               temperature=0.2, top_p=0.5)]
+
+    stream_text.assert_called_once_with("Hello", max_tokens=6, temperature=0.2, top_p=0.5, stop=None)
+
+def test_unsupported_request_type_is_rejected(provider):
+    orchestrator = _orchestrator(provider)
+
+    with pytest.raises(ValueError):
+        asyncio.run(orchestrator.process_request("unknown", "Hello"))
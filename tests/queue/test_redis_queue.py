@@ -0,0 +1,100 @@
+import asyncio
+import uuid
+
+import pytest
+
+try:
+    from infrastructure.queue.redis_queue import RedisJobQueue
+except (ImportError, TypeError) as e:  # aioredis 2.0 fails to import on Python 3.11 with a TypeError
+    pytest.skip(f"aioredis is unavailable: {e}", allow_module_level=True)
+
+from core.config import settings
+from core.exceptions import JobQueueFullError
+from domain.job import Job, JobStatus
+
+@pytest.fixture
+async def queue():
+    queue = RedisJobQueue(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB,
+                          prefix=f"test_jobs:{uuid.uuid4().hex}", max_pending=500)
+    try:
+        await queue.redis.ping()
+    except Exception as e:
+        await queue.close()
+        pytest.skip(f"Redis is unavailable: {e}")
+    yield queue
+    keys = [key async for key in queue.redis.scan_iter(match=f"{queue.prefix}:*")]
+    if keys:
+        await queue.redis.delete(*keys)
+    await queue.close()
+
+def _job(text="Hello"):
+    return Job(request_type="generate", input_text=text)
+
+async def _owners(queue):
+    pending = await queue.redis.xpending_range(queue._stream, queue._group, "-", "+", 1000)
+    return {entry["message_id"].decode(): entry["consumer"].decode() for entry in pending}
+
+@pytest.mark.asyncio
+async def test_claim_and_complete(queue):
+    job = _job()
+    await queue.submit(job)
+
+    claims = await queue.claim("worker-a", count=10)
+    assert [claimed.id for _, claimed in claims] == [job.id]
+    assert await queue.claim("worker-b", count=10) == []
+
+    delivery_id, claimed = claims[0]
+    claimed.status = JobStatus.SUCCEEDED
+    claimed.result = {"text": "Bonjour"}
+    await queue.complete(delivery_id, claimed)
+
+    assert await queue.depth() == 0
+    stored = await queue.get(job.id)
+    assert stored.status == JobStatus.SUCCEEDED
+    assert stored.result == {"text": "Bonjour"}
+    assert await queue.reclaim("worker-b", min_idle=0, count=10) == []
+
+@pytest.mark.asyncio
+async def test_submit_rejects_jobs_beyond_max_pending(queue):
+    queue.max_pending = 2
+    await queue.submit(_job())
+    await queue.submit(_job())
+
+    with pytest.raises(JobQueueFullError):
+        await queue.submit(_job())
+
+@pytest.mark.asyncio
+async def test_idle_jobs_are_reclaimed_once(queue):
+    job = _job()
+    await queue.submit(job)
+    [(delivery_id, _)] = await queue.claim("worker-a", count=1)
+    await asyncio.sleep(0.1)
+
+    reclaimed = await queue.reclaim("worker-b", min_idle=0.05, count=10)
+
+    assert [(claimed_id, claimed.id) for claimed_id, claimed in reclaimed] == [(delivery_id, job.id)]
+    assert await queue.reclaim("worker-c", min_idle=0.05, count=10) == []
+
+@pytest.mark.asyncio
+async def test_touch_does_not_take_back_a_reclaimed_job(queue):
+    await queue.submit(_job())
+    [(delivery_id, _)] = await queue.claim("worker-a", count=1)
+    await asyncio.sleep(0.1)
+    await queue.reclaim("worker-b", min_idle=0.05, count=1)
+
+    await queue.touch("worker-a", [delivery_id])
+
+    assert (await _owners(queue))[delivery_id] == "worker-b"
+
+@pytest.mark.asyncio
+async def test_reclaim_finds_idle_jobs_behind_active_ones(queue):
+    for index in range(301):
+        await queue.submit(_job(f"Hello {index}"))
+    claims = await queue.claim("worker-a", count=301)
+    await asyncio.sleep(0.1)
+    # Only the newest job is left idle.
+    await queue.touch("worker-a", [delivery_id for delivery_id, _ in claims[:-1]])
+
+    reclaimed = await queue.reclaim("worker-b", min_idle=0.05, count=1)
+
+    assert [delivery_id for delivery_id, _ in reclaimed] == [claims[-1][0]]
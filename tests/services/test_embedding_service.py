@@ -0,0 +1,44 @@
+from functools import partial
+from unittest import mock
+
+import pytest
+
+from application.models.model_factory import ModelFactory
+from application.models.provider_model import ProviderModel
+from application.services.embedding_service import EmbeddingService
+from infrastructure.cache.memory_cache import InMemoryCache
+from infrastructure.llm_providers.fake import FakeLLMProvider
+
+@pytest.fixture
+def provider():
+    provider = FakeLLMProvider(embedding_dim=8)
+    # Wrapped so that tests can count the upstream calls.
+    with mock.patch.object(provider, "create_embeddings", wraps=provider.create_embeddings):
+        yield provider
+
+def _service(provider, cache=None):
+    factory = ModelFactory()
+    factory.register_model("fake-embedding", partial(ProviderModel, provider=provider))
+    return EmbeddingService(factory, vector_store=None, model_name="fake-embedding", cache=cache,
+                            cache_codec="float32")
+
+@pytest.mark.asyncio
+async def test_texts_are_embedded_in_one_batch(provider):
+    texts = ["alpha", "beta", "gamma"]
+
+    vectors = await _service(provider).embed(texts)
+
+    provider.create_embeddings.assert_awaited_once_with(texts)
+    assert vectors == [await provider.create_embedding(text) for text in texts]
+
+@pytest.mark.asyncio
+async def test_only_uncached_texts_are_embedded(provider):
+    service = _service(provider, InMemoryCache())
+    await service.embed(["alpha", "beta"])
+
+    vectors = await service.embed(["beta", "gamma", "alpha"])
+
+    assert provider.create_embeddings.await_count == 2
+    assert provider.create_embeddings.await_args.args[0] == ["gamma"]
+    for vector, text in zip(vectors, ["beta", "gamma", "alpha"]):
+        assert vector == pytest.approx(await provider.create_embedding(text))
@@ -0,0 +1,163 @@
+import asyncio
+from functools import partial
+from typing import Dict, List, Optional, Sequence
+
+import pytest
+
+from application.models.model_factory import ModelFactory
+from application.models.provider_model import ProviderModel
+from application.prompt_management import PromptRepository, PromptTemplate
+from application.services.llm_orchestrator import LLMOrchestrator
+from domain.job import Job, JobStatus
+from infrastructure.llm_providers.fake import FakeLLMProvider
+
+try:
+    # The queue package imports the Redis queue, and with it aioredis.
+    from application.services.job_worker import JobWorker
+    from infrastructure.queue.base import BaseJobQueue, Claim
+except (ImportError, TypeError) as e:  # aioredis 2.0 fails to import on Python 3.11 with a TypeError
+    pytest.skip(f"aioredis is unavailable: {e}", allow_module_level=True)
+
+class InMemoryJobQueue(BaseJobQueue):
+    """A single-process job queue for exercising the worker."""
+
+    def __init__(self):
+        self.queued: List[Job] = []
+        self.jobs: Dict[str, Job] = {}
+        self.completed: Dict[str, Job] = {}
+        self.claims = 0
+
+    async def submit(self, job: Job) -> None:
+        self.jobs[job.id] = job.copy()
+        self.queued.append(job.copy())
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    async def save(self, job: Job) -> None:
+        self.jobs[job.id] = job.copy()
+
+    async def claim(self, consumer: str, count: int, block: float = 0) -> List[Claim]:
+        self.claims += 1
+        if not self.queued and block:
+            await asyncio.sleep(block)
+        claimed, self.queued = self.queued[:count], self.queued[count:]
+        return [(job.id, job) for job in claimed]
+
+    async def reclaim(self, consumer: str, min_idle: float, count: int) -> List[Claim]:
+        return []
+
+    async def touch(self, consumer: str, delivery_ids: Sequence[str]) -> None:
+        pass
+
+    async def complete(self, delivery_id: str, job: Job) -> None:
+        self.jobs[job.id] = self.completed[delivery_id] = job.copy()
+
+    async def depth(self) -> int:
+        return len(self.queued) + len(self.jobs) - len(self.completed)
+
+def _orchestrator(**provider_options):
+    options = {"latency_mean": 0, "tokens_per_second": 0}
+    options.update(provider_options)
+    provider = FakeLLMProvider(**options)
+    factory = ModelFactory()
+    factory.register_model("gpt-3.5-turbo", partial(ProviderModel, provider=provider))
+    prompts = PromptRepository()
+    prompts.add_prompt(PromptTemplate(name="generate", template="$input_text", version="1.0"))
+    return LLMOrchestrator(factory, prompts)
+
+def _job(**fields):
+    return Job(request_type="generate", input_text="Hello", params={"max_tokens": 3}, **fields)
+
+async def _run_until(worker, queue, count, timeout=5.0):
+    async def wait():
+        while len(queue.completed) < count:
+            await asyncio.sleep(0.01)
+        worker.stop()
+
+    await asyncio.wait_for(asyncio.gather(worker.run(), wait()), timeout)
+
+@pytest.mark.asyncio
+async def test_jobs_are_processed_and_completed():
+    queue = InMemoryJobQueue()
+    jobs = [_job() for _ in range(5)]
+    for job in jobs:
+        await queue.submit(job)
+
+    await _run_until(JobWorker(queue, _orchestrator(), concurrency=2, block=0.01), queue, len(jobs))
+
+    for job in jobs:
+        stored = await queue.get(job.id)
+        assert stored.status == JobStatus.SUCCEEDED
+        assert stored.attempts == 1
+        assert len(stored.result["choices"][0]["text"].split()) == 3
+        assert stored.finished_at >= stored.started_at
+
+@pytest.mark.asyncio
+async def test_failed_jobs_record_the_error():
+    queue = InMemoryJobQueue()
+    job = _job()
+    await queue.submit(job)
+
+    await _run_until(JobWorker(queue, _orchestrator(error_rate=1.0), block=0.01), queue, 1)
+
+    stored = await queue.get(job.id)
+    assert stored.status == JobStatus.FAILED
+    assert "injected failure" in stored.error
+
+@pytest.mark.asyncio
+async def test_jobs_started_max_attempts_times_are_abandoned():
+    queue = InMemoryJobQueue()
+    retried, exhausted = _job(attempts=2), _job(attempts=3)
+    await queue.submit(retried)
+    await queue.submit(exhausted)
+
+    await _run_until(JobWorker(queue, _orchestrator(), block=0.01, max_attempts=3), queue, 2)
+
+    assert (await queue.get(retried.id)).status == JobStatus.SUCCEEDED
+    abandoned = await queue.get(exhausted.id)
+    assert abandoned.status == JobStatus.FAILED
+    assert abandoned.error == "Job abandoned after 3 attempts"
+    assert abandoned.started_at is None
+
+@pytest.mark.asyncio
+async def test_stop_drains_jobs_in_progress():
+    queue = InMemoryJobQueue()
+    for _ in range(6):
+        await queue.submit(_job())
+    worker = JobWorker(queue, _orchestrator(latency_mean=0.1, latency_distribution="fixed"),
+                       concurrency=3, block=0.01)
+
+    run = asyncio.ensure_future(worker.run())
+    while len(queue.queued) > 3:
+        await asyncio.sleep(0.01)
+    worker.stop()
+    await asyncio.wait_for(run, 5.0)
+
+    # The three jobs in progress finished; the rest were never claimed.
+    assert len(queue.completed) == 3
+    assert all(job.status == JobStatus.SUCCEEDED for job in queue.completed.values())
+    assert len(queue.queued) == 3
+
+@pytest.mark.asyncio
+async def test_claims_never_exceed_concurrency():
+    queue = InMemoryJobQueue()
+    for _ in range(10):
+        await queue.submit(_job())
+    worker = JobWorker(queue, _orchestrator(latency_mean=0.05, latency_distribution="fixed"),
+                       concurrency=4, block=0.01)
+    peak = 0
+
+    async def watch():
+        nonlocal peak
+        while len(queue.completed) < 10:
+            peak = max(peak, len(worker._active))
+            await asyncio.sleep(0.005)
+
+    async def watch_then_stop():
+        await watch()
+        worker.stop()
+
+    await asyncio.wait_for(asyncio.gather(worker.run(), watch_then_stop()), 5.0)
+
+    assert peak == 4
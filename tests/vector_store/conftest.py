@@ -0,0 +1,33 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+DIM = 32
+
+@pytest.fixture(scope="module")
+def dataset():
+    rng = np.random.default_rng(0)
+    # Clustered, like real embeddings, rather than uniform noise.
+    centers = rng.standard_normal((40, DIM))
+    vectors = centers[rng.integers(0, len(centers), 4000)] + 0.5 * rng.standard_normal((4000, DIM))
+    queries = vectors[rng.choice(len(vectors), 50, replace=False)] + 0.1 * rng.standard_normal((50, DIM))
+    return vectors.astype("float32"), queries.astype("float32")
+
+@pytest.fixture
+def ids(dataset):
+    return [f"doc-{i}" for i in range(len(dataset[0]))]
+
+@pytest.fixture
+def recall(dataset):
+    """Returns a function computing a store's recall@k against exact search of the dataset."""
+    vectors, queries = dataset
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    def measure(store, k=10):
+        found = 0
+        for query in queries:
+            exact = {f"doc-{i}" for i in np.argsort(-(unit @ (query / np.linalg.norm(query))))[:k]}
+            found += len({match.id for match in store.search(query, k)} & exact)
+        return found / (k * len(queries))
+
+    return measure
@@ -0,0 +1,84 @@
+from unittest import mock
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from infrastructure.vector_store.ivf_index import IVFVectorStore
+from infrastructure.vector_store.vector_ops import kmeans
+
+def test_search_is_exact_until_trained(tmp_path, dataset, ids, recall):
+    vectors, _ = dataset
+    store = IVFVectorStore(str(tmp_path), dim=vectors.shape[1], n_lists=32, train_threshold=100000)
+    store.add(ids, vectors)
+
+    assert not store.trained
+    assert recall(store) == 1.0
+    store.close()
+
+def test_trained_index_recall(tmp_path, dataset, ids, recall):
+    vectors, _ = dataset
+    store = IVFVectorStore(str(tmp_path), dim=vectors.shape[1], n_lists=32, nprobe=8)
+    store.add(ids, vectors)
+    store.train(iterations=10)
+
+    assert store.trained
+    assert recall(store) >= 0.9
+    store.close()
+
+def test_rows_added_after_training_are_searched(tmp_path, dataset, ids):
+    vectors, _ = dataset
+    store = IVFVectorStore(str(tmp_path), dim=vectors.shape[1], n_lists=32, nprobe=1)
+    store.add(ids, vectors)
+    store.train(iterations=10)
+
+    store.add(["new"], [-vectors[0]])
+
+    assert store.search(-vectors[0], k=1)[0].id == "new"
+    store.close()
+
+def test_add_does_not_train(tmp_path, dataset, ids):
+    vectors, _ = dataset
+    store = IVFVectorStore(str(tmp_path), dim=vectors.shape[1], n_lists=32, train_threshold=1000)
+    store.add(ids, vectors)
+
+    assert not store.trained
+    assert store.training_due()
+    store.close()
+
+def test_train_if_due_trains_at_the_threshold_and_as_the_store_grows(tmp_path, dataset, ids):
+    vectors, _ = dataset
+    store = IVFVectorStore(str(tmp_path), dim=vectors.shape[1], n_lists=32, train_threshold=1000,
+                           retrain_growth=2.0)
+    store.add(ids[:999], vectors[:999])
+    assert not store.train_if_due()
+
+    store.add(ids[999:1500], vectors[999:1500])
+    assert store.train_if_due(iterations=5)
+    assert store.trained
+    assert not store.train_if_due()
+
+    store.add(ids[1500:3000], vectors[1500:3000])
+    assert store.training_due()
+    assert store.train_if_due(iterations=5)
+    assert not store.training_due()
+    store.close()
+
+def test_rows_added_during_training_are_indexed(tmp_path, dataset, ids):
+    vectors, _ = dataset
+    store = IVFVectorStore(str(tmp_path), dim=vectors.shape[1], n_lists=32, nprobe=1)
+    store.add(ids[:-1], vectors[:-1])
+
+    def kmeans_with_insert(*args, **kwargs):
+        # The write lock is free while clustering, so the insert does not wait for the training.
+        store.add(ids[-1:], vectors[-1:])
+        return kmeans(*args, **kwargs)
+
+    with mock.patch("infrastructure.vector_store.ivf_index.kmeans", side_effect=kmeans_with_insert):
+        store.train(iterations=5)
+
+    _, order, _, listed = store._lists()
+    assert listed == len(store) == len(ids)
+    assert len(vectors) - 1 in order
+    assert store.search(vectors[-1], k=1)[0].id == ids[-1]
+    store.close()
@@ -0,0 +1,34 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from infrastructure.vector_store.mmap_store import MemmapVectorStore
+
+def test_add_and_search(tmp_path):
+    store = MemmapVectorStore(str(tmp_path), dim=3)
+    store.add(["x", "y", "z"], [[1, 0, 0], [0, 1, 0], [0, 0, 2]], [{"axis": "x"}, {"axis": "y"}, {"axis": "z"}])
+
+    matches = store.search([0.1, 0, 1], k=2)
+
+    assert len(store) == 3
+    assert [match.id for match in matches] == ["z", "x"]
+    assert matches[0].metadata == {"axis": "z"}
+    assert matches[0].score == pytest.approx(1 / np.sqrt(1.01), rel=1e-5)
+    store.close()
+
+def test_rows_persist_across_instances(tmp_path):
+    writer = MemmapVectorStore(str(tmp_path), dim=3)
+    reader = MemmapVectorStore(str(tmp_path), dim=3)
+    writer.add(["x"], [[1, 0, 0]])
+
+    assert [match.id for match in reader.search([1, 0, 0], k=1)] == ["x"]
+    writer.add(["y"], [[0, 1, 0]])
+    assert len(reader) == 2
+    writer.close()
+    reader.close()
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    MemmapVectorStore(str(tmp_path), dim=3).close()
+
+    with pytest.raises(ValueError):
+        MemmapVectorStore(str(tmp_path), dim=4)
@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from infrastructure.vector_store.mmap_store import MemmapVectorStore
+from infrastructure.vector_store.quantization import ProductQuantizer, ScalarQuantizer
+
+def test_int8_codes_are_written_as_rows_are_added(tmp_path, dataset, ids, recall):
+    vectors, _ = dataset
+    store = MemmapVectorStore(str(tmp_path), dim=vectors.shape[1], quantization="int8")
+    store.add(ids, vectors)
+
+    assert isinstance(store.quantizer, ScalarQuantizer)
+    assert recall(store) >= 0.9
+    store.close()
+
+def test_product_quantization_after_training(tmp_path, dataset, ids, recall):
+    vectors, _ = dataset
+    store = MemmapVectorStore(str(tmp_path), dim=vectors.shape[1], quantization="pq", pq_subspaces=8, rerank=10)
+    store.add(ids, vectors)
+    # Searches score the float32 rows until the quantizer is trained.
+    assert recall(store) == 1.0
+
+    assert store.train_quantizer(iterations=5) == len(vectors)
+
+    assert isinstance(store.quantizer, ProductQuantizer)
+    assert recall(store) >= 0.9
+    store.close()
+
+def test_codes_are_reloaded_by_other_instances(tmp_path, dataset, ids, recall):
+    vectors, _ = dataset
+    writer = MemmapVectorStore(str(tmp_path), dim=vectors.shape[1], quantization="pq", pq_subspaces=8, rerank=10)
+    writer.add(ids, vectors)
+    writer.train_quantizer(iterations=5)
+
+    reader = MemmapVectorStore(str(tmp_path), dim=vectors.shape[1], quantization="pq", pq_subspaces=8, rerank=10)
+
+    assert isinstance(reader.quantizer, ProductQuantizer)
+    assert recall(reader) >= 0.9
+    writer.close()
+    reader.close()
+
+def test_pq_dimension_must_divide_into_subspaces():
+    with pytest.raises(ValueError):
+        ProductQuantizer(dim=30, subspaces=8)